@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the rate at which ARP replies from 10,000 neighbors, each heard
+from ten times, are added to the ARP monitor given raw frames and given
+decoded headers, against decoding each frame and keeping its binding
+in a table keyed by address strings, without any detection. Run with
+"python -m benchmarks.bench_arpmon".
+'''
+
+import struct
+from typing import Dict, List
+
+from benchmarks.common import ARP_HEADER, ETH_HEADER, measure, report
+from netprotocols import ARP
+from netprotocols.analysis.arpmon import ARPMonitor
+
+NEIGHBORS = 10_000
+
+
+def frames() -> List[bytes]:
+    result = []
+    for neighbor in range(NEIGHBORS):
+        mac = struct.pack(">HI", 0x0200, neighbor)
+        ip = struct.pack(">I", 0x0a000000 + neighbor)
+        result.append(ETH_HEADER[:12] + b"\x08\x06" + ARP_HEADER[:6] +
+                      b"\x00\x02" + mac + ip + ARP_HEADER[18:])
+    return result * 10
+
+
+def string_table(stream: List[bytes]) -> Dict[str, str]:
+    table = {}
+    for item in stream:
+        header = ARP.decode(item[14:])
+        table[header.spa] = header.sha
+    return table
+
+
+def run(number: int = 3) -> Dict[str, float]:
+    stream = frames()
+    headers = [ARP.decode(item[14:]) for item in stream]
+
+    def add_frames():
+        monitor = ARPMonitor()
+        for timestamp, item in enumerate(stream):
+            monitor.add_frame(item, timestamp / 100_000)
+
+    def add_headers():
+        monitor = ARPMonitor()
+        for timestamp, header in enumerate(headers):
+            monitor.add(header, timestamp / 100_000)
+
+    return {name: len(stream) * measure(func, number=number, repeat=3)
+            for name, func in (("raw frames", add_frames),
+                               ("decoded headers", add_headers),
+                               ("decode, string table",
+                                lambda: string_table(stream)))}
+
+
+if __name__ == "__main__":
+    report(f"ARP monitor, {NEIGHBORS} neighbors", run(), unit="frames/sec")
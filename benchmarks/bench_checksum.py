@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare the wide-word Internet checksum against a word-by-word loop over
+a full-sized Ethernet payload, and the incremental update of an IPv4
+header checksum against recomputing it. Run with
+"python -m benchmarks.bench_checksum".
+'''
+
+from typing import Dict
+
+from benchmarks.common import IPV4_HEADER, measure, report
+from netprotocols import IPv4
+from netprotocols.base.checksum import incremental_update, internet_checksum
+
+PAYLOAD = bytes(range(256)) * 5 + bytes(220)  # 1500 bytes
+
+
+def word_by_word(data: bytes) -> int:
+    total = 0
+    for i in range(0, len(data), 2):
+        total += (data[i] << 8) | data[i + 1]
+    while total >> 16:
+        total = (total & 0xffff) + (total >> 16)
+    return ~total & 0xffff
+
+
+def decrement_ttl(header: IPv4, incremental: bool):
+    old_word = header.ttl << 8 | header.proto
+    header.ttl = (header.ttl - 1) & 0xff
+    if incremental:
+        header.chksum = incremental_update(header.chksum, old_word,
+                                           header.ttl << 8 | header.proto)
+    else:
+        header.chksum = header.compute_chksum()
+
+
+def run(number: int = 10_000) -> Dict[str, float]:
+    header = IPv4.decode(IPV4_HEADER)
+    return {
+        "checksum of 1500 bytes (word by word)": measure(
+            lambda: word_by_word(PAYLOAD), number=number // 10),
+        "checksum of 1500 bytes (wide word)": measure(
+            lambda: internet_checksum(PAYLOAD), number=number),
+        "decrement IPv4 TTL (recompute)": measure(
+            lambda: decrement_ttl(header, incremental=False), number=number),
+        "decrement IPv4 TTL (incremental)": measure(
+            lambda: decrement_ttl(header, incremental=True), number=number)
+    }
+
+
+if __name__ == "__main__":
+    report("Internet checksum", run())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare the aggregation of a field over many IPv4 headers decoded one
+instance at a time against the same aggregation over columns decoded in
+a batch. Run with "python -m benchmarks.bench_decode_many".
+'''
+
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols import Ethernet, IPv4
+
+BATCH_SIZE = 10_000
+
+
+def per_instance(frames) -> int:
+    return sum(IPv4.decode(frame, Ethernet.header_len).len
+               for frame in frames)
+
+
+def columnar(frames, fields=None) -> int:
+    return sum(IPv4.decode_many(frames, Ethernet.header_len, fields)["len"])
+
+
+def run(number: int = 10) -> Dict[str, float]:
+    frames = [TCP_FRAME] * BATCH_SIZE
+    return {
+        "sum of IPv4.len (per instance)": BATCH_SIZE * measure(
+            lambda: per_instance(frames), number=number),
+        "sum of IPv4.len (decode_many, all fields)": BATCH_SIZE * measure(
+            lambda: columnar(frames), number=number),
+        "sum of IPv4.len (decode_many, len only)": BATCH_SIZE * measure(
+            lambda: columnar(frames, ["len"]), number=number)
+    }
+
+
+if __name__ == "__main__":
+    report("Batch decoding", run(), unit="headers/sec")
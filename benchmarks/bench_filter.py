@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the rate at which frames are filtered by "ip and tcp dst port
+22", testing the attributes of fully dissected frames against the
+compiled PacketFilter evaluated on raw bytes, on a mix of IPv4/TCP, ARP
+and IPv6 frames. Run with "python -m benchmarks.bench_filter".
+'''
+
+from typing import Dict
+
+from benchmarks.common import (
+    ARP_HEADER,
+    ETH_HEADER,
+    IPV6_HEADER,
+    TCP_FRAME,
+    TCP_HEADER,
+    measure,
+    report
+)
+from netprotocols import PacketFilter, dissect
+
+FRAMES = [TCP_FRAME,
+          ETH_HEADER[:12] + b"\x08\x06" + ARP_HEADER,
+          ETH_HEADER[:12] + b"\x86\xdd" + IPV6_HEADER + TCP_HEADER] * 100
+
+
+def decoded_filter(frame) -> bool:
+    packet = dissect(frame)
+    return hasattr(packet, "ipv4") and hasattr(packet, "tcp") and \
+        packet.tcp.dport == 22
+
+
+def run(number: int = 100) -> Dict[str, float]:
+    compiled = PacketFilter("ip and tcp dst port 22")
+    assert [compiled(frame) for frame in FRAMES] == \
+        [decoded_filter(frame) for frame in FRAMES]
+    return {name: len(FRAMES) * measure(
+                lambda: [frame for frame in FRAMES if predicate(frame)],
+                number=number, repeat=3)
+            for name, predicate in (("dissect, then test", decoded_filter),
+                                    ("compiled filter", compiled))}
+
+
+if __name__ == "__main__":
+    report("Filter: ip and tcp dst port 22", run(), unit="frames/sec")
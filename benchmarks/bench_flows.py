@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the throughput of the TCP flow table on 20,000 concurrent
+connections each opened by a handshake and carrying two segments of data
+received in reverse order, given decoded headers and given raw frames.
+The memory held per connection is printed when run as a script, with
+"python -m benchmarks.bench_flows".
+'''
+
+import struct
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from benchmarks.common import measure, report
+from netprotocols import IPv4, TCP
+from netprotocols.reassembly.tcp import ACK, SYN, FlowTable
+
+FLOWS = 20_000
+ETH_HEADER = b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54\x08\x00"
+ipv4 = struct.Struct(">BBHHHBBH4s4s")
+tcp = struct.Struct(">HHIIHHHH")
+
+
+def frame(flow: int, flags: int, seq: int, payload: bytes = b"",
+          reply: bool = False) -> bytes:
+    client = struct.pack(">I", 0x0a000000 + flow)
+    server, ports = b"\xc0\xa8\x01\xfe", (1024 + flow % 60000, 80)
+    src, dst = (server, client) if reply else (client, server)
+    sport, dport = ports[::-1] if reply else ports
+    return ETH_HEADER + \
+        ipv4.pack(0x45, 0, 40 + len(payload), 0, 0, 64, 6, 0, src, dst) + \
+        tcp.pack(sport, dport, seq, 0, 5 << 12 | flags, 65535, 0, 0) + \
+        payload
+
+
+def frames() -> List[bytes]:
+    result = []
+    for flow in range(FLOWS):
+        result += [frame(flow, SYN, 0),
+                   frame(flow, SYN | ACK, 0, reply=True),
+                   frame(flow, ACK, 1),
+                   frame(flow, ACK, 65, bytes(64)),
+                   frame(flow, ACK, 1, bytes(64))]
+    return result
+
+
+def headers(stream: List[bytes]) -> List[Tuple[IPv4, TCP, memoryview]]:
+    return [(IPv4.decode(item[14:34]), TCP.decode(item[34:54]),
+             memoryview(item)[54:]) for item in stream]
+
+
+def memory_per_flow(decoded) -> float:
+    """Bytes allocated per connection tracked by the table."""
+    tracemalloc.start()
+    table = FlowTable()
+    for ip, segment, payload in decoded:
+        table.add(ip, segment, payload, 0.0)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated / len(table)
+
+
+def run(number: int = 3) -> Dict[str, float]:
+    stream = frames()
+    decoded = headers(stream)
+
+    def add_headers():
+        table = FlowTable()
+        for ip, segment, payload in decoded:
+            table.add(ip, segment, payload, 0.0)
+
+    def add_frames():
+        table = FlowTable()
+        for item in stream:
+            table.add_frame(item, 0.0)
+
+    return {"decoded headers": len(stream) * measure(
+                add_headers, number=number, repeat=3),
+            "raw frames": len(stream) * measure(
+                add_frames, number=number, repeat=3)}
+
+
+if __name__ == "__main__":
+    report(f"TCP flow table, {FLOWS} flows", run(), unit="segments/sec")
+    print(f"  {memory_per_flow(headers(frames())):,.0f} bytes per flow")
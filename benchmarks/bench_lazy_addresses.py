@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare eager conversion of every address on decode, the behaviour of
+decode() before addresses became lazily computed properties, against
+lazy conversion on a filtering workload that only reads Ethertypes,
+protocol numbers and ports. Run with
+"python -m benchmarks.bench_lazy_addresses".
+'''
+
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols import Ethernet, IPv4, TCP
+
+
+def header_filter(frame: bytes, eager: bool) -> bool:
+    eth = Ethernet.decode(frame)
+    ip = IPv4.decode(frame, Ethernet.header_len)
+    if eager:
+        eth.src, eth.dst, ip.src, ip.dst
+    if eth.eth != 0x0800 or ip.proto != 0x06:
+        return False
+    tcp = TCP.decode(frame, Ethernet.header_len + ip.ihl * 4)
+    return tcp.dport == 22
+
+
+def run(number: int = 10_000) -> Dict[str, float]:
+    return {
+        "header-only filter (eager addresses)": measure(
+            lambda: header_filter(TCP_FRAME, eager=True), number=number),
+        "header-only filter (lazy addresses)": measure(
+            lambda: header_filter(TCP_FRAME, eager=False), number=number)
+    }
+
+
+if __name__ == "__main__":
+    report("Lazy address conversion", run())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure how summarizing a synthetic pcap capture scales with the number
+of worker processes, from one up to the number of CPUs. Speedup is only
+expected where several cores are available. Run with
+"python -m benchmarks.bench_parallel".
+'''
+
+import os
+import tempfile
+from typing import Dict
+
+from benchmarks.bench_pcap import write_synthetic_pcap
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols.analysis.parallel import summarize
+
+FRAME_COUNT = 100_000
+
+
+def worker_counts():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max(cpus, 2):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def run(number: int = 1) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "synthetic.pcap")
+        write_synthetic_pcap(path, TCP_FRAME, FRAME_COUNT)
+        return {f"summarize ({workers} worker{'s' * (workers > 1)})":
+                FRAME_COUNT * measure(lambda: summarize(path, workers),
+                                      number=number, repeat=3)
+                for workers in worker_counts()}
+
+
+if __name__ == "__main__":
+    report("Sharded pcap analysis", run(), unit="frames/sec")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the throughput of writing a synthetic pcap capture and of
+reading it back, both as raw records and as dissected packets. Run with
+"python -m benchmarks.bench_pcap".
+'''
+
+import os
+import tempfile
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols import PcapReader, PcapWriter
+
+FRAME_COUNT = 100_000
+
+
+def write_synthetic_pcap(path: str, frame: bytes, count: int,
+                         buffer_size: int = 1 << 20):
+    with PcapWriter(path, buffer_size=buffer_size) as writer:
+        for timestamp in range(count):
+            writer.write(frame, timestamp)
+
+
+def read_records(path: str) -> int:
+    with PcapReader(path) as reader:
+        count = sum(1 for _ in reader)
+    return count
+
+
+def read_packets(path: str, zero_copy: bool) -> int:
+    with PcapReader(path) as reader:
+        count = sum(1 for _ in reader.packets(zero_copy=zero_copy))
+    return count
+
+
+def run(number: int = 1) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "synthetic.pcap")
+        results = {
+            "write frames (no record buffer)": FRAME_COUNT * measure(
+                lambda: write_synthetic_pcap(path, TCP_FRAME, FRAME_COUNT,
+                                             buffer_size=0), number=number),
+            "write frames": FRAME_COUNT * measure(
+                lambda: write_synthetic_pcap(path, TCP_FRAME, FRAME_COUNT),
+                number=number),
+            "read records": FRAME_COUNT * measure(
+                lambda: read_records(path), number=number),
+            "read packets": FRAME_COUNT * measure(
+                lambda: read_packets(path, zero_copy=False), number=number),
+            "read packets (zero-copy)": FRAME_COUNT * measure(
+                lambda: read_packets(path, zero_copy=True), number=number)
+        }
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    report("pcap I/O", results, unit="frames/sec")
+    record_size = 16 + len(TCP_FRAME)
+    report("pcap I/O", {name: rate * record_size / 1e6
+                        for name, rate in results.items()}, unit="MB/sec")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure decoding and construction of every protocol class, serialization
+of a Packet and the address conversion helpers of Protocol. Run with
+"python -m benchmarks.bench_protocols".
+'''
+
+from ctypes import c_ubyte
+from socket import AF_INET6
+from typing import Dict
+
+from benchmarks.common import SAMPLES, measure, report
+from netprotocols import (
+    ARP,
+    Ethernet,
+    ICMPv4,
+    ICMPv6,
+    IPv4,
+    IPv6,
+    Packet,
+    Protocol,
+    TCP,
+    UDP
+)
+
+CONSTRUCTION_ARGS = {
+    Ethernet: dict(dst="ff:ff:ff:ff:ff:ff", src="00:07:0d:af:f4:54",
+                   eth=0x0800),
+    ARP: dict(htype=1, ptype=0x0800, hlen=6, plen=4, oper=2,
+              sha="00:07:0d:af:f4:54", spa="24.166.172.1",
+              tha="00:00:00:00:00:00", tpa="24.166.173.159"),
+    IPv4: dict(version=4, ihl=5, dscp=0, ecp=0, len=40, id=0xec6c, flags=2,
+               offset=0, ttl=64, proto=0x06, chksum=0x2b51,
+               src="192.168.1.96", dst="192.168.1.254"),
+    IPv6: dict(version=6, tclass=0, flabel=0, payload_len=120,
+               next_header=0x06, hop_limit=255, src="fe80::1",
+               dst="ff02::1"),
+    ICMPv4: dict(type=8, code=0, chksum=0x83f7, rest=b"\x00\x01\x00\x01"),
+    ICMPv6: dict(type=128, code=0, chksum=0x3f69, m_body=b"\x76\x20\x01\x00"),
+    TCP: dict(sport=1022, dport=22, seq=209327191, ack=3598120581,
+              offset=5, reserved=0, flags=0x018, window=8540,
+              chksum=0x2008, urg=0),
+    UDP: dict(sport=2398, dport=53, len=41, chksum=0x3649)
+}
+
+
+def run(number: int = 10_000) -> Dict[str, float]:
+    results = {}
+    for protocol, raw in SAMPLES.items():
+        kwargs = CONSTRUCTION_ARGS[protocol]
+        results[f"{protocol.__name__} decode"] = measure(
+            lambda: protocol.decode(raw), number=number)
+        results[f"{protocol.__name__} construct"] = measure(
+            lambda: protocol(**kwargs), number=number)
+
+    packet = Packet(*(protocol(**CONSTRUCTION_ARGS[protocol])
+                      for protocol in (Ethernet, IPv4, TCP)))
+    results["Packet.__bytes__ (Ethernet/IPv4/TCP)"] = measure(
+        lambda: bytes(packet), number=number)
+    frame = bytearray(len(packet))
+    results["Packet.pack_into (Ethernet/IPv4/TCP)"] = measure(
+        lambda: packet.pack_into(frame), number=number)
+
+    mac_array = (c_ubyte * 6)(*b"\x00\x07\x0d\xaf\xf4\x54")
+    ipv4_array = (c_ubyte * 4)(*b"\xc0\xa8\x01\x60")
+    ipv6_array = Protocol.proto_addr_to_array("fe80::1", AF_INET6)
+    results.update({
+        "Protocol.hdwr_to_addr_array": measure(
+            lambda: Protocol.hdwr_to_addr_array("00:07:0d:af:f4:54"),
+            number=number),
+        "Protocol.addr_array_to_hdwr": measure(
+            lambda: Protocol.addr_array_to_hdwr(mac_array), number=number),
+        "Protocol.proto_addr_to_array (IPv4)": measure(
+            lambda: Protocol.proto_addr_to_array("192.168.1.96"),
+            number=number),
+        "Protocol.proto_addr_to_array (IPv6)": measure(
+            lambda: Protocol.proto_addr_to_array("fe80::1", AF_INET6),
+            number=number),
+        "Protocol.array_to_proto_addr (IPv4)": measure(
+            lambda: Protocol.array_to_proto_addr(ipv4_array),
+            number=number),
+        "Protocol.array_to_proto_addr (IPv6)": measure(
+            lambda: Protocol.array_to_proto_addr(ipv6_array, AF_INET6),
+            number=number),
+        "Protocol.int_to_hex_str": measure(
+            lambda: Protocol.int_to_hex_str(0x2b51), number=number)
+    })
+    return results
+
+
+if __name__ == "__main__":
+    report("Protocols", run())
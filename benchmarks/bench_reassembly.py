@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the throughput of IPv4 fragment reassembly on datagrams of 8 KiB
+split into fragments of 1480 bytes, delivered in order and in reverse
+order, under heavy fragmentation into 64-byte fragments, and under an
+adversarial stream of fragments overlapping each other by half. Run with
+"python -m benchmarks.bench_reassembly".
+'''
+
+import random
+from typing import Dict, List
+
+from benchmarks.common import measure, report
+from netprotocols import IPv4
+from netprotocols.reassembly.ipv4 import IPv4Reassembler
+
+PAYLOAD = bytes(8192)
+DATAGRAMS = 100
+
+
+def fragments(ident: int, size: int, step: int = None) -> List[bytes]:
+    """Split a datagram into fragments of size bytes starting every step
+    bytes, so that fragments overlap when step is smaller than size."""
+    step = step or size
+    result = []
+    for first in range(0, len(PAYLOAD), step):
+        last = min(first + size, len(PAYLOAD))
+        ip = IPv4(version=4, ihl=5, dscp=0, ecp=0, len=20 + last - first,
+                  id=ident, flags=int(last < len(PAYLOAD)),
+                  offset=first // 8, ttl=64, proto=0x11, chksum=0,
+                  src="192.168.1.96", dst="192.168.1.254")
+        result.append(bytes(ip) + PAYLOAD[first:last])
+    return result
+
+
+def reassemble(stream: List[bytes]) -> int:
+    reassembler = IPv4Reassembler()
+    add = reassembler.add
+    return sum(add(fragment, 0.0) is not None for fragment in stream)
+
+
+def run(number: int = 10) -> Dict[str, float]:
+    in_order = [fragment for ident in range(DATAGRAMS)
+                for fragment in fragments(ident, 1480)]
+    reverse = [fragment for ident in range(DATAGRAMS)
+               for fragment in reversed(fragments(ident, 1480))]
+    tiny = [fragment for ident in range(DATAGRAMS)
+            for fragment in fragments(ident, 64)]
+    overlapping = [fragment for ident in range(DATAGRAMS)
+                   for fragment in fragments(ident, 128, step=64)]
+    random.Random(0).shuffle(overlapping)
+    return {name: len(stream) * measure(lambda: reassemble(stream),
+                                        number=number, repeat=3)
+            for name, stream in (("1480-byte fragments", in_order),
+                                 ("1480-byte fragments, reversed", reverse),
+                                 ("64-byte fragments", tiny),
+                                 ("overlapping fragments, shuffled",
+                                  overlapping))}
+
+
+if __name__ == "__main__":
+    report("IPv4 reassembly", run(), unit="fragments/sec")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare passing frames to a decoding process through a multiprocessing
+Queue, which pickles every frame through a pipe, against a FrameRing in
+shared memory. The consumer decodes the Ethernet header of each frame.
+Run with "python -m benchmarks.bench_ring".
+'''
+
+import multiprocessing
+import time
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, report
+from netprotocols import Ethernet
+from netprotocols.capture.ring import FrameRing
+
+FRAME_COUNT = 100_000
+
+
+def consume_queue(queue):
+    for frame in iter(queue.get, None):
+        Ethernet.decode(frame)
+
+
+def consume_ring(ring: FrameRing):
+    view = None
+    for view in ring.consumer(0).frames():
+        Ethernet.decode(view)
+    del view  # Views must be released before the ring is closed
+    ring.close()
+
+
+def through_queue(count: int) -> float:
+    queue = multiprocessing.Queue(maxsize=1024)
+    consumer = multiprocessing.Process(target=consume_queue, args=(queue,))
+    consumer.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        queue.put(TCP_FRAME)
+    queue.put(None)
+    consumer.join()
+    return count / (time.perf_counter() - start)
+
+
+def through_ring(count: int) -> float:
+    with FrameRing.create(slots=1024, slot_size=128) as ring:
+        consumer = multiprocessing.Process(target=consume_ring,
+                                           args=(ring,))
+        consumer.start()
+        start = time.perf_counter()
+        sent = 0
+        while sent < count:
+            if ring.put(TCP_FRAME):
+                sent += 1
+            else:
+                time.sleep(0)
+        ring.finish()
+        consumer.join()
+        return count / (time.perf_counter() - start)
+
+
+def run(number: int = 1) -> Dict[str, float]:
+    count = FRAME_COUNT * number
+    return {"frames through multiprocessing.Queue": through_queue(count),
+            "frames through FrameRing": through_ring(count)}
+
+
+if __name__ == "__main__":
+    report("Frame passing between processes", run(), unit="frames/sec")
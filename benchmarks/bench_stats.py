@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the rate at which dissected IPv4/TCP frames from 50,000 distinct
+hosts are aggregated by the exact counters of TrafficSummary and by the
+sketches of TrafficStats. The memory held by each once every frame is
+counted is printed when run as a script, with
+"python -m benchmarks.bench_stats".
+'''
+
+import struct
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.common import (
+    ETH_HEADER,
+    IPV4_HEADER,
+    TCP_HEADER,
+    measure,
+    report
+)
+from netprotocols import dissect
+from netprotocols.analysis.parallel import TrafficSummary
+from netprotocols.analysis.stats import TrafficStats
+
+HOSTS = 50_000
+
+
+def packets() -> List:
+    result = []
+    for host in range(HOSTS):
+        src = struct.pack(">I", 0x0a000000 + host)
+        ip = IPV4_HEADER[:12] + src + IPV4_HEADER[16:]
+        result.append(dissect(ETH_HEADER + ip + TCP_HEADER))
+    return result
+
+
+def aggregate(summary: Callable, stream: List):
+    aggregates = summary()
+    for packet in stream:
+        aggregates.add(packet, 66)
+    return aggregates
+
+
+def memory(summary: Callable, stream: List) -> int:
+    """Bytes held by the aggregates of a stream."""
+    tracemalloc.start()
+    aggregates = aggregate(summary, stream)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del aggregates
+    return allocated
+
+
+def run(number: int = 3) -> Dict[str, float]:
+    stream = packets()
+    return {name: len(stream) * measure(
+                lambda: aggregate(summary, stream), number=number, repeat=3)
+            for name, summary in (("exact counters", TrafficSummary),
+                                  ("sketches", TrafficStats))}
+
+
+if __name__ == "__main__":
+    report(f"Traffic statistics, {HOSTS} hosts", run(), unit="packets/sec")
+    stream = packets()
+    for name, summary in (("exact counters", TrafficSummary),
+                          ("sketches", TrafficStats)):
+        print(f"  {name}: {memory(summary, stream):,} bytes held")
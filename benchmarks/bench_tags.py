@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Measure the rate at which Ethernet/IPv4/TCP frames are dissected when
+untagged, behind an 802.1Q tag, behind QinQ tags and behind a stack of
+two MPLS labels. Run with "python -m benchmarks.bench_tags".
+'''
+
+from typing import Dict
+
+from benchmarks.common import IPV4_HEADER, TCP_FRAME, TCP_HEADER, measure, \
+    report
+from netprotocols import dissect
+
+ADDRESSES, PACKET = TCP_FRAME[:12], IPV4_HEADER + TCP_HEADER
+FRAMES = {
+    "untagged": TCP_FRAME,
+    "802.1Q": ADDRESSES + b"\x81\x00\x00\x0a\x08\x00" + PACKET,
+    "QinQ": ADDRESSES + b"\x88\xa8\x00\x64\x81\x00\x00\x0a\x08\x00" + PACKET,
+    "MPLS": ADDRESSES + b"\x88\x47\x00\x3e\x80\x40\x00\x3e\x91\x3f" + PACKET,
+}
+
+
+def run(number: int = 50_000) -> Dict[str, float]:
+    return {name: measure(lambda: dissect(frame), number=number, repeat=3)
+            for name, frame in FRAMES.items()}
+
+
+if __name__ == "__main__":
+    report("Dissect Ethernet/IPv4/TCP frames", run(), unit="frames/sec")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare crafting Ethernet/IPv4/UDP frames that differ by source port and
+IPv4 identification by constructing the headers of each frame, with
+their checksums, against setting those fields on a PacketTemplate. Run
+with "python -m benchmarks.bench_template".
+'''
+
+from itertools import count
+from typing import Dict
+
+from benchmarks.common import measure, report
+from netprotocols import Ethernet, IPv4, Packet, PacketTemplate, UDP
+
+PAYLOAD = bytes(18)
+
+
+def build_packet(sport: int, ident: int) -> Packet:
+    eth = Ethernet(dst="ff:ff:ff:ff:ff:ff", src="00:07:0d:af:f4:54",
+                   eth=0x0800)
+    ip = IPv4(version=4, ihl=5, dscp=0, ecp=0, len=28 + len(PAYLOAD),
+              id=ident, flags=2, offset=0, ttl=64, proto=0x11, chksum=0,
+              src="192.168.1.96", dst="192.168.1.254")
+    ip.chksum = ip.compute_chksum()
+    udp = UDP(sport=sport, dport=53, len=8 + len(PAYLOAD), chksum=0)
+    udp.chksum = udp.compute_chksum(ip, PAYLOAD)
+    return Packet(eth, ip, udp)
+
+
+def run(number: int = 10_000) -> Dict[str, float]:
+    ports, idents = count(), count()
+    template = PacketTemplate(build_packet(0, 0), PAYLOAD)
+    set_sport = template.setter("udp.sport")
+    set_ident = template.setter("ipv4.id")
+
+    def construct():
+        return bytes(build_packet(next(ports) & 0xffff,
+                                  next(idents) & 0xffff)) + PAYLOAD
+
+    def from_template():
+        set_sport(next(ports) & 0xffff)
+        set_ident(next(idents) & 0xffff)
+        return template.buffer
+
+    return {
+        "Ethernet/IPv4/UDP frame (construct)": measure(construct,
+                                                       number=number),
+        "Ethernet/IPv4/UDP frame (template)": measure(from_template,
+                                                      number=number)
+    }
+
+
+if __name__ == "__main__":
+    report("Packet templates", run())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare the extraction of bitfields from a contiguous buffer of
+fixed-stride frames with NumPy against decode_many and per-instance
+decoding. Requires the "numpy" extra. Run with
+"python -m benchmarks.bench_vectorized".
+'''
+
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols import Ethernet, IPv4, TCP
+from netprotocols.base import vectorized
+
+BATCH_SIZE = 100_000
+TCP_OFFSET = Ethernet.header_len + IPv4.header_len
+
+
+def per_instance(buffer: memoryview) -> int:
+    stride = len(TCP_FRAME)
+    return sum(TCP.decode(buffer, offset).flags
+               for offset in range(TCP_OFFSET, len(buffer), stride))
+
+
+def columnar(frames) -> int:
+    return sum(TCP.decode_many(frames, TCP_OFFSET, ["flags"])["flags"])
+
+
+def numpy(buffer: bytes) -> int:
+    records = vectorized.frombuffer(TCP, buffer, offset=TCP_OFFSET,
+                                    stride=len(TCP_FRAME))
+    return int(vectorized.field(records, TCP, "flags").sum())
+
+
+def run(number: int = 3) -> Dict[str, float]:
+    buffer = TCP_FRAME * BATCH_SIZE
+    frames = [TCP_FRAME] * BATCH_SIZE
+    return {
+        "sum of TCP.flags (per instance)": BATCH_SIZE * measure(
+            lambda: per_instance(memoryview(buffer)), number=number),
+        "sum of TCP.flags (decode_many)": BATCH_SIZE * measure(
+            lambda: columnar(frames), number=number),
+        "sum of TCP.flags (numpy)": BATCH_SIZE * measure(
+            lambda: numpy(buffer), number=number)
+    }
+
+
+if __name__ == "__main__":
+    report("Vectorized parsing", run(), unit="headers/sec")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Compare the default dissection path, which copies each header and the
+frame they keep out of a buffer, against the zero-copy path, which maps
+each header onto the buffer in place, for frames without payload and
+frames carrying a full-sized one. Run with
+"python -m benchmarks.bench_zero_copy".
+'''
+
+import struct
+from ctypes import addressof, c_char, sizeof
+from typing import Dict
+
+from benchmarks.common import TCP_FRAME, measure, report
+from netprotocols import dissect
+from netprotocols.base.packet import RawLayer
+
+RING_SLOTS = 1024
+PAYLOAD = bytes(1460)  # TCP payload of a full-sized Ethernet frame
+
+
+def with_payload(payload: bytes) -> bytearray:
+    """Build the TCP frame carrying a payload, with the IPv4 total length
+    accounting for it."""
+    frame = bytearray(TCP_FRAME + payload)
+    struct.pack_into(">H", frame, 16, len(frame) - 14)
+    return frame
+
+
+def decode_frame(frame, zero_copy: bool):
+    packet = dissect(frame, zero_copy=zero_copy)
+    return packet.ethernet, packet.ipv4, packet.tcp
+
+
+def bytes_copied(frame: bytearray, zero_copy: bool) -> int:
+    """Count the bytes of every layer dissected from the frame, and of
+    every packet kept by its headers, not backed by the frame itself.
+    Raw layers, such as the payload, are always copies."""
+    start = addressof((c_char * len(frame)).from_buffer(frame))
+    end = start + len(frame)
+    layers = dissect(frame, zero_copy=zero_copy).layers
+    headers = [layer for layer in layers if not isinstance(layer, RawLayer)]
+    copied = sum(len(layer) for layer in layers
+                 if isinstance(layer, RawLayer))
+    copied += sum(sizeof(header) for header in headers
+                  if not start <= addressof(header) < end)
+    kept = {id(header._packet): header._packet for header in headers}
+    return copied + sum(len(packet) for packet in kept.values()
+                        if not (packet is frame or
+                                getattr(packet, "obj", None) is frame))
+
+
+def run(number: int = 10_000) -> Dict[str, float]:
+    results = {}
+    for payload in b"", PAYLOAD:
+        ring = [with_payload(payload) for _ in range(RING_SLOTS)]
+        for zero_copy in False, True:
+            mode = "zero-copy" if zero_copy else "copy"
+            slots = iter(ring * (number * 5 // RING_SLOTS + 1))
+            results[f"decode Ethernet/IPv4/TCP, {len(payload)}-byte "
+                    f"payload ({mode})"] = measure(
+                lambda: decode_frame(next(slots), zero_copy), number=number)
+    return results
+
+
+if __name__ == "__main__":
+    report("Zero-copy decoding", run())
+    frame = with_payload(PAYLOAD)
+    report("Bytes copied out of a full-sized frame", {
+        "copy": bytes_copied(frame, zero_copy=False),
+        "zero-copy": bytes_copied(frame, zero_copy=True)
+    }, unit="bytes")
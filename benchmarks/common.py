@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import timeit
+from typing import Callable, Dict
+
+from netprotocols import ARP, Ethernet, ICMPv4, ICMPv6, IPv4, IPv6, TCP, UDP
+
+'''
+An Ethernet II frame carrying an IPv4 packet and a TCP segment with
+12 bytes of options (NOP, NOP, Timestamps), as found on an SSH session,
+with correct checksums.
+'''
+ETH_HEADER = b"\xff\xff\xff\xff\xff\xff\x00\x07\x0d\xaf\xf4\x54\x08\x00"
+IPV4_HEADER = b"\x45\x00\x00\x34\xec\x6c\x40\x00\x40\x06\xc9\xa8" \
+              b"\xc0\xa8\x01\x60\xc0\xa8\x01\xfe"
+TCP_HEADER = b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x80\x18\x21" \
+             b"\x5c\xab\x43\x00\x00\x01\x01\x08\x0a\x00\x08\xca\x61\x00\x01" \
+             b"\x69\x2e"
+TCP_FRAME = ETH_HEADER + IPV4_HEADER + TCP_HEADER
+
+'''
+One header of each protocol, as used by the unit tests.
+'''
+ARP_HEADER = b"\x00\x01\x08\x00\x06\x04\x00\x01\x00\x07\x0d\xaf\xf4\x54" \
+             b"\x18\xa6\xac\x01\x00\x00\x00\x00\x00\x00\x18\xa6\xad\x9f"
+IPV6_HEADER = b"\x60\x00\x00\x00\x00\x78\x06\xff\xfe\x80\x00\x00\x00\x00" \
+              b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\xff\x02\x00\x00" \
+              b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01"
+ICMPV4_HEADER = b"\x08\x00\x83\xf7\x00\x01\x00\x01"
+ICMPV6_HEADER = b"\x80\x00\x3f\x69\x76\x20\x01\x00"
+UDP_HEADER = b"\x09\x5e\x00\x35\x00\x29\x36\x49"
+SAMPLES = {
+    Ethernet: ETH_HEADER,
+    ARP: ARP_HEADER,
+    IPv4: IPV4_HEADER,
+    IPv6: IPV6_HEADER,
+    ICMPv4: ICMPV4_HEADER,
+    ICMPv6: ICMPV6_HEADER,
+    TCP: TCP_HEADER,
+    UDP: UDP_HEADER
+}
+
+
+def measure(func: Callable[[], object], *,
+            number: int = 10_000,
+            repeat: int = 5) -> float:
+    """
+    Call a function a given number of times per round and return the
+    best observed rate of calls per second over all rounds.
+    """
+    best = min(timeit.Timer(func).repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def report(title: str, results: Dict[str, float], unit: str = "ops/sec"):
+    """Print a table of named benchmark results."""
+    print(title)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"  {name:<{width}}  {value:>14,.1f} {unit}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Run every benchmark module of this package (the bench_*.py files), save
+the results as JSON and compare them against a stored baseline.
+
+Ex: Record a baseline before upgrading, then check the upgrade with
+    python -m benchmarks.run --save-baseline baseline.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.15
+
+Comparison exits with status 1 if any result dropped below the baseline
+by more than the tolerance. Rates depend on the machine, so baselines
+are only comparable when recorded on the same one.
+'''
+
+import argparse
+import importlib
+import inspect
+import json
+import pkgutil
+import platform
+import sys
+from typing import Dict, List
+
+import benchmarks
+from benchmarks.common import report
+
+Results = Dict[str, Dict[str, float]]
+
+
+def discover(names: List[str] = None) -> List[str]:
+    modules = sorted(module.name for module in
+                     pkgutil.iter_modules(benchmarks.__path__)
+                     if module.name.startswith("bench_"))
+    if names:
+        modules = [module for module in modules
+                   if any(name in module for name in names)]
+    return modules
+
+
+def run_all(modules: List[str], scale: float = 1.0) -> Results:
+    results = {}
+    for name in modules:
+        try:
+            module = importlib.import_module(f"benchmarks.{name}")
+        except ImportError as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        number = inspect.signature(module.run).parameters["number"].default
+        results[name] = module.run(number=max(1, int(number * scale)))
+        report(name, results[name])
+    return results
+
+
+def compare(results: Results, baseline: Results,
+            tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline, print the relative change of
+    every result found in both and return the names of regressions.
+    """
+    regressions = []
+    print(f"Change from baseline (tolerance {tolerance:.0%})")
+    for module, module_results in results.items():
+        for name, rate in module_results.items():
+            try:
+                baseline_rate = baseline[module][name]
+            except KeyError:
+                continue
+            change = rate / baseline_rate - 1
+            regressed = change < -tolerance
+            if regressed:
+                regressions.append(f"{module}: {name}")
+            print(f"  {'REGRESSION ' if regressed else ''}{module}: {name}: "
+                  f"{change:+.1%}")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the benchmarks of netprotocols.")
+    parser.add_argument("names", nargs="*",
+                        help="run only modules whose name contains these")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="compare the results against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative slowdown tolerated by --compare")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="scale the iterations of every benchmark")
+    args = parser.parse_args(argv)
+
+    results = run_all(discover(args.names), args.scale)
+    document = {"python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "results": results}
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
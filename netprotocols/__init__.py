@@ -1,4 +1,10 @@
-from netprotocols.base.protocol import Protocol
+from netprotocols.base.protocol import (
+    Protocol,
+    PackedField,
+    BytesField,
+    HardwareAddress,
+    ProtocolAddress
+)
 from netprotocols.base.packet import Packet
 from netprotocols.layer2.ethernet import Ethernet
 from netprotocols.layer2.arp import ARP
@@ -6,3 +12,18 @@ from netprotocols.layer3.icmp import ICMPv4, ICMPv6
 from netprotocols.layer3.ip import IPv4, IPv6
 from netprotocols.layer4.tcp import TCP
 from netprotocols.layer4.udp import UDP
+from netprotocols.base.dissector import dissect
+from netprotocols.base.template import PacketTemplate
+from netprotocols.capture.pcap import (
+    PcapReader,
+    PcapngReader,
+    PcapWriter,
+    open_capture
+)
+from netprotocols.capture.filter import PacketFilter
+from netprotocols.capture.live import (
+    Capture,
+    FileSource,
+    MemorySource,
+    SocketSource
+)
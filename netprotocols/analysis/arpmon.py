@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Monitoring of the bindings of IPv4 addresses to MAC addresses announced
+by ARP, for the detection of spoofing.
+
+Each ARP request or reply announces the binding of its sender, which is
+kept in a neighbor table keyed by the packed IPv4 address, the MAC
+address being kept packed as well. A binding contradicting the one held
+for its address is reported as a conflict, as is expected when another
+host answers for that address, and announcements in which a sender
+claims its own address as the target, known as gratuitous ARP, are
+counted per address so that floods of them are reported.
+
+Raw frames are read with a single unpack of the fields needed, without
+decoding an ARP header nor converting any address to a string. Entries
+are aged by a timer wheel, so refreshing an entry costs no timer
+operation.
+'''
+
+import socket
+import struct
+from typing import Callable, Dict, Optional
+
+from netprotocols import ARP, Protocol
+from netprotocols.base.timerwheel import TimerWheel
+from netprotocols.layer2.vlan import STACK_ETHERTYPES, skip_tags
+
+ETHERNET_IPV4 = b"\x00\x01\x08\x00\x06\x04"  # htype, ptype, hlen and plen
+UNSPECIFIED = bytes(4)  # Sender address of probes (RFC 5227)
+
+'''Ethertype, then the fields of an ARP header but the operation code and
+the target hardware address, which the monitor does not need.'''
+arp_frame = struct.Struct(">H6s2x6s4s6x4s")
+arp_header = struct.Struct(">6s2x6s4s6x4s")
+
+
+class Neighbor:
+    """The binding of an IPv4 address to a MAC address, both packed."""
+    __slots__ = "ip", "mac", "first_seen", "last_seen", "window_start", \
+        "gratuitous"
+
+    def __init__(self, ip: bytes, mac: bytes, timestamp: float):
+        self.ip = ip
+        self.mac = mac
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.window_start = timestamp  # Start of the flood window
+        self.gratuitous = 0            # Gratuitous ARP in the window
+
+    def __repr__(self):
+        return f"Neighbor({socket.inet_ntoa(self.ip)} at " \
+               f"{Protocol.addr_array_to_hdwr(self.mac)})"
+
+
+class ARPMonitor:
+    """
+    Table of the neighbors announced by a sequence of ARP packets.
+
+    A packet binding an address to another MAC address than the one held
+    is passed to on_conflict(neighbor, previous_mac) once the neighbor
+    is bound to the new one. A neighbor sending flood_threshold
+    gratuitous ARP packets within flood_window seconds is passed to
+    on_flood(neighbor), once per window. Neighbors not heard from for
+    timeout seconds are passed to on_expire(neighbor) and removed.
+    Probes, whose sender address is unspecified, bind no address.
+    """
+
+    def __init__(self, *, timeout: float = 300.0,
+                 flood_threshold: int = 10, flood_window: float = 1.0,
+                 tick: float = 1.0, wheel_slots: int = 512,
+                 on_conflict: Callable = None, on_flood: Callable = None,
+                 on_expire: Callable = None):
+        self.timeout = timeout
+        self.flood_threshold = flood_threshold
+        self.flood_window = flood_window
+        self.on_conflict = on_conflict
+        self.on_flood = on_flood
+        self.on_expire = on_expire
+        self.wheel: TimerWheel[Neighbor] = TimerWheel(wheel_slots, tick)
+        self.conflicts = 0  # Bindings changed
+        self.floods = 0     # Windows of gratuitous ARP flooding
+        self.expired = 0    # Neighbors removed after the timeout
+        self.probes = 0     # Packets from the unspecified address
+        self._neighbors: Dict[bytes, Neighbor] = {}
+
+    def __len__(self):
+        return len(self._neighbors)
+
+    def __iter__(self):
+        return iter(self._neighbors.values())
+
+    def get(self, ip: bytes) -> Optional[Neighbor]:
+        """Get the neighbor of a packed IPv4 address."""
+        return self._neighbors.get(ip)
+
+    def lookup(self, address: str) -> Optional[str]:
+        """
+        Get the MAC address bound to an IPv4 address, as strings.
+        Ex: "192.168.1.254" -> "00:1e:68:51:4f:a9"
+        """
+        neighbor = self._neighbors.get(socket.inet_aton(address))
+        return None if neighbor is None else \
+            Protocol.addr_array_to_hdwr(neighbor.mac)
+
+    def add_frame(self, frame, timestamp: float) -> Optional[Neighbor]:
+        """
+        Add the ARP packet carried by an Ethernet frame, tagged or not,
+        received at the given time in seconds. Return the neighbor it
+        announces, or None for other frames, probes and ARP packets for
+        other protocols than IPv4 over Ethernet.
+        """
+        try:
+            ethertype, prefix, sha, spa, tpa = \
+                arp_frame.unpack_from(frame, 12)
+            if ethertype in STACK_ETHERTYPES:
+                ethertype, offset = skip_tags(frame, 14, ethertype)
+                prefix, sha, spa, tpa = arp_header.unpack_from(frame, offset)
+        except struct.error:  # Truncated frame
+            return None
+        if ethertype != ARP.ethertype or prefix != ETHERNET_IPV4:
+            return None
+        return self._announce(sha, spa, tpa, timestamp)
+
+    def add(self, arp: ARP, timestamp: float) -> Optional[Neighbor]:
+        """Add a decoded ARP header received at the given time in
+        seconds. Return the neighbor it announces, if any."""
+        if (arp.htype, arp.ptype, arp.hlen, arp.plen) != (1, 0x0800, 6, 4):
+            return None
+        return self._announce(bytes(arp._sha), bytes(arp._spa),
+                              bytes(arp._tpa), timestamp)
+
+    def expire(self, now: float):
+        """Expire the neighbors not heard from for longer than the
+        timeout."""
+        for neighbor in self.wheel.advance(now):
+            self._check_expiry(neighbor, now)
+
+    def _announce(self, sha: bytes, spa: bytes, tpa: bytes,
+                  timestamp: float) -> Optional[Neighbor]:
+        """Bind the address of the sender of a packet to its MAC
+        address."""
+        for neighbor in self.wheel.advance(timestamp):
+            self._check_expiry(neighbor, timestamp)
+        if spa == UNSPECIFIED:
+            self.probes += 1
+            return None
+
+        neighbor = self._neighbors.get(spa)
+        if neighbor is None:
+            neighbor = self._neighbors[spa] = Neighbor(spa, sha, timestamp)
+            self.wheel.schedule(neighbor, timestamp + self.timeout)
+        elif neighbor.mac != sha:
+            previous, neighbor.mac = neighbor.mac, sha
+            self.conflicts += 1
+            if self.on_conflict is not None:
+                self.on_conflict(neighbor, previous)
+        neighbor.last_seen = timestamp
+
+        if spa == tpa:  # Gratuitous ARP
+            if timestamp - neighbor.window_start >= self.flood_window:
+                neighbor.window_start = timestamp
+                neighbor.gratuitous = 0
+            neighbor.gratuitous += 1
+            if neighbor.gratuitous == self.flood_threshold:
+                self.floods += 1
+                if self.on_flood is not None:
+                    self.on_flood(neighbor)
+        return neighbor
+
+    def _check_expiry(self, neighbor: Neighbor, now: float):
+        if self._neighbors.get(neighbor.ip) is not neighbor:
+            return  # Removed since it was scheduled
+        deadline = neighbor.last_seen + self.timeout
+        if deadline > now:
+            self.wheel.schedule(neighbor, deadline)
+            return
+        self.expired += 1
+        del self._neighbors[neighbor.ip]
+        if self.on_expire is not None:
+            self.on_expire(neighbor)
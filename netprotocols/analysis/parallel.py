@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Analysis of pcap files sharded across processes. Decoding headers is
+bound by the CPU and serialized by the GIL, so the records of a capture
+are split into chunks that are dissected by a pool of worker processes,
+each one mapping the file by itself, and the aggregates computed by the
+workers are merged into a single one.
+
+Aggregates are instances of TrafficSummary, which counts exactly, or of
+any class built without arguments that adds a frame with add(packet,
+wire_len) and merges another instance with merge(other), such as
+TrafficStats of netprotocols.analysis.stats, which counts in bounded
+memory. A functools.partial of a class passes it options.
+'''
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Tuple
+
+from netprotocols import dissect
+from netprotocols.capture.pcap import LINKTYPE_ETHERNET, PcapReader
+
+
+class TrafficSummary:
+    """
+    Mergeable aggregates of the frames of a capture: counts of frames
+    per encapsulated protocol, as named by the encapsulated_proto of the
+    Ethernet and IP headers, counts of TCP segments per combination of
+    flags, as given by TCP.flags_str, and the bytes sent on the wire by
+    each IPv4 source address.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.protocols = Counter()
+        self.tcp_flags = Counter()
+        self.talkers = Counter()
+
+    def __eq__(self, other):
+        return isinstance(other, TrafficSummary) and \
+            vars(self) == vars(other)
+
+    def add(self, packet, wire_len: int):
+        """Aggregate a frame dissected into an instance of Packet."""
+        self.frames += 1
+        if not hasattr(packet, "ethernet"):  # Runt frame
+            return
+        self.protocols[packet.ethernet.encapsulated_proto] += 1
+        if hasattr(packet, "ipv4"):
+            ip = packet.ipv4
+            self.talkers[ip.src] += wire_len
+        elif hasattr(packet, "ipv6"):
+            ip = packet.ipv6
+        else:
+            return
+        self.protocols[ip.encapsulated_proto] += 1
+        if hasattr(packet, "tcp"):
+            self.tcp_flags[packet.tcp.flags_str] += 1
+
+    def merge(self, other: "TrafficSummary") -> "TrafficSummary":
+        """Add the aggregates of another summary to this one."""
+        self.frames += other.frames
+        self.protocols.update(other.protocols)
+        self.tcp_flags.update(other.tcp_flags)
+        self.talkers.update(other.talkers)
+        return self
+
+    def top_talkers(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Get the IPv4 addresses that sent the most bytes."""
+        return self.talkers.most_common(count)
+
+
+def summarize_chunk(path: str, start: int, end: int,
+                    summary: Callable = TrafficSummary):
+    """Aggregate the Ethernet frames of a chunk of a pcap file into an
+    instance of summary."""
+    aggregate = summary()
+    with PcapReader(path) as reader:
+        if reader.linktype == LINKTYPE_ETHERNET:
+            for record in reader.records(start, end):
+                aggregate.add(dissect(record.frame), record.wire_len)
+    return aggregate
+
+
+def summarize(path: str, workers: int = None, chunks_per_worker: int = 4,
+              summary: Callable = TrafficSummary):
+    """
+    Aggregate the Ethernet frames of a pcap file with a pool of worker
+    processes, which defaults to one per CPU, into an instance of
+    summary. The file is split into a few chunks per worker so that the
+    load stays balanced when parts of the capture take longer to decode.
+    With a single worker the file is processed in the calling process.
+    """
+    workers = workers or os.cpu_count() or 1
+    with PcapReader(path) as reader:
+        chunks = reader.chunks(workers * chunks_per_worker)
+    if workers == 1:
+        return merge((summarize_chunk(path, start, end, summary)
+                      for start, end in chunks), summary)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize_chunk, path, start, end,
+                                   summary)
+                   for start, end in chunks]
+        return merge((future.result() for future in futures), summary)
+
+
+def merge(summaries: Iterable, summary: Callable = TrafficSummary):
+    """Merge summaries into a new instance of summary."""
+    total = summary()
+    for chunk_summary in summaries:
+        total.merge(chunk_summary)
+    return total
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Traffic statistics computed in bounded memory from streams of decoded
+packets, for dashboards refreshed every second on networks whose number
+of hosts would make exact counters grow without limit.
+
+Three sketches summarize the stream, each mergeable with another of the
+same dimensions so that statistics computed by parallel workers, or
+over consecutive intervals, can be combined:
+
+- CountMinSketch answers the total counted for any key, never below
+  the true value and above it by a bounded fraction of the whole stream.
+- HyperLogLog estimates the number of distinct keys seen.
+- SpaceSaving keeps the keys with the largest totals among a fixed
+  number of counters.
+
+Keys are hashed by a CRC-32 followed by the finalizer of MurmurHash3,
+so that sketches built in different processes agree, which the salted
+built-in hash of Python does not guarantee. Addresses are kept packed as
+found in the headers and only converted to strings when reported.
+'''
+
+import math
+import socket
+from array import array
+from collections import Counter
+from heapq import heapify, heappush, heapreplace
+from operator import add
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+from zlib import crc32
+
+from netprotocols import Ethernet, IPv4, dissect
+from netprotocols.capture.pcap import LINKTYPE_ETHERNET, Record
+
+TRANSPORTS = {6: "tcp", 17: "udp"}  # Protocols of the services counted
+
+
+def hash32(key: bytes) -> int:
+    """Hash a byte string into 32 bits, identically in every process."""
+    value = crc32(key)
+    value = (value ^ value >> 16) * 0x85ebca6b & 0xffffffff
+    value = (value ^ value >> 13) * 0xc2b2ae35 & 0xffffffff
+    return value ^ value >> 16
+
+
+class CountMinSketch:
+    """
+    Rows of width counters each, a key adding its count to one counter
+    of every row and being estimated by the least of them. Estimates
+    exceed the true count by at most e / width times the total counted
+    with a probability of 1 - e ** -depth. The width must be a power of
+    two.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        if width < 1 or width & width - 1 or depth < 1:
+            raise ValueError(f"Invalid dimensions for a Count-Min sketch: "
+                             f"width {width}, depth {depth}")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.counters = array("Q", bytes(8 * width * depth))
+        self._rows = range(0, width * depth, width)  # Offset of each row
+
+    def __eq__(self, other):
+        return isinstance(other, CountMinSketch) and \
+            (self.width, self.depth, self.total, self.counters) == \
+            (other.width, other.depth, other.total, other.counters)
+
+    @property
+    def nbytes(self) -> int:
+        return self.width * self.depth * self.counters.itemsize
+
+    def _indices(self, hashed: int) -> List[int]:
+        """Positions of the counters of a hashed key in the flat array
+        of counters, one per row by double hashing."""
+        mask = self.width - 1
+        step = hashed * 0x9e3779b97f4a7c15 >> 32 | 1
+        return [row + (hashed + number * step & mask)
+                for number, row in enumerate(self._rows)]
+
+    def add(self, key: bytes, count: int = 1):
+        self.add_hash(hash32(key), count)
+
+    def add_hash(self, hashed: int, count: int = 1):
+        """Add to the count of a key given its hash32."""
+        counters, mask = self.counters, self.width - 1
+        step = hashed * 0x9e3779b97f4a7c15 >> 32 | 1
+        for row in self._rows:  # Inlined _indices, as called per packet
+            counters[row + (hashed & mask)] += count
+            hashed += step
+        self.total += count
+
+    def estimate(self, key: bytes) -> int:
+        counters = self.counters
+        return min(counters[index] for index in self._indices(hash32(key)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Add the counts of a sketch of the same dimensions."""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different "
+                             "dimensions")
+        self.counters = array("Q", map(add, self.counters, other.counters))
+        self.total += other.total
+        return self
+
+
+class HyperLogLog:
+    """
+    Estimator of the number of distinct keys added to it, holding one
+    byte per register for 2 ** precision registers. The standard error
+    of the estimate is about 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"Invalid HyperLogLog precision: {precision}. "
+                             f"Must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __eq__(self, other):
+        return isinstance(other, HyperLogLog) and \
+            self.registers == other.registers
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.registers)
+
+    def add(self, key: bytes):
+        self.add_hash(hash32(key))
+
+    def add_hash(self, hashed: int):
+        """Add a key given its hash32. The first bits of the hash select
+        a register, which keeps the largest rank of the first bit set
+        among the remaining ones."""
+        bits = 32 - self.precision
+        rank = bits + 1 - (hashed & (1 << bits) - 1).bit_length()
+        index = hashed >> bits
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        registers = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(
+            registers, 0.7213 / (1 + 1.079 / registers))
+        estimate = alpha * registers ** 2 / \
+            sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * registers and zeros:
+            estimate = registers * math.log(registers / zeros)
+        elif estimate > 2 ** 32 / 30:
+            estimate = -2 ** 32 * math.log(1 - estimate / 2 ** 32)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Take the union of the keys of an estimator of the same
+        precision."""
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog estimators of "
+                             "different precisions")
+        self.registers = bytearray(map(max, self.registers,
+                                       other.registers))
+        return self
+
+
+class SpaceSaving:
+    """
+    The keys with the largest totals in a stream, tracked by a fixed
+    number of counters. A key without a counter takes over the one of
+    the smallest total and starts from it, so totals may exceed the true
+    ones by at most their error, while any key whose true total exceeds
+    the sum of all counts divided by the capacity is kept. Keys must be
+    comparable with each other, such as packed addresses.
+
+    The smallest counter is found through a heap holding one entry per
+    key, which is only brought up to date with the total of its key when
+    it reaches the top, so counting a key that is already tracked costs
+    a single dictionary update.
+    """
+
+    def __init__(self, capacity: int = 20):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity for a top-k summary: "
+                             f"{capacity}")
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}  # Count inherited at entry
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __eq__(self, other):
+        return isinstance(other, SpaceSaving) and \
+            (self.capacity, self.counts, self.errors) == \
+            (other.capacity, other.counts, other.errors)
+
+    def add(self, key: Hashable, count: int = 1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+        heap = self._heap
+        if len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            heappush(heap, (count, key))
+            return
+        least, victim = heap[0]
+        while counts[victim] != least:  # Stale entry, bring it up to date
+            heapreplace(heap, (counts[victim], victim))
+            least, victim = heap[0]
+        del counts[victim], self.errors[victim]
+        counts[key] = least + count
+        self.errors[key] = least
+        heapreplace(heap, (least + count, key))
+
+    def most_common(self, count: int = None) -> List[Tuple[Hashable, int]]:
+        """Get the keys with the largest totals, largest first."""
+        return sorted(self.counts.items(), key=lambda item: item[1],
+                      reverse=True)[:count]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Add the totals of another summary. A key missing from a full
+        summary may have been counted up to the smallest of its totals,
+        which is added to both its total and its error before the keys
+        with the largest totals are kept.
+        """
+        floors = [min(summary.counts.values())
+                  if len(summary.counts) >= summary.capacity else 0
+                  for summary in (self, other)]
+        counts, errors = {}, {}
+        for key in self.counts.keys() | other.counts.keys():
+            counts[key] = sum(summary.counts.get(key, floor)
+                              for summary, floor in zip((self, other),
+                                                        floors))
+            errors[key] = sum(summary.errors.get(key, floor)
+                              for summary, floor in zip((self, other),
+                                                        floors))
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {key: counts[key] for key in kept}
+        self.errors = {key: errors[key] for key in kept}
+        self._heap = [(total, key) for key, total in self.counts.items()]
+        heapify(self._heap)
+        return self
+
+
+class TrafficStats:
+    """
+    Mergeable statistics of a stream of frames dissected into instances
+    of Packet: counts of frames per Ethertype and of IP packets per
+    protocol number, the number of distinct source and destination
+    addresses, the bytes sent on the wire by any source address and the
+    largest senders, and the TCP and UDP services receiving the most
+    packets, a service being named by the lower of the two ports of a
+    segment or datagram.
+
+    Sketches are sized to fit in about memory bytes, an eighth of which
+    goes to the distinct counts, besides the top entries kept for each
+    top-k summary. Statistics can only be merged with others of the same
+    memory budget.
+    """
+
+    def __init__(self, memory: int = 256 * 1024, top: int = 20):
+        precision = min(16, (memory // 16).bit_length() - 1)
+        width = 1 << ((memory - (2 << precision)) // 32).bit_length() - 1
+        if precision < 4 or width < 64:
+            raise ValueError(f"Memory budget too small for traffic "
+                             f"statistics: {memory} bytes")
+        self.frames = 0
+        self.bytes = 0
+        self.ethertypes = Counter()
+        self.ip_protocols = Counter()
+        self.sources = HyperLogLog(precision)
+        self.destinations = HyperLogLog(precision)
+        self.host_bytes = CountMinSketch(width, depth=4)
+        self.talkers = SpaceSaving(top)
+        self.services = SpaceSaving(top)
+
+    def __eq__(self, other):
+        return isinstance(other, TrafficStats) and vars(self) == vars(other)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sketches, regardless of the top-k keys."""
+        return self.sources.nbytes + self.destinations.nbytes + \
+            self.host_bytes.nbytes
+
+    def add(self, packet, wire_len: int):
+        """Aggregate a frame dissected into an instance of Packet."""
+        self.frames += 1
+        self.bytes += wire_len
+        eth = getattr(packet, "ethernet", None)
+        if eth is None:  # Runt frame
+            return
+        self.ethertypes[eth.eth] += 1
+        ip = getattr(packet, "ipv4", None)  # Each layer is looked up once
+        if ip is not None:
+            protocol = ip.proto
+        else:
+            ip = getattr(packet, "ipv6", None)
+            if ip is None:
+                return
+            protocol = ip.upper_layer[0]
+        self.ip_protocols[protocol] += 1
+        src = bytes(ip._src)
+        hashed = hash32(src)
+        self.sources.add_hash(hashed)
+        self.host_bytes.add_hash(hashed, wire_len)
+        self.talkers.add(src, wire_len)
+        self.destinations.add(bytes(ip._dst))
+        if protocol not in TRANSPORTS:
+            return
+        transport = getattr(packet, TRANSPORTS[protocol], None)
+        if transport is not None:
+            self.services.add((protocol, min(transport.sport,
+                                             transport.dport)))
+
+    def merge(self, other: "TrafficStats") -> "TrafficStats":
+        """Add the statistics of another instance to this one."""
+        self.frames += other.frames
+        self.bytes += other.bytes
+        self.ethertypes.update(other.ethertypes)
+        self.ip_protocols.update(other.ip_protocols)
+        for name in ("sources", "destinations", "host_bytes", "talkers",
+                     "services"):
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def bytes_sent(self, address: str) -> int:
+        """Estimate the bytes sent by an IPv4 or IPv6 address."""
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        return self.host_bytes.estimate(socket.inet_pton(family, address))
+
+    def top_talkers(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Get the addresses that sent the most bytes."""
+        return [(socket.inet_ntop(socket.AF_INET if len(address) == 4
+                                  else socket.AF_INET6, address), total)
+                for address, total in self.talkers.most_common(count)]
+
+    def top_services(self, count: int = 10) -> List[Tuple[str, int]]:
+        """
+        Get the services that received the most packets.
+        Ex: [("tcp/443", 1520), ("udp/53", 310)]
+        """
+        return [(f"{TRANSPORTS[protocol]}/{port}", total)
+                for (protocol, port), total
+                in self.services.most_common(count)]
+
+    def summary(self, count: int = 10) -> dict:
+        """Get the statistics in a form fit for display."""
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "protocols": {
+                **{Ethernet.ethertypes.get(ethertype, hex(ethertype)): total
+                   for ethertype, total in self.ethertypes.items()},
+                **{IPv4.protocol_numbers.get(number, str(number)): total
+                   for number, total in self.ip_protocols.items()}},
+            "distinct_sources": self.sources.estimate(),
+            "distinct_destinations": self.destinations.estimate(),
+            "top_talkers": self.top_talkers(count),
+            "top_services": self.top_services(count)
+        }
+
+
+def per_interval(records: Iterable[Record], interval: float = 1.0,
+                 **options) -> Iterator[Tuple[float, TrafficStats]]:
+    """
+    Aggregate the Ethernet frames of capture records into one instance
+    of TrafficStats per interval of the given number of seconds, built
+    with the given options and yielded with the time its interval
+    starts once a record of a later interval is read. Intervals without
+    any record are skipped.
+    """
+    stats, start = None, None
+    for record in records:
+        if record.linktype != LINKTYPE_ETHERNET:
+            continue
+        if stats is None or record.timestamp >= start + interval:
+            if stats is not None:
+                yield start, stats
+            stats = TrafficStats(**options)
+            start = record.timestamp - record.timestamp % interval
+        stats.add(dissect(record.frame), record.wire_len)
+    if stats is not None:
+        yield start, stats
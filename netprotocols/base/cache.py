@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Bounded least-recently-used caches of the conversions between the string
+and packed representations of MAC and IP addresses. Real traffic has a
+small working set of hosts, so repeated addresses cost a dictionary
+lookup instead of being parsed or formatted again.
+
+Every cache created by the address_cache decorator can be resized,
+disabled and inspected at once through the functions of this module.
+The cache of Protocol.array_to_proto_addr is created disabled since
+inet_ntop formats an address faster than a cached result is found.
+'''
+
+import functools
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple
+
+default_maxsize = 1024  # Entries held by each cache
+caches: List["LRUCache"] = []
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    Wrap a function with a bounded cache of its results, evicting the
+    least recently used entry once maxsize entries are held.
+
+    Results are looked up by the arguments of each call, or by the
+    value returned by the key function when arguments are not
+    hashable, such as ctypes arrays. When a copy function is given, each
+    call returns a copy of the cached result so that mutable results,
+    such as ctypes arrays, can be modified by callers safely.
+    """
+
+    def __init__(self, function: Callable, *, maxsize: int = None,
+                 key: Callable = None, copy: Callable = None,
+                 enabled: bool = True):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.maxsize = default_maxsize if maxsize is None else maxsize
+        self.key = key
+        self.copy = copy
+        self.enabled = enabled
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+
+    def __call__(self, *args, **kwargs):
+        if not self.enabled:
+            return self.function(*args, **kwargs)
+        if self.key is not None:
+            key = self.key(*args, **kwargs)
+        else:
+            key = args + tuple(kwargs.items()) if kwargs else args
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self.function(*args, **kwargs)
+            if self.maxsize > 0:
+                self._entries[key] = value
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value if self.copy is None else self.copy(value)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._entries))
+
+    def cache_clear(self):
+        """Remove every entry and reset the statistics."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def resize(self, maxsize: int):
+        """Change the maximum number of entries, evicting the least
+        recently used ones as required."""
+        self.maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+
+def address_cache(*, key: Callable = None, copy: Callable = None,
+                  enabled: bool = True) -> Callable:
+    """Decorate a conversion function with a registered LRUCache."""
+    def decorator(function: Callable) -> LRUCache:
+        cache = LRUCache(function, key=key, copy=copy, enabled=enabled)
+        caches.append(cache)
+        return cache
+    return decorator
+
+
+def configure(*, maxsize: int = None, enabled: bool = None):
+    """
+    Set the maximum number of entries of every address cache or enable
+    or disable them all. Disabling a cache keeps its entries, which are
+    used again once it is enabled.
+    """
+    for cache in caches:
+        if maxsize is not None:
+            cache.resize(maxsize)
+        if enabled is not None:
+            cache.enabled = enabled
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """Get the statistics of every address cache, keyed by the name of
+    the function it wraps."""
+    return {cache.__name__: cache.cache_info() for cache in caches}
+
+
+def cache_clear():
+    """Empty every address cache and reset its statistics."""
+    for cache in caches:
+        cache.cache_clear()
+
+
+def packed_key(addr_array, *args, **kwargs) -> tuple:
+    """Key the result of a conversion by the bytes of a packed array."""
+    return (bytes(addr_array),) + args + tuple(kwargs.items())
+
+
+def copy_array(addr_array):
+    return type(addr_array).from_buffer_copy(addr_array)
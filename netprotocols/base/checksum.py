@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+The Internet checksum as defined by IETF RFC 1071, with the incremental
+update of IETF RFC 1624.
+
+Instead of adding the 16-bit words of a buffer one at a time, the whole
+buffer is read as a single integer with int.from_bytes. Since 2 ** 16
+is congruent to 1 modulo 0xffff, that integer is congruent to the sum
+of its 16-bit words, so a single modulo operation performed in C yields
+their ones' complement sum.
+'''
+
+from typing import Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def ones_complement_sum(data: Buffer, initial: int = 0) -> int:
+    """
+    Compute the 16-bit ones' complement sum of a buffer, padded with a
+    zero byte if its length is odd, added to an initial partial sum.
+    """
+    if len(data) % 2:
+        data = bytes(data) + b"\x00"
+    total = int.from_bytes(data, "big") + initial
+    folded = total % 0xffff
+    return 0xffff if total and not folded else folded
+
+
+def internet_checksum(data: Buffer, initial: int = 0) -> int:
+    """
+    Compute the Internet checksum of a buffer. A buffer that includes a
+    correct checksum yields zero.
+    """
+    return ~ones_complement_sum(data, initial) & 0xffff
+
+
+def header_checksum(header, payload: Buffer = b"", ip=None,
+                    proto: int = 0) -> int:
+    """
+    Compute the checksum of a protocol header followed by its payload,
+    taking the chksum field of the header as zero. When the header of
+    the IP packet carrying it is given, the checksum also covers the
+    pseudo-header for the given upper-layer protocol number.
+
+    Since the chksum field is 16-bit aligned, its contribution to the
+    sum is removed arithmetically instead of zeroing a copy of the
+    header.
+    """
+    raw = bytes(header) + payload
+    initial = 0 if ip is None else pseudo_header_sum(ip, proto, len(raw))
+    return internet_checksum(raw, initial + 0xffff - header.chksum)
+
+
+def verify_checksum(header, payload: Buffer = b"", ip=None,
+                    proto: int = 0) -> bool:
+    """
+    Check whether the chksum field of a protocol header is correct for
+    the header, its payload and, when given, the pseudo-header.
+    """
+    raw = bytes(header) + payload
+    initial = 0 if ip is None else pseudo_header_sum(ip, proto, len(raw))
+    return internet_checksum(raw, initial) == 0
+
+
+def pseudo_header_sum(ip, proto: int, length: int) -> int:
+    """
+    Compute the ones' complement sum of the IPv4 (RFC 793) or IPv6
+    (RFC 8200) pseudo-header covered by the checksum of an upper-layer
+    protocol, given the header of the IP packet carrying it, the number
+    of the upper-layer protocol and the length of its header and data.
+    """
+    addresses = bytes(ip._src) + bytes(ip._dst)
+    return ones_complement_sum(addresses, proto + length)
+
+
+def incremental_update(chksum: int, old: Union[int, Buffer],
+                       new: Union[int, Buffer]) -> int:
+    """
+    Update a checksum after 16-bit aligned data covered by it changes,
+    as given by Eqn. 3 of RFC 1624: HC' = ~(~HC + ~m + m'). The old and
+    new values are either 16-bit words or buffers of equal even length,
+    such as a pair of IPv4 addresses.
+
+    Ex: Decrementing the TTL of an IPv4 header changes the word holding
+    the TTL and protocol from (ttl << 8 | proto) to
+    ((ttl - 1) << 8 | proto).
+    """
+    if not isinstance(old, int):
+        old, new = int.from_bytes(old, "big"), int.from_bytes(new, "big")
+    '''Adding ~m is the same as subtracting m in ones' complement
+    arithmetic modulo 0xffff.'''
+    total = (~chksum & 0xffff) + new - old % 0xffff + 0xffff
+    folded = total % 0xffff
+    return ~(folded or 0xffff) & 0xffff
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from ctypes import sizeof
+from typing import Tuple
+
+from netprotocols import Ethernet, IPv4, IPv6, Packet, TCP
+from netprotocols.base.packet import Padding, Payload
+from netprotocols.base.protocol import is_immutable
+from netprotocols.base.registry import registry
+from netprotocols.layer2.vlan import STACK_ETHERTYPES, Tags, skip_tags
+from netprotocols.layer3.ip import (
+    ExtensionHeaders,
+    IPv4Options,
+    extension_lengths,
+    walk_extension_headers
+)
+from netprotocols.layer4.tcp import SegmentOptions
+
+
+def dissect(frame, *, zero_copy: bool = False) -> Packet:
+    """
+    Decode an Ethernet frame and every header encapsulated by it into a
+    new instance of Packet in a single pass, looking each encapsulated
+    protocol up in the registry by Ethertype and IP protocol number.
+
+    Each header is decoded at its offset within the frame, so the frame
+    is never sliced. Dissection stops at the first header whose protocol
+    is unknown or that does not fit in the remaining bytes of a
+    truncated frame, so a frame too short for its Ethernet header is
+    dissected into a Packet without layers. Refer to Protocol.decode for
+    the lifetime rules of headers decoded with zero_copy set.
+
+    Network headers are found past any VLAN tags and MPLS labels, which
+    are kept as the "tags" layer of the packet, following the Ethernet
+    header, and decoded by Ethernet.tags. The transport header is
+    decoded from a view of the frame ending with the IP packet whenever
+    the frame carries trailing bytes, such as the padding of short
+    Ethernet frames, so that its payload never includes them. No
+    transport header is decoded from the fragments of an IPv4 datagram
+    but the first, nor behind an IPv4 header whose length is invalid.
+
+    Every byte of the frame that no header decodes is kept as a raw
+    layer, so that the packet serializes back to the frame: IPv4 options
+    as "ipv4options", IPv6 extension headers as "extensionheaders", TCP
+    options as "segmentoptions", the data past the last header as
+    "payload" and the bytes past the IP packet as "padding". Raw layers
+    are copies, so the payload and padding are left out with zero_copy
+    set and remain readable as views through the headers.
+
+    Unless zero_copy is set, a frame that may change or be released,
+    such as a bytearray or the slot of a ring buffer, is copied once
+    into a bytes object shared by every header keeping its packet.
+    """
+    frame_len = len(frame)
+    if frame_len < Ethernet.header_len:
+        return Packet()
+    if not zero_copy and not is_immutable(frame):
+        frame = bytes(frame)
+    view = memoryview(frame)
+    layers, offset, end = _decode_headers(frame, view, zero_copy)
+    if not zero_copy:
+        end = min(max(end, offset), frame_len)
+        if offset < end:
+            layers.append(Payload(view[offset:end]))
+        if end < frame_len:
+            layers.append(Padding(view[end:]))
+    return Packet._from_layers(layers)
+
+
+def _decode_headers(frame, view: memoryview,
+                    zero_copy: bool) -> Tuple[list, int, int]:
+    """Decode the headers of a frame and the raw layers between them,
+    returning them with the offset past the last one and the offset of
+    the end of the IP packet, if any, or else of the frame."""
+    frame_len = len(frame)
+    eth = Ethernet.decode(frame, zero_copy=zero_copy)
+    layers = [eth]
+
+    offset, ethertype = Ethernet.header_len, eth.eth
+    if ethertype in STACK_ETHERTYPES:
+        ethertype, offset = skip_tags(frame, offset, ethertype)
+        layers.append(Tags(view[Ethernet.header_len:offset]))
+    network = registry.by_ethertype(ethertype)
+    if network is None or frame_len - offset < sizeof(network):
+        return layers, offset, frame_len
+    ip = network.decode(frame, offset, zero_copy=zero_copy)
+    layers.append(ip)
+    if network is IPv4:  # Total length may be unset, as before offload
+        end = offset + ip.len if ip.len >= ip.ihl * 4 else frame_len
+        if ip.ihl < 5:  # Invalid header length
+            return layers, offset + IPv4.header_len, end
+        if ip.ihl > 5:
+            layers.append(IPv4Options(
+                view[offset + IPv4.header_len:offset + ip.ihl * 4]))
+        offset += ip.ihl * 4
+        if ip.offset:  # Fragment of a datagram other than the first
+            return layers, offset, end
+        protocol_number = ip.proto
+    elif network is IPv6:
+        offset += IPv6.header_len
+        end = offset + ip.payload_len
+        protocol_number = ip.next_header
+        if protocol_number in extension_lengths:
+            protocol_number, header_end = walk_extension_headers(
+                frame, offset, protocol_number)
+            layers.append(ExtensionHeaders(view[offset:header_end]))
+            offset = header_end
+    else:
+        return layers, offset + sizeof(network), frame_len
+    if offset < end < frame_len:
+        frame = view[:end]
+    else:
+        end = frame_len
+
+    transport = registry.by_protocol_number(protocol_number)
+    if transport is None or end - offset < sizeof(transport):
+        return layers, offset, end
+    segment = transport.decode(frame, offset, zero_copy=zero_copy)
+    layers.append(segment)
+    if transport is TCP and segment.offset > 5:
+        header_end = offset + segment.offset * 4
+        layers.append(SegmentOptions(view[offset + sizeof(TCP):header_end]))
+        return layers, header_end, end
+    return layers, offset + sizeof(transport), end
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import struct
+from array import array
+from ctypes import Array, sizeof
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+
+class Field(NamedTuple):
+    """Position of a field declared in the _fields_ of a protocol."""
+    name: str    # Name of the field without any leading underscore
+    offset: int  # Offset in bytes of the storage unit holding the field
+    size: int    # Size in bytes of the storage unit holding the field
+    shift: int   # Position of the least-significant bit in the unit
+    bits: int    # Width of the field in bits
+    length: int  # Number of elements of an array field, 0 otherwise
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.bits) - 1
+
+
+class Layout:
+    """
+    Wire layout of a protocol header derived from its _fields_, which
+    allows headers to be parsed without creating instances of the
+    protocol.
+
+    Byte offsets and bit positions are read from ctypes itself instead
+    of being recomputed, so the layout always agrees with decode().
+    """
+    chunk_size = 4096  # Headers held in memory at once by decode_many
+    unit_codes = {1: "B", 2: "H", 4: "I", 8: "Q"}
+    _layouts = {}
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.size = sizeof(protocol)
+        self._unpackers = {}
+        self.fields = tuple(self._read_fields(protocol))
+        self.units = self._units_of(self.fields)
+        self.struct = self._struct_for(self.units)
+
+    @classmethod
+    def of(cls, protocol) -> "Layout":
+        """Get the cached layout of a protocol class."""
+        try:
+            return cls._layouts[protocol]
+        except KeyError:
+            layout = cls._layouts[protocol] = cls(protocol)
+            return layout
+
+    @staticmethod
+    def _read_fields(protocol) -> Iterable[Field]:
+        probe = protocol.from_buffer_copy(bytes(sizeof(protocol)))
+        for name, ctype, *bits in protocol._fields_:
+            descriptor = getattr(protocol, name)
+            offset, size = descriptor.offset, sizeof(ctype)
+            if issubclass(ctype, Array):
+                yield Field(name.lstrip("_"), offset, size, 0, size * 8,
+                            ctype._length_)
+                continue
+            if not bits:
+                yield Field(name.lstrip("_"), offset, size, 0, size * 8, 0)
+                continue
+            setattr(probe, name, 1)
+            unit = bytes(probe)[offset:offset + size]
+            setattr(probe, name, 0)
+            shift = int.from_bytes(unit, "big").bit_length() - 1
+            yield Field(name.lstrip("_"), offset, size, shift, bits[0], 0)
+
+    @staticmethod
+    def _units_of(fields: Iterable[Field]) -> Tuple[Tuple[int, int, int]]:
+        return tuple(sorted({(f.offset, f.size, f.length) for f in fields}))
+
+    def _struct_for(self, units: Tuple[Tuple[int, int, int]]) -> struct.Struct:
+        """Compile a Struct unpacking the given storage units only."""
+        codes, position = [">"], 0
+        for offset, size, length in units:
+            codes.append("x" * (offset - position))
+            codes.append(f"{size}s" if length else self.unit_codes[size])
+            position = offset + size
+        codes.append("x" * (self.size - position))
+        return struct.Struct("".join(codes))
+
+    def decode_many(self, packets: Iterable, offset: int = 0,
+                    fields: Iterable[str] = None) -> Dict[str, array]:
+        """
+        Decode the header found at the given offset of each packet into
+        one array.array per field, optionally restricted to the named
+        fields. Integer fields use the smallest type code able to hold
+        them. Array fields, such as addresses, are stored as unsigned
+        bytes laid end to end with a stride equal to their length.
+        """
+        selected = self.fields if fields is None else \
+            tuple(self.field(name) for name in fields)
+        units = self._units_of(selected)
+        try:
+            unpack_from = self._unpackers[units]
+        except KeyError:
+            unpack_from = self._unpackers[units] = \
+                self._struct_for(units).unpack_from
+
+        columns = {f.name: array(typecode_for(f)) for f in selected}
+        plan = [(columns[f.name], units.index((f.offset, f.size, f.length)),
+                 f) for f in selected]
+        packets = iter(packets)
+        while True:
+            rows: List[Tuple] = [unpack_from(packet, offset) for packet in
+                                 islice(packets, self.chunk_size)]
+            if not rows:
+                return columns
+            values_by_unit = list(zip(*rows))
+            for column, index, field in plan:
+                values = values_by_unit[index]
+                if field.length:
+                    column.frombytes(b"".join(values))
+                elif field.bits == field.size * 8:
+                    column.extend(values)
+                else:
+                    shift, mask = field.shift, field.mask
+                    column.extend([(value >> shift) & mask
+                                   for value in values])
+
+    def field(self, name: str) -> Field:
+        """Get a field by its name, with or without leading underscore."""
+        for field in self.fields:
+            if field.name == name.lstrip("_"):
+                return field
+        raise AttributeError(f"{self.protocol.__name__} has no field {name}")
+
+
+def typecode_for(field: Field) -> str:
+    """Get the smallest unsigned array.array type code for a field."""
+    if field.length:
+        return "B"
+    return next(code for code in "BHILQ"
+                if array(code).itemsize * 8 >= field.bits)
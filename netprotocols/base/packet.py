@@ -3,20 +3,140 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
-from netprotocols import Protocol
+from ctypes import Structure, sizeof
+from typing import Dict, List
+
+from netprotocols.base.registry import registry
 
 
 class Packet:
+    """
+    A frame built from a sequence of protocol headers, each one exposed
+    as an attribute named after its protocol in lower case, such as
+    "ipv4".
+
+    Layers keep the position at which they were first set, so replacing
+    a layer does not change the order of the serialized headers. Besides
+    protocol headers, a layer may hold raw bytes that no protocol
+    decodes, as an instance of a subclass of RawLayer. Headers are
+    joined directly from their own memory, so serializing a frame costs
+    a single allocation and no intermediate copy of each header.
+    """
+    __slots__ = "_layers", "_positions"
+
     def __init__(self, *protocols):
+        object.__setattr__(self, "_layers", [])
+        object.__setattr__(self, "_positions", {})
         for protocol in protocols:
             setattr(self, protocol.__class__.__name__, protocol)
 
+    @classmethod
+    def _from_layers(cls, layers: list) -> "Packet":
+        """Build a packet from a list of layers known to be valid and to
+        have unique names, such as those decoded by dissect(), without
+        checking each of them."""
+        packet = object.__new__(cls)
+        object.__setattr__(packet, "_layers", layers)
+        object.__setattr__(packet, "_positions", {
+            type(layer).__name__.lower(): position
+            for position, layer in enumerate(layers)})
+        return packet
+
     def __setattr__(self, protocol_name, protocol_class):
-        valid_protocols = (cls.__name__ for cls in Protocol.__subclasses__())
-        if protocol_name not in valid_protocols:
+        if protocol_name not in registry and \
+                not isinstance(protocol_class, RawLayer):
             raise AttributeError(f"Cannot build packet. Invalid protocol: "
                                  f"{protocol_name}")
-        super().__setattr__(protocol_name.lower(), protocol_class)
+        layers = self._layers
+        position = self._positions.setdefault(protocol_name.lower(),
+                                              len(layers))
+        if position == len(layers):
+            layers.append(protocol_class)
+        else:
+            layers[position] = protocol_class
+
+    def __getattr__(self, name):
+        if name.startswith("_"):  # Slots not set yet, as when unpickling
+            raise AttributeError(name)
+        try:
+            return self._layers[self._positions[name]]
+        except KeyError:
+            raise AttributeError(f"Packet has no layer named {name}") \
+                from None
+
+    def __reduce__(self):
+        """Copy and pickle a packet as the sequence of its layers, which
+        are named after their class."""
+        return Packet, tuple(self._layers)
+
+    def __len__(self):
+        return sum(map(_size_of, self._layers))
 
     def __bytes__(self):
-        return b"".join(proto for proto in self.__dict__.values())
+        return b"".join(self._layers)
+
+    @property
+    def layers(self) -> List:
+        """The headers of the packet, in serialization order."""
+        return list(self._layers)
+
+    @property
+    def offsets(self) -> Dict[str, int]:
+        """The byte offset of each layer, keyed by its attribute name."""
+        offsets, offset = {}, 0
+        for name, layer in zip(self._positions, self._layers):
+            offsets[name] = offset
+            offset += _size_of(layer)
+        return offsets
+
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        """
+        Serialize the packet into a writable buffer, such as a bytearray
+        or a slot of a ring buffer, starting at the given offset. Return
+        the offset immediately after the last header or raise ValueError
+        if the packet does not fit in the buffer, which is then left
+        untouched.
+        """
+        frame = b"".join(self._layers)
+        end = offset + len(frame)
+        view = memoryview(buffer)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        if end > len(view):
+            raise ValueError(f"Packet of {len(frame)} bytes does not fit in "
+                             f"a buffer of {len(view)} bytes at offset "
+                             f"{offset}")
+        view[offset:end] = frame
+        return end
+
+
+class RawLayer(bytes):
+    """
+    Bytes kept as a layer of a Packet, named after their class in lower
+    case, and serialized as they are. Such a layer has no fields, so it
+    cannot be set through a PacketTemplate.
+    """
+    pseudo_header = False
+
+    @property
+    def size(self) -> int:
+        return len(self)
+
+    @property
+    def protocol(self) -> type:
+        return type(self)
+
+
+class Payload(RawLayer):
+    """The data following the last header that was decoded from a frame,
+    up to the end of the network packet carrying it, if any."""
+
+
+class Padding(RawLayer):
+    """The bytes of a frame past the end of the network packet it
+    carries, such as the padding of short Ethernet frames."""
+
+
+def _size_of(layer) -> int:
+    """Length in bytes of a header or of a raw layer."""
+    return sizeof(layer) if isinstance(layer, Structure) else layer.size
@@ -5,6 +5,7 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 
 import re
 import socket
+from array import array
 from ctypes import (
     Array,
     BigEndianStructure,
@@ -13,11 +14,17 @@ from ctypes import (
     sizeof
 )
 from socket import inet_ntop, inet_pton, AF_INET
-from typing import Union
+from typing import Dict, Iterable, Union
+
+from netprotocols.base.cache import address_cache, copy_array, packed_key
+from netprotocols.base.layout import Layout
+from netprotocols.base.registry import registry
 
 
 class Protocol(BigEndianStructure):
     _pack_ = 1
+    pseudo_header = False  # Whether the checksum covers the IP pseudo-header
+    keeps_packet = False   # Whether decoded headers reference their packet
 
     def __new__(cls, *args, **kwargs):
         return super().__new__(cls)
@@ -25,16 +32,99 @@ class Protocol(BigEndianStructure):
     def __init__(self, *args):
         super().__init__()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        registry.register(cls)
+
     def __str__(self):
         return create_string_buffer(sizeof(self))[:]
 
+    def __reduce__(self):
+        """Copy and pickle a header as its bytes followed by those of the
+        packet it keeps, decoded again when loaded."""
+        return _decode, (type(self),
+                         bytes(self) + bytes(self.view(sizeof(self))))
+
     @classmethod
-    def decode(cls, packet: bytes):
-        """Decode a raw network packet into a new instance of the
-        protocol."""
-        header = cls.from_buffer_copy(packet)
+    def decode(cls, packet: bytes, offset: int = 0, *,
+               zero_copy: bool = False):
+        """
+        Decode a raw network packet into a new instance of the
+        protocol, reading the header found at the given byte offset.
+
+        By default the header bytes are copied into memory owned by the
+        new instance. When zero_copy is set the instance is mapped
+        directly onto the packet through ctypes' from_buffer, so no
+        bytes are copied. This requires a writable buffer (bytearray,
+        mmap or a writable memoryview) and implies these lifetime
+        rules:
+            - The header keeps the buffer alive and reflects any later
+              change made to its bytes, such as the slot of a ring
+              buffer being overwritten by the next frame.
+            - A bytearray cannot be resized and a memoryview cannot be
+              released while headers mapped onto it are still alive.
+            - Assigning to a field of the header writes through to the
+              underlying buffer.
+
+        Headers of protocols setting keeps_packet, whose length varies,
+        also keep the bytes of the packet from their first byte onwards,
+        on which their options and payload are exposed as memoryviews by
+        view(). These bytes are copied along with the header, unless the
+        packet is immutable, either a bytes object or a read-only view of
+        one, which is referenced as it is. When zero_copy is set the packet itself is referenced, so the
+        views reflect later changes made to it.
+
+        Mapping a header onto a buffer costs about as much as copying
+        its few bytes, so zero_copy does not make decoding a header
+        alone any faster and may even slow it down. It pays off when
+        copies are to be avoided: for headers keeping packets that carry
+        a large payload, which would otherwise be copied with them, and
+        for headers meant to be edited in place in the buffer.
+        """
+        if zero_copy:
+            header = cls.from_buffer(packet, offset)
+        else:
+            header = cls.from_buffer_copy(packet, offset)
+        if cls.keeps_packet:
+            keep_packet(header, packet, offset, zero_copy)
         return header
 
+    @classmethod
+    def decode_many(cls, packets: Iterable, offset: int = 0,
+                    fields: Iterable[str] = None) -> Dict[str, array]:
+        """
+        Decode the header found at the given offset of each packet in a
+        sequence into columnar storage: a dictionary mapping the name of
+        each field, stripped of any leading underscore, to an
+        array.array holding its value for every packet. No instance of
+        the protocol is created. Restricting the fields to those needed
+        skips unpacking the others. Refer to Layout.decode_many for the
+        representation of each field.
+        """
+        return Layout.of(cls).decode_many(packets, offset, fields)
+
+    def pack_into(self, buffer, offset: int = 0):
+        """
+        Copy the header into a writable buffer at the given offset,
+        raising ValueError if it does not fit.
+        """
+        memoryview(buffer).cast("B")[offset:offset + sizeof(self)] = \
+            memoryview(self).cast("B")
+
+    def view(self, start: int, end: int = None) -> memoryview:
+        """
+        Get a view of the bytes of the packet a header was decoded from,
+        from start to end, which defaults to the end of the packet, both
+        relative to the first byte of the header. The view is empty for
+        headers that were not decoded or do not keep their packet.
+        """
+        packet = getattr(self, "_packet", None)
+        if packet is None:
+            return memoryview(b"")
+        base = self._start
+        return memoryview(packet)[base + start:
+                                  None if end is None else base + end]
+
     @property
     def encapsulated_proto(self) -> Union[None, str]:
         """The string representation of the name of the encapsulated
@@ -43,6 +133,7 @@ class Protocol(BigEndianStructure):
         return "undefined"
 
     @staticmethod
+    @address_cache(copy=copy_array)
     def hdwr_to_addr_array(hdwr_addr: str) -> Array:
         """
         Convert an IEEE 802 MAC address to c_ubyte array of 6
@@ -56,6 +147,7 @@ class Protocol(BigEndianStructure):
         return (c_ubyte * 6)(*mac_to_bytes)
 
     @staticmethod
+    @address_cache(key=packed_key)
     def addr_array_to_hdwr(addr_array: Array) -> str:
         """
         Convert a c_ubyte array of 6 bytes to IEEE 802.3 MAC address.
@@ -66,6 +158,7 @@ class Protocol(BigEndianStructure):
         return ":".join(format(octet, "02x") for octet in bytes(addr_array))
 
     @staticmethod
+    @address_cache(copy=copy_array)
     def proto_addr_to_array(proto_addr: str,
                             addr_family: socket.AddressFamily = AF_INET):
         """
@@ -88,6 +181,7 @@ class Protocol(BigEndianStructure):
             (c_ubyte * 16)(*addr_to_bytes)
 
     @staticmethod
+    @address_cache(key=packed_key, enabled=False)  # inet_ntop is faster
     def array_to_proto_addr(addr_array: Array,
                             addr_family: socket.AddressFamily = AF_INET) -> str:
         """
@@ -114,3 +208,109 @@ class Protocol(BigEndianStructure):
         Ex: From 62030 to '0xf24e'
         """
         return format(number, "#0{}x".format(5))
+
+
+def _decode(protocol, data: bytes) -> Protocol:
+    return protocol.decode(data)
+
+
+def is_immutable(packet) -> bool:
+    """Whether the bytes of a packet can never change, as those of a
+    bytes object or of a read-only view of one."""
+    return type(packet) is bytes or type(packet) is memoryview and \
+        packet.readonly and type(packet.obj) is bytes
+
+
+def keep_packet(header, packet, offset: int, zero_copy: bool):
+    """
+    Keep the packet a header of a protocol setting keeps_packet was
+    decoded from, for view(). Unless zero_copy is set, a packet that may
+    change or be released, such as the slot of a ring buffer, is copied
+    from the header onwards, so that the header owns all of its memory.
+    """
+    if zero_copy or is_immutable(packet):
+        header._packet, header._start = packet, offset
+    else:
+        header._packet = bytes(memoryview(packet)[offset:])
+        header._start = 0
+
+
+class PackedField:
+    """
+    Descriptor exposing a packed array field of a header, such as
+    "_src", under a public name, such as "src", converted to a more
+    convenient value such as the string representation of an address.
+
+    On decoded headers the value is only computed the first time it is
+    read and then cached on the instance, so fields never read by the
+    caller cost nothing. Assigning either a value or a c_ubyte array
+    writes the field; an array is converted on the next read. The cache
+    is not invalidated by changes made to the underlying buffer of a
+    header decoded in zero-copy mode.
+    """
+
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        self.name = field_name.lstrip("_")
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            value = self.to_value(getattr(instance, self.field_name))
+            instance.__dict__[self.name] = value
+            return value
+
+    def __set__(self, instance, value):
+        if isinstance(value, Array):
+            setattr(instance, self.field_name, value)
+            instance.__dict__.pop(self.name, None)
+        else:
+            setattr(instance, self.field_name, self.to_array(value))
+            instance.__dict__[self.name] = value
+
+    def to_value(self, array: Array):
+        raise NotImplementedError
+
+    def to_array(self, value) -> Array:
+        raise NotImplementedError
+
+
+class BytesField(PackedField):
+    """A field of opaque bytes, such as the rest of an ICMP header."""
+
+    def to_value(self, array: Array) -> bytes:
+        return bytes(array)
+
+    def to_array(self, value: bytes) -> Array:
+        return (c_ubyte * len(value))(*value)
+
+
+class HardwareAddress(PackedField):
+    """An IEEE 802 MAC address field."""
+
+    def to_value(self, addr_array: Array) -> str:
+        return Protocol.addr_array_to_hdwr(addr_array)
+
+    def to_array(self, address: str) -> Array:
+        return Protocol.hdwr_to_addr_array(address)
+
+
+class ProtocolAddress(PackedField):
+    """An IPv4 or IPv6 address field."""
+
+    def __init__(self, field_name: str,
+                 addr_family: socket.AddressFamily = AF_INET):
+        super().__init__(field_name)
+        self.addr_family = addr_family
+
+    def to_value(self, addr_array: Array) -> str:
+        return Protocol.array_to_proto_addr(addr_array, self.addr_family)
+
+    def to_array(self, address: str) -> Array:
+        return Protocol.proto_addr_to_array(address, self.addr_family)
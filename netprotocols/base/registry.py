@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from typing import Dict, Optional
+
+
+class ProtocolRegistry:
+    """
+    Index of every subclass of Protocol, direct or not and including
+    those defined by users of the package, with constant time lookup by
+    class name, by Ethertype and by IP protocol number.
+
+    Protocols are registered on definition by Protocol.__init_subclass__.
+    A protocol is found by Ethertype or by IP protocol number when it
+    declares an "ethertype" or "protocol_number" class attribute.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, type] = {}
+        self._by_ethertype: Dict[int, type] = {}
+        self._by_protocol_number: Dict[int, type] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def register(self, protocol: type):
+        self._by_name[protocol.__name__] = protocol
+        ethertype = vars(protocol).get("ethertype")
+        if ethertype is not None:
+            self._by_ethertype[ethertype] = protocol
+        protocol_number = vars(protocol).get("protocol_number")
+        if protocol_number is not None:
+            self._by_protocol_number[protocol_number] = protocol
+
+    def by_name(self, name: str) -> Optional[type]:
+        return self._by_name.get(name)
+
+    def by_ethertype(self, ethertype: int) -> Optional[type]:
+        return self._by_ethertype.get(ethertype)
+
+    def by_protocol_number(self, protocol_number: int) -> Optional[type]:
+        return self._by_protocol_number.get(protocol_number)
+
+
+registry = ProtocolRegistry()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Crafting of frames at a high rate from a template: a Packet serialized
+once into a buffer in which selected fields are then rewritten in place.
+
+Each field is written at the byte offset and bit position found by its
+Layout, and every checksum covering it is fixed up with the incremental
+update of RFC 1624 instead of being computed again, so varying a port,
+an identifier or an address costs a few operations on the buffer
+regardless of the size of the frame.
+'''
+
+from ctypes import Structure
+from struct import Struct
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from netprotocols.base.checksum import incremental_update
+from netprotocols.base.layout import Field, Layout
+from netprotocols.base.packet import Packet, RawLayer
+from netprotocols.layer3.ip import IP
+from netprotocols.layer4.udp import UDP
+
+word = Struct(">H")
+unit_structs = {size: Struct(f">{code}")
+                for size, code in Layout.unit_codes.items()}
+
+
+class PacketTemplate:
+    """
+    A frame serialized once from an instance of Packet followed by an
+    optional payload, whose fields are then set by name, such as
+    "ipv4.src" or "udp.sport", directly in a reusable bytearray.
+
+    Checksums of the frame are kept correct as fields are set: that of
+    the header holding the field and, for the addresses of an IP header,
+    that of the following header when it covers the pseudo-header, as
+    those of TCP, UDP and ICMPv6 do. Checksums must therefore be correct
+    in the packet the template is built from. A UDP checksum of zero
+    means none was computed and is left untouched.
+    """
+
+    def __init__(self, packet: Packet, payload: bytes = b""):
+        self.buffer = bytearray(bytes(packet) + payload)
+        self._view = memoryview(self.buffer)
+        self._setters: Dict[str, Callable] = {}
+
+        '''Position of each layer and, for IP layers, of the following
+        layer whose checksum covers the pseudo-header, if any.'''
+        self._layers: Dict[str, Tuple[type, int]] = {}
+        self._pseudo_headers: Dict[str, Tuple[type, int]] = {}
+        ip_name = None
+        for (name, offset), layer in zip(packet.offsets.items(),
+                                         packet.layers):
+            protocol = type(layer) if isinstance(layer, Structure) \
+                else layer.protocol
+            self._layers[name] = protocol, offset
+            if isinstance(layer, RawLayer):  # Options or extension headers
+                continue
+            if protocol.pseudo_header and ip_name is not None:
+                self._pseudo_headers[ip_name] = protocol, offset
+            ip_name = name if issubclass(protocol, IP) else None
+
+    def __bytes__(self):
+        return bytes(self.buffer)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def __setitem__(self, name: str, value):
+        self.setter(name)(value)
+
+    def update(self, values: Dict[str, object]):
+        """Set several fields, given as a mapping of names to values."""
+        for name, value in values.items():
+            self.setter(name)(value)
+
+    def frames(self, values: Dict[str, Iterable]) -> Iterator[memoryview]:
+        """
+        Iterate over the frames obtained by setting each named field to
+        the successive values of its iterable, stopping with the shortest
+        iterable. The same buffer is yielded every time, so each frame
+        must be sent or copied before the next one is requested.
+        """
+        setters = [self.setter(name) for name in values]
+        for row in zip(*values.values()):
+            for setter, value in zip(setters, row):
+                setter(value)
+            yield self._view
+
+    def setter(self, name: str) -> Callable:
+        """
+        Get the cached function setting the value of a field, given as
+        the name of its layer in the packet followed by that of the
+        field, such as "ipv4.ttl". Address and other array fields accept
+        either bytes or the representation used by the protocol, such as
+        "192.168.1.1".
+        """
+        try:
+            return self._setters[name]
+        except KeyError:
+            setter = self._setters[name] = self._compile(name)
+            return setter
+
+    def _compile(self, name: str) -> Callable:
+        layer_name, _, field_name = name.partition(".")
+        try:
+            protocol, layer_offset = self._layers[layer_name]
+        except KeyError:
+            raise AttributeError(f"Packet has no layer named {layer_name}") \
+                from None
+        field = Layout.of(protocol).field(field_name)
+        offset = layer_offset + field.offset
+        write = self._writer(protocol, field, offset)
+
+        chksums = self._chksums(layer_name, field)
+        if not chksums:
+            return write
+        start = offset - (offset - layer_offset) % 2
+        end = offset + field.size + (offset + field.size - layer_offset) % 2
+        view = self._view
+
+        def set_and_fix(value):
+            old = view[start:end].tobytes()
+            write(value)
+            new = view[start:end]
+            for chksum_offset, optional in chksums:
+                chksum, = word.unpack_from(view, chksum_offset)
+                if optional and chksum == 0:
+                    continue
+                chksum = incremental_update(chksum, old, new)
+                word.pack_into(view, chksum_offset,
+                               chksum if chksum or not optional else 0xffff)
+
+        return set_and_fix
+
+    def _chksums(self, layer_name: str,
+                 field: Field) -> List[Tuple[int, bool]]:
+        """Get the offset of each checksum covering a field and whether
+        a value of zero means that it was not computed."""
+        if field.name == "chksum":
+            return []
+        covering = [self._layers[layer_name]]
+        if field.name in ("src", "dst") and layer_name in self._pseudo_headers:
+            covering.append(self._pseudo_headers[layer_name])
+        chksums = []
+        for protocol, layer_offset in covering:
+            try:
+                chksum = Layout.of(protocol).field("chksum")
+            except AttributeError:
+                continue
+            chksums.append((layer_offset + chksum.offset,
+                            protocol is UDP))
+        return chksums
+
+    def _writer(self, protocol, field: Field, offset: int) -> Callable:
+        view = self._view
+        if field.length:
+            packed_field = vars(protocol).get(field.name)
+            end = offset + field.length
+
+            def write_array(value):
+                if isinstance(value, str) and packed_field is not None:
+                    value = packed_field.to_array(value)
+                view[offset:end] = bytes(value)
+
+            return write_array
+
+        unit = unit_structs[field.size]
+        if field.bits == field.size * 8:
+            def write_unit(value):
+                unit.pack_into(view, offset, value)
+
+            return write_unit
+
+        shift, mask = field.shift, field.mask
+        clear = ~(mask << shift)
+
+        def write_bits(value):
+            current, = unit.unpack_from(view, offset)
+            unit.pack_into(view, offset,
+                           current & clear | (value & mask) << shift)
+
+        return write_bits
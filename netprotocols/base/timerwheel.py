@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Timer wheel expiring the entries of a table, such as the connections of
+a TCP flow table or the bindings of an ARP neighbor table.
+
+Each entry sits in the slot of the wheel matching the tick at which it
+may expire and is only looked at again when the wheel reaches that
+slot, so refreshing an entry costs no timer operation and expiring
+entries costs time proportional to the number of entries actually due.
+Entries are rescheduled lazily by their owner when their slot is
+reached, from the time they were last seen.
+'''
+
+from typing import Generic, Hashable, List, Optional, Set, TypeVar
+
+Entry = TypeVar("Entry", bound=Hashable)
+
+
+class TimerWheel(Generic[Entry]):
+    """
+    Wheel of slots of tick seconds each, holding the entries that may
+    expire during the tick of their slot.
+    """
+
+    def __init__(self, slots: int = 256, tick: float = 1.0):
+        self.tick = tick
+        self.slots: List[Set[Entry]] = [set() for _ in range(slots)]
+        self.current: Optional[int] = None  # Last tick processed
+
+    def schedule(self, entry: Entry, deadline: float):
+        tick = max(int(deadline // self.tick),
+                   (self.current or 0) + 1)
+        self.slots[tick % len(self.slots)].add(entry)
+
+    def advance(self, now: float) -> List[Entry]:
+        """Move the wheel to the given time and return the entries found
+        in the slots of every tick passed."""
+        tick = int(now // self.tick)
+        if self.current is None:
+            self.current = tick
+            return []
+        if tick <= self.current:  # Within the tick last processed
+            return []
+        due = []
+        for passed in range(self.current + 1,
+                            min(tick, self.current + len(self.slots)) + 1):
+            slot = self.slots[passed % len(self.slots)]
+            due.extend(slot)
+            slot.clear()
+        self.current = max(self.current, tick)
+        return due
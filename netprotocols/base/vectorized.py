@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Optional NumPy integration, installed with the "numpy" extra. Parses
+buffers of fixed-stride protocol headers into structured arrays with a
+single call to NumPy instead of a Python loop over the headers.
+'''
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from netprotocols.base.layout import Field, Layout
+
+
+def unit_names(protocol) -> Dict[Tuple[int, int, int], str]:
+    """
+    Name each storage unit of a protocol header after the fields it
+    holds. Bitfields sharing a unit are joined by underscores, as in
+    "version_ihl" for the first byte of an IPv4 header.
+    """
+    names = {}
+    for field in Layout.of(protocol).fields:
+        unit = field.offset, field.size, field.length
+        names[unit] = f"{names[unit]}_{field.name}" if unit in names \
+            else field.name
+    return names
+
+
+def dtype(protocol, stride: int = None) -> np.dtype:
+    """
+    Get a big-endian structured dtype matching the wire layout of a
+    protocol header, optionally padded to a stride in bytes.
+    """
+    layout = Layout.of(protocol)
+    names, formats, offsets = [], [], []
+    for (offset, size, length), name in unit_names(protocol).items():
+        names.append(name)
+        formats.append(("u1", (length,)) if length else f">u{size}")
+        offsets.append(offset)
+    return np.dtype({"names": names,
+                     "formats": formats,
+                     "offsets": offsets,
+                     "itemsize": stride or layout.size})
+
+
+def frombuffer(protocol, buffer, count: int = -1, offset: int = 0,
+               stride: int = None) -> np.ndarray:
+    """
+    Map a buffer of protocol headers laid out every stride bytes,
+    starting at the given offset, onto a structured array without
+    copying it. The stride defaults to the length of the header, and the
+    last header need not be followed by padding.
+    """
+    size = Layout.of(protocol).size
+    stride = stride or size
+    if count < 0:
+        count = max(0, (len(memoryview(buffer).cast("B")) - offset - size)
+                    // stride + 1)
+    return np.ndarray(shape=(count,), dtype=dtype(protocol), buffer=buffer,
+                      offset=offset, strides=(stride,))
+
+
+def field(records: np.ndarray, protocol, name: str) -> np.ndarray:
+    """
+    Extract the values of a field from a structured array returned by
+    frombuffer, unpacking bitfields such as IPv4.ihl or TCP.flags with
+    vectorized shifts and masks.
+    """
+    layout = Layout.of(protocol)
+    selected: Field = layout.field(name)
+    values = records[unit_names(protocol)[
+        selected.offset, selected.size, selected.length]]
+    if selected.length or selected.bits == selected.size * 8:
+        return values
+    result_type = np.min_scalar_type(selected.mask)
+    return ((values >> selected.shift) & selected.mask).astype(result_type)
+
+
+def columns(records: np.ndarray, protocol) -> Dict[str, np.ndarray]:
+    """Extract every field of a structured array returned by frombuffer."""
+    return {f.name: field(records, protocol, f.name)
+            for f in Layout.of(protocol).fields}
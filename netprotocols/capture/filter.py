@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Packet filters written in a subset of the pcap-filter language, compiled
+once into a predicate evaluated on the raw bytes of Ethernet frames, so
+that uninteresting frames are discarded before any header is decoded.
+
+Headers are located in the frame and their fields read at the offsets
+and bit positions given by the Layout of each protocol, which follows
+its _fields_. Network protocols are found by the Ethertype that they
+declare, behind any 802.1Q or QinQ tags and MPLS labels, and transport
+protocols by their IP protocol number, behind an IPv4 header of any
+length or an IPv6 header and its extension headers, so protocols added
+to the registry can be filtered on as well. Non-first fragments of IPv4
+datagrams carry no transport header and match no transport protocol.
+
+Grammar:
+    expression := term (("or" | "||") term)*
+    term       := factor (("and" | "&&") factor)*
+    factor     := ("not" | "!") factor | "(" expression ")" | primitive
+    primitive  := protocol
+                | [protocol] [direction] "host" address
+                | [protocol] [direction] "net" address/prefix
+                | [protocol] [direction] "port" number
+                | "ether" [direction] "host" mac-address
+                | protocol.field ["&" mask] operator value
+    direction  := "src" | "dst" | "src or dst" | "src and dst"
+    operator   := "==" | "=" | "!=" | "<" | "<=" | ">" | ">="
+
+Protocols are named after their class in lower case, as in "ipv4" or
+"tcp", or after the usual pcap names "ether", "ip", "ip6", "icmp" and
+"icmp6". Hosts and nets match IPv4 or IPv6 headers depending on the
+address family and ports match TCP or UDP unless a protocol is given.
+
+Ex: "ip and tcp dst port 443", "not arp and host 192.168.1.254",
+    "tcp.flags & 0x02 != 0 and ipv4.ttl < 16", "ip6 net fe80::/10"
+'''
+
+import operator
+import re
+import socket
+import struct
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from netprotocols import Ethernet, IPv4, IPv6, Protocol, TCP, UDP
+from netprotocols.base.layout import Layout
+from netprotocols.base.registry import registry
+from netprotocols.layer2.vlan import STACK_ETHERTYPES, skip_tags
+from netprotocols.layer3.ip import extension_lengths, walk_extension_headers
+
+Predicate = Callable[[object], bool]
+Locator = Callable[[object], int]  # Offset of a header, -1 if absent
+
+aliases = {"ether": "ethernet", "ip": "ipv4", "ip6": "ipv6",
+           "icmp": "icmpv4", "icmp6": "icmpv6"}
+operators = {"==": operator.eq, "=": operator.eq, "!=": operator.ne,
+             "<": operator.lt, "<=": operator.le, ">": operator.gt,
+             ">=": operator.ge}
+qualifiers = ("src", "dst", "host", "net", "port")
+token_pattern = re.compile(r"\s*(?:(&&|\|\||[=!<>]=|[()!&<>=])|"
+                           r"([^\s()!&|<>=]+))")
+unit_structs = {size: struct.Struct(">" + code)
+                for size, code in Layout.unit_codes.items()}
+
+eth_offset = Layout.of(Ethernet).field("eth").offset
+ihl = Layout.of(IPv4).field("ihl")
+fragment_offset = Layout.of(IPv4).field("offset")
+ipv4_proto_offset = Layout.of(IPv4).field("proto").offset
+ipv6_next_offset = Layout.of(IPv6).field("next_header").offset
+
+
+class PacketFilter:
+    """
+    Predicate over raw Ethernet frames compiled from a filter expression,
+    raising ValueError if the expression is invalid. A frame too short
+    for the header tested by a primitive does not match that primitive,
+    so that "not udp" matches a runt frame and "ip6 or arp" matches an
+    ARP frame shorter than an IPv6 header.
+
+    Ex:
+        web = PacketFilter("ip and tcp dst port 443")
+        packets = [dissect(frame) for frame in web.filter(frames)]
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._predicate = _Parser(expression).parse()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.expression!r})"
+
+    def __call__(self, frame) -> bool:
+        return self._predicate(frame)
+
+    def filter(self, frames: Iterable) -> Iterator:
+        """Yield the frames matching the filter."""
+        return filter(self._predicate, frames)
+
+
+def locator(protocol: type) -> Locator:
+    """Build a function locating the header of a protocol in a frame."""
+    ethertype = vars(protocol).get("ethertype")
+    protocol_number = vars(protocol).get("protocol_number")
+    if protocol is Ethernet:
+        return lambda frame: 0
+    if ethertype is not None:
+        return network_locator(ethertype)
+    if protocol_number is not None:
+        return transport_locator((protocol_number,))
+    raise ValueError(f"{protocol.__name__} headers cannot be located in a "
+                     f"frame")
+
+
+def network_header(frame) -> Tuple[int, int]:
+    """Get the Ethertype of the network protocol of a frame and the
+    offset of its header, past any VLAN tags and MPLS labels."""
+    ethertype, = unit_structs[2].unpack_from(frame, eth_offset)
+    if ethertype in STACK_ETHERTYPES:
+        return skip_tags(frame, Ethernet.header_len, ethertype)
+    return ethertype, Ethernet.header_len
+
+
+def network_locator(ethertype: int) -> Locator:
+    def locate(frame) -> int:
+        found, offset = network_header(frame)
+        return offset if found == ethertype else -1
+    return locate
+
+
+def transport_locator(protocol_numbers: Iterable[int]) -> Locator:
+    unpack_from = unit_structs[2].unpack_from
+    numbers = frozenset(protocol_numbers)
+    ihl_shift, ihl_mask = ihl.shift, ihl.mask
+    fragment_shift, fragment_mask = fragment_offset.shift, \
+        fragment_offset.mask
+
+    def locate(frame) -> int:
+        ethertype, offset = network_header(frame)
+        if ethertype == IPv4.ethertype:
+            fragment, = unpack_from(frame, offset + fragment_offset.offset)
+            if frame[offset + ipv4_proto_offset] in numbers and \
+                    not fragment >> fragment_shift & fragment_mask:
+                return offset + \
+                    (frame[offset + ihl.offset] >> ihl_shift & ihl_mask) * 4
+        elif ethertype == IPv6.ethertype:
+            next_header = frame[offset + ipv6_next_offset]
+            if next_header in numbers:
+                return offset + IPv6.header_len
+            if next_header in extension_lengths:
+                next_header, offset = walk_extension_headers(
+                    frame, offset + IPv6.header_len, next_header)
+                if next_header in numbers:
+                    return offset
+        return -1
+    return locate
+
+
+def presence(locate: Locator) -> Predicate:
+    def test(frame) -> bool:
+        try:
+            return locate(frame) >= 0
+        except (IndexError, struct.error):  # Frame too short
+            return False
+    return test
+
+
+def field_test(locate: Locator, protocol: type, name: str, compare,
+               value: int, mask: int = None) -> Predicate:
+    """Build a predicate comparing an integer field to a value."""
+    field = Layout.of(protocol).field(name)
+    if field.length:
+        raise ValueError(f"Field {name} of {protocol.__name__} is not an "
+                         f"integer")
+    unpack_from, position = unit_structs[field.size].unpack_from, \
+        field.offset
+    shift, field_mask = field.shift, field.mask
+    if mask is not None:
+        field_mask &= mask
+
+    def test(frame) -> bool:
+        try:
+            base = locate(frame)
+            return base >= 0 and compare(
+                unpack_from(frame, base + position)[0] >> shift &
+                field_mask, value)
+        except (IndexError, struct.error):  # Frame too short
+            return False
+    return test
+
+
+def bytes_test(locate: Locator, protocol: type, name: str, value: bytes,
+               prefix: int = None) -> Predicate:
+    """Build a predicate comparing an array field, such as an address,
+    to packed bytes, optionally on the first prefix bits only."""
+    field = Layout.of(protocol).field(name)
+    position, length = field.offset, field.length
+    if len(value) != length:
+        raise ValueError(f"Field {name} of {protocol.__name__} holds "
+                         f"{length} bytes")
+    if prefix is None or prefix == length * 8:
+        def test(frame) -> bool:
+            try:
+                base = locate(frame)
+            except (IndexError, struct.error):  # Frame too short
+                return False
+            return base >= 0 and \
+                frame[base + position:base + position + length] == value
+        return test
+    if not 0 <= prefix <= length * 8:
+        raise ValueError(f"Invalid prefix length: {prefix}")
+    mask = ((1 << prefix) - 1) << (length * 8 - prefix)
+    network = int.from_bytes(value, "big") & mask
+
+    def test_prefix(frame) -> bool:
+        try:
+            base = locate(frame)
+        except (IndexError, struct.error):  # Frame too short
+            return False
+        data = frame[base + position:base + position + length]
+        return base >= 0 and len(data) == length and \
+            int.from_bytes(data, "big") & mask == network
+    return test_prefix
+
+
+def either(first: Predicate, second: Predicate) -> Predicate:
+    return lambda frame: first(frame) or second(frame)
+
+
+def both(first: Predicate, second: Predicate) -> Predicate:
+    return lambda frame: first(frame) and second(frame)
+
+
+class _Parser:
+    """Recursive descent parser building the predicate of an
+    expression."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens: List[str] = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = token_pattern.match(expression, position)
+            if match is None:
+                self.error(f"unexpected character at {position}")
+            self.tokens.append(match.group(1) or match.group(2))
+            position = match.end()
+        self.position = 0
+
+    def error(self, message: str):
+        raise ValueError(f"Invalid filter {self.expression!r}: {message}")
+
+    def peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self, *expected: str) -> str:
+        token = self.peek()
+        if token is None or expected and token not in expected:
+            self.error(f"expected {' or '.join(expected) or 'a value'}, "
+                       f"got {token or 'end of expression'}")
+        self.position += 1
+        return token
+
+    def parse(self) -> Predicate:
+        if not self.tokens:
+            return lambda frame: True
+        predicate = self.expression_()
+        if self.peek() is not None:
+            self.error(f"unexpected {self.peek()}")
+        return predicate
+
+    def expression_(self) -> Predicate:
+        predicate = self.term()
+        while self.peek() in ("or", "||"):
+            self.take()
+            predicate = either(predicate, self.term())
+        return predicate
+
+    def term(self) -> Predicate:
+        predicate = self.factor()
+        while self.peek() in ("and", "&&"):
+            self.take()
+            predicate = both(predicate, self.factor())
+        return predicate
+
+    def factor(self) -> Predicate:
+        token = self.peek()
+        if token in ("not", "!"):
+            self.take()
+            negated = self.factor()
+            return lambda frame: not negated(frame)
+        if token == "(":
+            self.take()
+            predicate = self.expression_()
+            self.take(")")
+            return predicate
+        return self.primitive()
+
+    def protocol(self, name: str) -> Optional[type]:
+        name = aliases.get(name, name)
+        for protocol in registry:
+            if protocol.__name__.lower() == name:
+                return protocol
+        return None
+
+    def primitive(self) -> Predicate:
+        token = self.peek()
+        if token is not None and "." in token and \
+                self.protocol(token.split(".", 1)[0]):
+            return self.comparison(self.take())
+        protocol = self.protocol(token or "")
+        if protocol is not None:
+            self.take()
+            if self.peek() not in qualifiers:
+                return presence(locator(protocol))
+        elif token not in qualifiers:
+            self.error(f"unknown primitive {token or 'end of expression'}")
+        directions, combine = self.direction()
+        token = self.take("host", "net", "port")
+        if token == "port":
+            tests = self.port(protocol, directions)
+        else:
+            tests = self.host(protocol, directions, token == "net")
+        return tests[0] if len(tests) == 1 else combine(*tests)
+
+    def direction(self):
+        """
+        Parse an optional direction qualifier into the names of the
+        address fields it selects and the function combining the tests
+        of each field.
+        """
+        if self.peek() not in ("src", "dst"):
+            return ("src", "dst"), either
+        first = self.take()
+        other = "dst" if first == "src" else "src"
+        if self.peek() in ("or", "and") and \
+                self.tokens[self.position + 1:self.position + 2] == [other]:
+            combine = both if self.take() == "and" else either
+            self.take()
+            return ("src", "dst"), combine
+        return (first,), either
+
+    def port(self, protocol: Optional[type],
+             directions) -> List[Predicate]:
+        value = self.number(self.take())
+        protocols = (protocol,) if protocol else (TCP, UDP)
+        for candidate in protocols:
+            names = {f.name for f in Layout.of(candidate).fields}
+            if not {"sport", "dport"} <= names:
+                self.error(f"{candidate.__name__} has no ports")
+        locate = transport_locator(candidate.protocol_number
+                                   for candidate in protocols)
+        '''Ports sit at the same offsets in every transport protocol
+        accepted here, so the first one describes them all.'''
+        return [field_test(locate, protocols[0], direction[0] + "port",
+                           operator.eq, value) for direction in directions]
+
+    def host(self, protocol: Optional[type], directions,
+             net: bool) -> List[Predicate]:
+        address, _, prefix = self.take().partition("/")
+        if net and not prefix:
+            self.error("expected a prefix length")
+        if protocol is Ethernet:
+            if net:
+                self.error("ether net is not supported")
+            value = bytes(Protocol.hdwr_to_addr_array(address))
+        else:
+            family = socket.AF_INET6 if ":" in address else socket.AF_INET
+            try:
+                value = socket.inet_pton(family, address)
+            except OSError:
+                self.error(f"invalid address {address}")
+            expected = IPv6 if family == socket.AF_INET6 else IPv4
+            if protocol not in (None, expected):
+                self.error(f"{address} is not an address of "
+                           f"{protocol.__name__}")
+            protocol = expected
+        locate = locator(protocol)
+        return [bytes_test(locate, protocol, direction, value,
+                           self.number(prefix) if prefix else None)
+                for direction in directions]
+
+    def comparison(self, token: str) -> Predicate:
+        name, field = token.split(".", 1)
+        protocol = self.protocol(name)
+        mask = None
+        if self.peek() == "&":
+            self.take()
+            mask = self.number(self.take())
+        symbol = self.take(*operators)
+        value = self.number(self.take())
+        try:
+            return field_test(locator(protocol), protocol, field,
+                              operators[symbol], value, mask)
+        except (AttributeError, ValueError) as e:
+            self.error(str(e))
+
+    def number(self, token: str) -> int:
+        try:
+            return int(token, 0)
+        except ValueError:
+            self.error(f"expected a number, got {token}")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Capture of frames on the asyncio event loop, with no thread per
+interface. A Capture reads frames from a pluggable source into a fixed
+pool of reusable buffers with recv_into and yields them dissected into
+instances of Packet through an async iterator. Frames not matching an
+optional PacketFilter are discarded before being dissected.
+
+The pool bounds the number of frames waiting to be decoded. Once it is
+exhausted, a live source such as an AF_PACKET socket keeps being read so
+that the kernel does not drop frames silently, and the frames for which
+no buffer is left are dropped and counted. Offline sources, such as
+capture files, are simply not read again until a buffer is released.
+'''
+
+import asyncio
+import socket
+import struct
+from typing import Iterable, List, Optional, Union
+
+from netprotocols import Packet, dissect
+from netprotocols.capture.filter import PacketFilter
+from netprotocols.capture.pcap import LINKTYPE_ETHERNET, open_capture
+
+ETH_P_ALL = 0x0003          # Every protocol, from linux/if_ether.h
+SOL_PACKET = 263            # From linux/socket.h
+PACKET_STATISTICS = 6       # From linux/if_packet.h
+
+
+class FrameSource:
+    """
+    Base class of the sources of frames read by a Capture. Subclasses
+    implement recv_into, which writes the next frame into a buffer and
+    returns its length, truncating frames longer than the buffer, or
+    returns None once the source is exhausted.
+    """
+    live = False  # Whether frames are lost unless read when available
+
+    async def recv_into(self, buffer: bytearray) -> Optional[int]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def copy_into(buffer: bytearray, frame) -> int:
+        length = min(len(frame), len(buffer))
+        memoryview(buffer)[:length] = memoryview(frame)[:length]
+        return length
+
+
+class MemorySource(FrameSource):
+    """A source of frames held in memory, mostly useful for tests."""
+
+    def __init__(self, frames: Iterable[bytes], *, live: bool = False):
+        self._frames = iter(frames)
+        self.live = live
+
+    async def recv_into(self, buffer: bytearray) -> Optional[int]:
+        for frame in self._frames:
+            return self.copy_into(buffer, frame)
+        return None
+
+
+class FileSource(FrameSource):
+    """A source of the Ethernet frames of a pcap or pcapng file."""
+
+    def __init__(self, path: str):
+        self._reader = open_capture(path)
+        self._records = iter(self._reader)
+
+    async def recv_into(self, buffer: bytearray) -> Optional[int]:
+        for record in self._records:
+            if record.linktype == LINKTYPE_ETHERNET:
+                return self.copy_into(buffer, record.frame)
+        return None
+
+    def close(self):
+        self._records.close()  # Releases the last frame of the mapping
+        self._reader.close()
+
+
+class SocketSource(FrameSource):
+    """
+    A source of the frames received by a Linux AF_PACKET raw socket,
+    bound to a single interface or to all of them when none is given.
+    The socket is non-blocking and waited on by the selector of the
+    event loop. Requires the CAP_NET_RAW capability.
+    """
+    live = True
+
+    def __init__(self, interface: str = None, protocol: int = ETH_P_ALL):
+        self.socket = socket.socket(socket.AF_PACKET, socket.SOCK_RAW,
+                                    socket.htons(protocol))
+        try:
+            if interface is not None:
+                self.socket.bind((interface, 0))
+            self.socket.setblocking(False)
+        except OSError:
+            self.socket.close()
+            raise
+        self.kernel_drops = 0
+
+    async def recv_into(self, buffer: bytearray) -> Optional[int]:
+        loop = asyncio.get_running_loop()
+        return await loop.sock_recv_into(self.socket, buffer)
+
+    def read_statistics(self) -> int:
+        """
+        Add the frames dropped by the kernel since the last call, for
+        lack of space in the receive buffer of the socket, to the
+        kernel_drops counter and return it.
+        """
+        _, drops = struct.unpack("II", self.socket.getsockopt(
+            SOL_PACKET, PACKET_STATISTICS, 8))
+        self.kernel_drops += drops
+        return self.kernel_drops
+
+    def close(self):
+        self.socket.close()
+
+
+class Capture:
+    """
+    Asynchronous iterator over the frames of a source, each one yielded
+    dissected into an instance of Packet. Decoded headers are copied out
+    of the pool along with the bytes on which the options and payload
+    of IPv4 and TCP headers are exposed, so every buffer is reused as
+    soon as its frame has been dissected and packets remain valid for
+    as long as they are kept. A filter, given as an instance of
+    PacketFilter or as its expression, is evaluated on the raw frames.
+
+    Ex:
+        source = SocketSource("eth0")
+        async with Capture(source, filter="tcp") as capture:
+            async for packet in capture:
+                ...
+    """
+
+    def __init__(self, source: FrameSource, *, pool_size: int = 256,
+                 snaplen: int = 65535,
+                 filter: Union[PacketFilter, str] = None):
+        self.source = source
+        self.filter = PacketFilter(filter) if isinstance(filter, str) \
+            else filter
+        self.received = 0  # Frames yielded to the caller
+        self.dropped = 0   # Frames read while the pool was exhausted
+        self.filtered = 0  # Frames not matching the filter
+        self._pool: List[bytearray] = [bytearray(snaplen)
+                                       for _ in range(pool_size)]
+        self._scratch = bytearray(snaplen)
+        self._free: Optional[asyncio.Queue] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Packet:
+        if self._reader is None:
+            self._start()
+        while True:
+            buffer, length = await self._ready.get()
+            if buffer is None:
+                self._ready.put_nowait((None, 0))  # Keep it exhausted
+                reader = self._reader
+                if reader.done() and not reader.cancelled() and \
+                        reader.exception() is not None:
+                    raise reader.exception()
+                raise StopAsyncIteration
+            try:
+                frame = memoryview(buffer)[:length]
+                if self.filter is not None and not self.filter(frame):
+                    self.filtered += 1
+                    continue
+                packet = dissect(frame)
+            finally:
+                self._free.put_nowait(buffer)
+            self.received += 1
+            return packet
+
+    def _start(self):
+        self._free, self._ready = asyncio.Queue(), asyncio.Queue()
+        for buffer in self._pool:
+            self._free.put_nowait(buffer)
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        source, free, ready = self.source, self._free, self._ready
+        try:
+            while True:
+                if source.live and free.empty():
+                    if await source.recv_into(self._scratch) is None:
+                        return
+                    self.dropped += 1
+                    continue
+                buffer = await free.get()
+                length = await source.recv_into(buffer)
+                if length is None:
+                    return
+                ready.put_nowait((buffer, length))
+        finally:
+            ready.put_nowait((None, 0))
+
+    async def close(self):
+        """Stop reading and close the source."""
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        self.source.close()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, NamedTuple, Tuple, Union
+
+from netprotocols import Packet, dissect
+
+LINKTYPE_ETHERNET = 1
+
+
+class Record(NamedTuple):
+    timestamp: float   # Seconds since the epoch
+    frame: memoryview  # Captured bytes of the frame
+    wire_len: int      # Length of the frame on the wire
+    linktype: int      # Link-layer header type of the frame
+
+
+class CaptureReader:
+    """
+    Base class of readers of capture files. The file is memory-mapped
+    and each captured frame is yielded as a memoryview slice of the
+    mapping, so captures of any size are read in constant memory and
+    without copying the frames.
+
+    The mapping is private and writable, so frames can be decoded with
+    zero_copy set without modifying the file. Closing a reader while
+    frames or zero-copy headers obtained from it are still alive leaves
+    the mapping to the garbage collector, which releases it once they
+    are gone.
+    """
+    magic_numbers: Tuple[bytes, ...] = ()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_COPY)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty capture file: {path}")
+        self._view = memoryview(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self) -> Iterator[Record]:
+        raise NotImplementedError
+
+    def close(self):
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:  # Views of the mapping are still referenced
+            pass
+        finally:
+            self._file.close()
+
+    def packets(self, *, zero_copy: bool = False) -> Iterator[Packet]:
+        """
+        Yield each Ethernet frame of the capture dissected into an
+        instance of Packet. Frames of other link types are skipped.
+        """
+        for record in self:
+            if record.linktype == LINKTYPE_ETHERNET:
+                yield dissect(record.frame, zero_copy=zero_copy)
+
+
+class PcapReader(CaptureReader):
+    """Reader of capture files in the libpcap format."""
+    magic_numbers = (b"\xa1\xb2\xc3\xd4", b"\xd4\xc3\xb2\xa1",  # usec
+                     b"\xa1\xb2\x3c\x4d", b"\x4d\x3c\xb2\xa1")  # nsec
+    header_len = 24  # Length of the global header of the file
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        magic = self._map[:4]
+        if magic not in self.magic_numbers:
+            self.close()
+            raise ValueError(f"Not a pcap file: {path}")
+        self.byteorder = ">" if magic in self.magic_numbers[::2] else "<"
+        self.resolution = 1e-6 if magic in self.magic_numbers[:2] else 1e-9
+        self.snaplen, self.linktype = struct.unpack_from(
+            self.byteorder + "16xII", self._map)
+
+    def __iter__(self) -> Iterator[Record]:
+        return self.records()
+
+    def records(self, start: int = header_len,
+                end: int = None) -> Iterator[Record]:
+        """
+        Yield the records found between two byte offsets of the file,
+        the first of which must be that of a record header, such as the
+        bounds of a chunk returned by chunks().
+        """
+        unpack_from = struct.Struct(self.byteorder + "IIII").unpack_from
+        view, resolution = self._view, self.resolution
+        size = len(self._map) if end is None else end
+        position = start
+        while position + 16 <= size:
+            ts_sec, ts_frac, incl_len, orig_len = unpack_from(view, position)
+            position += 16
+            if position + incl_len > size:
+                return  # Last record truncated
+            yield Record(ts_sec + ts_frac * resolution,
+                         view[position:position + incl_len],
+                         orig_len,
+                         self.linktype)
+            position += incl_len
+
+    def chunks(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Split the records of the file into at most count chunks of about
+        the same size, returned as the byte offsets at which each chunk
+        starts and ends. Every chunk starts at a record header, so each
+        one can be read independently with records(). Only the record
+        headers are read.
+        """
+        unpack_from = struct.Struct(self.byteorder + "8xI").unpack_from
+        view, size = self._view, len(self._map)
+        target = max((size - self.header_len) // max(count, 1), 1)
+        bounds, position = [self.header_len], self.header_len
+        while position + 16 <= size:
+            incl_len, = unpack_from(view, position)
+            if position + 16 + incl_len > size:
+                break  # Last record truncated
+            position += 16 + incl_len
+            if position - bounds[-1] >= target and len(bounds) < count:
+                bounds.append(position)
+        if bounds[-1] != position:
+            bounds.append(position)
+        return list(zip(bounds, bounds[1:]))
+
+
+class PcapngReader(CaptureReader):
+    """
+    Reader of capture files in the pcapng format. Enhanced, Simple and
+    obsolete Packet Blocks are read; other blocks are skipped.
+    """
+    magic_numbers = (b"\x0a\x0d\x0d\x0a",)
+    section_header_block = 0x0a0d0d0a
+    interface_description_block = 0x00000001
+    packet_block = 0x00000002
+    simple_packet_block = 0x00000003
+    enhanced_packet_block = 0x00000006
+    if_tsresol = 9
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        if self._map[:4] not in self.magic_numbers:
+            self.close()
+            raise ValueError(f"Not a pcapng file: {path}")
+
+    def __iter__(self) -> Iterator[Record]:
+        view, size = self._view, len(self._map)
+        interfaces = []  # (linktype, snaplen, resolution) per interface
+        byteorder, position = ">", 0
+        while position + 12 <= size:
+            if self._map[position:position + 4] == self.magic_numbers[0]:
+                byteorder = ">" if self._map[position + 8:position + 12] \
+                    == b"\x1a\x2b\x3c\x4d" else "<"
+                interfaces = []
+            block_type, block_len = struct.unpack_from(
+                byteorder + "II", view, position)
+            if block_len < 12 or position + block_len > size:
+                return  # Last block truncated
+            body = position + 8
+            if block_type == self.enhanced_packet_block:
+                iface, ts_high, ts_low, cap_len, orig_len = \
+                    struct.unpack_from(byteorder + "IIIII", view, body)
+                linktype, _, resolution = interfaces[iface]
+                yield Record(((ts_high << 32) | ts_low) * resolution,
+                             view[body + 20:body + 20 + cap_len],
+                             orig_len,
+                             linktype)
+            elif block_type == self.simple_packet_block:
+                orig_len, = struct.unpack_from(byteorder + "I", view, body)
+                linktype, snaplen, _ = interfaces[0]
+                cap_len = min(orig_len, snaplen or orig_len,
+                              block_len - 16)
+                yield Record(0.0, view[body + 4:body + 4 + cap_len],
+                             orig_len, linktype)
+            elif block_type == self.packet_block:
+                iface, _, ts_high, ts_low, cap_len, orig_len = \
+                    struct.unpack_from(byteorder + "HHIIII", view, body)
+                linktype, _, resolution = interfaces[iface]
+                yield Record(((ts_high << 32) | ts_low) * resolution,
+                             view[body + 20:body + 20 + cap_len],
+                             orig_len,
+                             linktype)
+            elif block_type == self.interface_description_block:
+                interfaces.append(self._read_interface(
+                    byteorder, body, position + block_len - 4))
+            position += block_len
+
+    def _read_interface(self, byteorder: str, body: int,
+                        end: int) -> Tuple[int, int, float]:
+        linktype, snaplen = struct.unpack_from(byteorder + "H2xI",
+                                               self._view, body)
+        resolution = 1e-6
+        for code, value in self._read_options(byteorder, body + 8, end):
+            if code == self.if_tsresol:
+                exponent = value[0] & 0x7f
+                resolution = 2 ** -exponent if value[0] & 0x80 \
+                    else 10 ** -exponent
+        return linktype, snaplen, resolution
+
+    def _read_options(self, byteorder: str, position: int,
+                      end: int) -> Iterator[Tuple[int, bytes]]:
+        while position + 4 <= end:
+            code, length = struct.unpack_from(byteorder + "HH", self._view,
+                                              position)
+            if code == 0:  # opt_endofopt
+                return
+            yield code, self._map[position + 4:position + 4 + length]
+            position += 4 + (length + 3) // 4 * 4
+
+
+class PcapWriter:
+    """
+    Writer of capture files in the libpcap format.
+
+    Records are packed into a reusable buffer and written to the file
+    only when the buffer is full, so writing a frame costs no system
+    call. The capture can be rotated to a new file once it grows past
+    max_bytes or spans more than max_seconds of packet timestamps. The
+    first file is written to path and the following ones to the same
+    path with a counter inserted before the extension, as in
+    "replay.1.pcap".
+    """
+    record_header = struct.Struct("<IIII")
+
+    def __init__(self, path: str, *,
+                 linktype: int = LINKTYPE_ETHERNET,
+                 snaplen: int = 65535,
+                 nanosecond: bool = False,
+                 buffer_size: int = 1 << 20,
+                 max_bytes: int = None,
+                 max_seconds: float = None):
+        self.path = path
+        self.linktype = linktype
+        self.snaplen = snaplen
+        self.nanosecond = nanosecond
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.paths: List[str] = []
+        self._buffer = bytearray(buffer_size)
+        self._used = 0
+        self._file = None
+        self._file_bytes = 0
+        self._file_start = None
+        self._open(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _open(self, path: str):
+        self._file = open(path, "wb")
+        self.paths.append(path)
+        self._file_bytes = 0
+        self._file_start = None
+        magic = 0xa1b23c4d if self.nanosecond else 0xa1b2c3d4
+        self._append(struct.pack("<IHHiIII", magic, 2, 4, 0, 0,
+                                 self.snaplen, self.linktype))
+
+    def _rotate(self):
+        self.flush()
+        self._file.close()
+        root, ext = os.path.splitext(self.path)
+        self._open(f"{root}.{len(self.paths)}{ext}")
+
+    def _append(self, data: bytes):
+        if self._used + len(data) > len(self._buffer):
+            self.flush()
+        if len(data) > len(self._buffer):
+            self._file.write(data)
+        else:
+            self._buffer[self._used:self._used + len(data)] = data
+            self._used += len(data)
+        self._file_bytes += len(data)
+
+    def write(self, frame: Union[Packet, bytes], timestamp: float = None):
+        """
+        Write an instance of Packet or a raw frame (any bytes-like
+        object) captured at the given time in seconds since the epoch,
+        which defaults to the current time.
+        """
+        if isinstance(frame, Packet):
+            frame = bytes(frame)
+        elif not isinstance(frame, (bytes, bytearray)):
+            frame = memoryview(frame).cast("B")
+        if timestamp is None:
+            timestamp = time.time()
+
+        wire_len = len(frame)
+        incl_len = min(wire_len, self.snaplen)
+        if incl_len < wire_len:
+            frame = frame[:incl_len]
+        record_len = self.record_header.size + incl_len
+        if self._file_start is None:
+            self._file_start = timestamp
+        elif (self.max_bytes is not None and
+              self._file_bytes + record_len > self.max_bytes) or \
+                (self.max_seconds is not None and
+                 timestamp - self._file_start >= self.max_seconds):
+            self._rotate()
+            self._file_start = timestamp
+
+        resolution = 1_000_000_000 if self.nanosecond else 1_000_000
+        seconds = int(timestamp)
+        fraction = round((timestamp - seconds) * resolution)
+        if fraction == resolution:  # Rounded up to the next second
+            seconds, fraction = seconds + 1, 0
+        if self._used + record_len > len(self._buffer):
+            self.flush()
+        if record_len > len(self._buffer):
+            self._append(self.record_header.pack(seconds, fraction,
+                                                 incl_len, wire_len))
+            self._append(frame)
+            return
+        self.record_header.pack_into(self._buffer, self._used, seconds,
+                                     fraction, incl_len, wire_len)
+        start = self._used + self.record_header.size
+        self._buffer[start:start + incl_len] = frame
+        self._used = start + incl_len
+        self._file_bytes += record_len
+
+    def flush(self):
+        """Write the contents of the buffer to the file."""
+        if self._used:
+            self._file.write(memoryview(self._buffer)[:self._used])
+            self._used = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def open_capture(path: str) -> CaptureReader:
+    """Open a capture file with the reader matching its format."""
+    with open(path, "rb") as file:
+        magic = file.read(4)
+    readers: Dict[bytes, type] = {magic_number: reader
+                                  for reader in (PcapReader, PcapngReader)
+                                  for magic_number in reader.magic_numbers}
+    try:
+        return readers[magic](path)
+    except KeyError:
+        raise ValueError(f"Unknown capture file format: {path}")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Ring of fixed-size frame slots in shared memory, passing raw frames from
+a capturing process to decoding processes without pickling them through
+pipes. Requires Python 3.8 or later for multiprocessing.shared_memory,
+and an x86 machine.
+
+The ring has a single producer and a fixed number of consumers. Frames
+are dealt to consumers in turn, the frame with sequence number n going
+to consumer n % consumers, so no lock is needed: the producer only
+writes the cursor counting published frames and each consumer only
+writes its own cursor, each cursor sitting on a cache line of its own.
+Frame bytes are written before the cursor that publishes them, which
+the total store order of x86 keeps visible in that order to other
+processes. Python exposes no memory fence, so on machines with a weaker
+memory model, such as ARM, a consumer could read a published slot
+before its bytes; rings are refused there.
+
+Layout of the shared memory:
+    - Line 0: slot count, slot size and consumer count.
+    - Line 1: producer cursor and a flag set once the producer is
+      finished.
+    - Line 2 + k: cursor of consumer k.
+    - Slots: the length of the frame as a 32-bit integer, 4 bytes of
+      padding and slot_size bytes of frame data.
+'''
+
+import os
+import platform
+import struct
+import time
+from typing import Iterator, Optional
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError as e:  # Python 3.7
+    raise ImportError("FrameRing requires Python 3.8 or later for "
+                      "multiprocessing.shared_memory.") from e
+
+line_size = 64
+geometry = struct.Struct("QQQ")
+cursor = struct.Struct("Q")
+finished_offset = line_size + cursor.size
+slot_header = struct.Struct("I4x")
+
+'''Names given by platform.machine() to the x86 machines whose total
+store order the ring relies upon.'''
+x86_machines = frozenset({"x86_64", "amd64", "i386", "i486", "i586",
+                          "i686", "x86"})
+
+
+def check_machine():
+    """Refuse to run a ring on a machine whose memory model does not keep
+    stores visible to other processes in program order."""
+    machine = platform.machine()
+    if machine.lower() not in x86_machines:
+        raise RuntimeError(f"FrameRing relies on the store order of x86 "
+                           f"and cannot run on {machine}.")
+
+
+class FrameRing:
+    """
+    Single-producer, multiple-consumer ring of frame slots in shared
+    memory. The process creating the ring is its producer and owns the
+    shared memory block. Consumers attach to it by name, which is what
+    pickling a ring does, and read frames through consumer().
+
+    Slot views are memoryviews of the shared memory, on which headers can
+    be decoded directly, as in Ethernet.decode(view). Headers decoded
+    with zero_copy set are overwritten as soon as their slot is reused,
+    and every view of a slot must be dropped before the ring is closed.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner_pid = os.getpid() if owner else None  # Survives fork()
+        self.slots, self.slot_size, self.consumers = \
+            geometry.unpack_from(shm.buf)
+        self.slot_stride = slot_header.size + self.slot_size
+        self.slots_offset = line_size * (2 + self.consumers)
+        self.dropped = 0    # Frames not put because the ring was full
+        self.truncated = 0  # Frames put truncated to the slot size
+        self._written, = cursor.unpack_from(shm.buf, line_size)
+
+    @classmethod
+    def create(cls, slots: int = 1024, slot_size: int = 2048,
+               consumers: int = 1, name: str = None) -> "FrameRing":
+        """Create a ring in a new block of shared memory."""
+        check_machine()
+        if slots % consumers:
+            raise ValueError("The number of slots must be a multiple of the "
+                             "number of consumers.")
+        size = line_size * (2 + consumers) + \
+            slots * (slot_header.size + slot_size)
+        shm = SharedMemory(name, create=True, size=size)
+        geometry.pack_into(shm.buf, 0, slots, slot_size, consumers)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        """
+        Attach to the ring created by another process. Before Python
+        3.13, attaching registers the block with the resource tracker of
+        the process, which unlinks it on exit unless the process shares
+        the tracker of the producer, as the processes it starts through
+        multiprocessing do.
+        """
+        check_machine()
+        try:
+            shm = SharedMemory(name, track=False)  # Python 3.13+
+        except TypeError:
+            shm = SharedMemory(name)
+        return cls(shm, owner=False)
+
+    def __reduce__(self):
+        return FrameRing.attach, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _slot(self, sequence: int) -> int:
+        return self.slots_offset + sequence % self.slots * self.slot_stride
+
+    def _consumer_cursor(self, consumer: int) -> int:
+        return cursor.unpack_from(self.shm.buf,
+                                  line_size * (2 + consumer))[0]
+
+    def reserve(self) -> Optional[memoryview]:
+        """
+        Get a writable view of the data of the next free slot, into
+        which a frame can be received directly, as with recv_into, or
+        None if the consumer of that slot has not released it yet. The
+        frame is published by commit().
+        """
+        sequence = self._written
+        if self._consumer_cursor(sequence % self.consumers) + self.slots \
+                <= sequence:
+            return None
+        start = self._slot(sequence) + slot_header.size
+        return self.shm.buf[start:start + self.slot_size]
+
+    def commit(self, length: int):
+        """Publish the frame of the given length written to the reserved
+        slot."""
+        slot_header.pack_into(self.shm.buf, self._slot(self._written),
+                              length)
+        self._written += 1
+        cursor.pack_into(self.shm.buf, line_size, self._written)
+
+    def put(self, frame) -> bool:
+        """
+        Copy a frame into the next free slot and publish it, truncating
+        it to the slot size. Return False, counting the frame as
+        dropped, if the ring is full.
+        """
+        view = self.reserve()
+        if view is None:
+            self.dropped += 1
+            return False
+        length = min(len(frame), self.slot_size)
+        if length < len(frame):
+            self.truncated += 1
+        view[:length] = memoryview(frame)[:length]
+        view.release()
+        self.commit(length)
+        return True
+
+    def finish(self):
+        """Let consumers know that no more frames will be put."""
+        self.shm.buf[finished_offset] = 1
+
+    @property
+    def finished(self) -> bool:
+        return self.shm.buf[finished_offset] == 1
+
+    def consumer(self, index: int) -> "RingConsumer":
+        return RingConsumer(self, index)
+
+    def close(self):
+        """Detach from the ring, unlinking it if this process owns it."""
+        self.shm.close()
+        if self.owner_pid == os.getpid():
+            self.shm.unlink()
+
+
+class RingConsumer:
+    """
+    Reader of the frames dealt to one consumer of a FrameRing. Each slot
+    is released to the producer once the next frame is requested.
+    """
+
+    def __init__(self, ring: FrameRing, index: int):
+        if not 0 <= index < ring.consumers:
+            raise ValueError(f"Invalid consumer index: {index}")
+        self.ring = ring
+        self.index = index
+        self._cursor_offset = line_size * (2 + index)
+        self._next, = cursor.unpack_from(ring.shm.buf, self._cursor_offset)
+        self._next = max(self._next, index)
+
+    def get(self) -> Optional[memoryview]:
+        """
+        Get a view of the next frame dealt to this consumer, releasing
+        the slot of the previous one, or None if it was not published
+        yet.
+        """
+        ring, sequence = self.ring, self._next
+        buf = ring.shm.buf
+        if cursor.unpack_from(buf, line_size)[0] <= sequence:
+            return None
+        slot = ring._slot(sequence)
+        length, = slot_header.unpack_from(buf, slot)
+        start = slot + slot_header.size
+        self._next = sequence + ring.consumers
+        cursor.pack_into(buf, self._cursor_offset, sequence)
+        return buf[start:start + length]
+
+    def release(self):
+        """Release the slot of the last frame obtained with get()."""
+        cursor.pack_into(self.ring.shm.buf, self._cursor_offset, self._next)
+
+    def frames(self, timeout: float = None,
+               poll_interval: float = 0.0001) -> Iterator[memoryview]:
+        """
+        Yield views of the frames dealt to this consumer as they are
+        published, each slot being released when the next frame is
+        requested. Stop once the producer is finished and every frame
+        was read, or once no frame was published for timeout seconds.
+        """
+        idle_since = time.monotonic()
+        while True:
+            finished = self.ring.finished
+            view = self.get()
+            if view is None:
+                if finished or timeout is not None and \
+                        time.monotonic() - idle_since >= timeout:
+                    self.release()
+                    return
+                time.sleep(poll_interval)
+                continue
+            yield view
+            idle_since = time.monotonic()
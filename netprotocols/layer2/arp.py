@@ -6,7 +6,7 @@ __author__ = 'EONRaider @ keybase.io/eonraider'
 
 from ctypes import c_ubyte, c_uint8, c_uint16
 
-from netprotocols import Protocol
+from netprotocols import HardwareAddress, Protocol, ProtocolAddress
 
 
 class ARP(Protocol):            # IETF RFC 826
@@ -22,6 +22,11 @@ class ARP(Protocol):            # IETF RFC 826
         ("_tpa", c_ubyte * 4),  # Target protocol address
     ]
     header_len = 28             # Length of the header in bytes
+    ethertype = 0x0806
+    sha = HardwareAddress("_sha")
+    spa = ProtocolAddress("_spa")
+    tha = HardwareAddress("_tha")
+    tpa = ProtocolAddress("_tpa")
 
     def __init__(self, *,
                  htype: int,
@@ -43,12 +48,3 @@ class ARP(Protocol):            # IETF RFC 826
         self.spa = self.proto_addr_to_array(spa)
         self.tha = self.hdwr_to_addr_array(tha)
         self.tpa = self.proto_addr_to_array(tpa)
-
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.sha = cls.addr_array_to_hdwr(header._sha)
-        header.spa = cls.array_to_proto_addr(header._spa)
-        header.tha = cls.addr_array_to_hdwr(header._tha)
-        header.tpa = cls.array_to_proto_addr(header._tpa)
-        return header
@@ -5,7 +5,9 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 
 from ctypes import c_ubyte, c_uint16
 
-from netprotocols import Protocol
+from netprotocols import HardwareAddress, Protocol
+from netprotocols.base.registry import registry
+from netprotocols.layer2.vlan import STACK_ETHERTYPES, TagStack, walk_tags
 
 
 class Ethernet(Protocol):       # IEEE 802.3 standard
@@ -18,8 +20,17 @@ class Ethernet(Protocol):       # IEEE 802.3 standard
     ethertypes = {
         0x0806: "ARP",
         0x0800: "IPv4",
-        0x86dd: "IPv6"
+        0x86dd: "IPv6",
+        0x8100: "802.1Q",
+        0x88a8: "802.1ad",
+        0x9100: "QinQ",
+        0x8847: "MPLS",
+        0x8848: "MPLS"
     }
+    keeps_packet = True
+    __slots__ = "_packet", "_start"
+    dst = HardwareAddress("_dst")
+    src = HardwareAddress("_src")
 
     def __init__(self, *, dst: str, src: str, eth: int):
         super().__init__()
@@ -27,13 +38,30 @@ class Ethernet(Protocol):       # IEEE 802.3 standard
         self.src = self.hdwr_to_addr_array(src)
         self.eth = eth
 
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.src = cls.addr_array_to_hdwr(header._src)
-        header.dst = cls.addr_array_to_hdwr(header._dst)
-        return header
-
     @property
     def encapsulated_proto(self) -> str:
-        return self.ethertypes.get(self.eth, None)
+        """
+        Gets the name of the protocol encapsulated by the frame, past
+        any VLAN tags and MPLS labels.
+        """
+        ethertype = self.eth
+        if ethertype in STACK_ETHERTYPES:
+            ethertype = self.tags.ethertype
+        try:
+            return self.ethertypes[ethertype]
+        except KeyError:
+            protocol = registry.by_ethertype(ethertype)
+            return protocol.__name__ if protocol else None
+
+    @property
+    def tags(self) -> TagStack:
+        """
+        Gets the VLAN tags and MPLS labels of a decoded frame, with the
+        Ethertype of the protocol they encapsulate and the offset of its
+        header. Untagged frames are answered without reading the frame.
+        Ex: TagStack(vlan=[VLANTag(tpid=33024, pcp=0, dei=0, vid=10)],
+            mpls=[], ethertype=2048, offset=18)
+        """
+        if self.eth not in STACK_ETHERTYPES:
+            return TagStack([], [], self.eth, self.header_len)
+        return walk_tags(self.view(0), self.header_len, self.eth)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+IEEE 802.1Q VLAN tags, stacked as in 802.1ad (QinQ), and MPLS label
+stacks (RFC 3032) carried between the Ethernet header and the network
+protocol of a frame.
+
+Tags and labels are read in a single pass over the frame by walk_tags,
+which yields the Ethertype of the encapsulated protocol and the offset
+of its header. skip_tags finds the same Ethertype and offset without
+decoding any tag or label, for dissectors that only need to get past
+them. MPLS does not identify the protocol it carries, so the payload
+following the bottom of the label stack is taken as IPv4 or IPv6 from
+the version in its first nibble, as routers do.
+'''
+
+import struct
+from typing import List, NamedTuple, Tuple
+
+from netprotocols.base.packet import RawLayer
+
+VLAN_ETHERTYPES = frozenset({0x8100,   # IEEE 802.1Q customer tag
+                             0x88a8,   # IEEE 802.1ad service tag
+                             0x9100})  # Pre-standard QinQ service tag
+MPLS_ETHERTYPES = frozenset({0x8847,   # MPLS unicast
+                             0x8848})  # MPLS multicast
+STACK_ETHERTYPES = VLAN_ETHERTYPES | MPLS_ETHERTYPES
+MPLS_PAYLOADS = {4: 0x0800, 6: 0x86dd}  # IP version to Ethertype
+
+vlan_tag = struct.Struct(">HH")  # Tag control information, Ethertype
+mpls_entry = struct.Struct(">I")
+
+
+class VLANTag(NamedTuple):
+    tpid: int  # Tag protocol identifier, the Ethertype announcing the tag
+    pcp: int   # Priority code point
+    dei: int   # Drop eligible indicator
+    vid: int   # VLAN identifier
+
+
+class MPLSLabel(NamedTuple):
+    label: int   # Label value
+    tc: int      # Traffic class
+    bottom: int  # Bottom of stack flag
+    ttl: int     # Time to live
+
+
+class TagStack(NamedTuple):
+    vlan: List[VLANTag]     # VLAN tags, outermost first
+    mpls: List[MPLSLabel]   # MPLS labels, outermost first
+    ethertype: int          # Ethertype of the encapsulated protocol
+    offset: int             # Offset of the header of that protocol
+
+
+class Tags(RawLayer):
+    """
+    The raw VLAN tags and MPLS labels of a frame, kept by dissect() as
+    the "tags" layer of a Packet between the Ethernet header and the
+    network header, so that the packet serializes back to the frame.
+    Refer to Ethernet.tags for their decoded values.
+    """
+
+
+def walk_tags(frame, offset: int, ethertype: int) -> TagStack:
+    """
+    Read the VLAN tags and MPLS labels found at the given offset of a
+    frame, just past the Ethertype field of its Ethernet header, whose
+    value is given by ethertype.
+
+    The walk stops at a tag or label truncated by the end of the frame,
+    whose Ethertype and offset are then returned. The Ethertype is zero
+    after an MPLS label stack carrying neither IPv4 nor IPv6.
+    """
+    end = len(frame)
+    vlan: List[VLANTag] = []
+    mpls: List[MPLSLabel] = []
+    while ethertype in VLAN_ETHERTYPES and offset + 4 <= end:
+        tci, next_ethertype = vlan_tag.unpack_from(frame, offset)
+        vlan.append(VLANTag(ethertype, tci >> 13, tci >> 12 & 1,
+                            tci & 0xfff))
+        ethertype, offset = next_ethertype, offset + 4
+    if ethertype in MPLS_ETHERTYPES:
+        while offset + 4 <= end:
+            entry, = mpls_entry.unpack_from(frame, offset)
+            mpls.append(MPLSLabel(entry >> 12, entry >> 9 & 7,
+                                  entry >> 8 & 1, entry & 0xff))
+            offset += 4
+            if entry & 0x100:
+                ethertype = MPLS_PAYLOADS.get(frame[offset] >> 4, 0) \
+                    if offset < end else 0
+                break
+    return TagStack(vlan, mpls, ethertype, offset)
+
+
+def skip_tags(frame, offset: int, ethertype: int) -> Tuple[int, int]:
+    """
+    Get the Ethertype of the protocol encapsulated behind the VLAN tags
+    and MPLS labels found at the given offset of a frame and the offset
+    of its header, as given by walk_tags, reading only the bytes needed
+    to get past them.
+    """
+    end = len(frame)
+    while ethertype in VLAN_ETHERTYPES and offset + 4 <= end:
+        ethertype = frame[offset + 2] << 8 | frame[offset + 3]
+        offset += 4
+    if ethertype in MPLS_ETHERTYPES:
+        while offset + 4 <= end:
+            offset += 4
+            if frame[offset - 2] & 0x01:
+                return (MPLS_PAYLOADS.get(frame[offset] >> 4, 0)
+                        if offset < end else 0), offset
+    return ethertype, offset
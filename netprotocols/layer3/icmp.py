@@ -5,7 +5,8 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 
 from ctypes import c_ubyte, c_uint8, c_uint16
 
-from netprotocols import Protocol
+from netprotocols import BytesField, Protocol
+from netprotocols.base.checksum import header_checksum, verify_checksum
 
 
 class ICMPv4(Protocol):         # IETF RFC 792
@@ -16,6 +17,8 @@ class ICMPv4(Protocol):         # IETF RFC 792
         ("_rest", c_ubyte * 4)  # Rest of header (contents vary)
     ]
     header_len = 8              # Length of the header in bytes
+    protocol_number = 0x01
+    rest = BytesField("_rest")
     icmpv4_types = {
         0: "Echo reply",
         3: "Destination Unreachable",
@@ -48,17 +51,22 @@ class ICMPv4(Protocol):         # IETF RFC 792
         self.chksum = chksum
         self.rest = (c_ubyte * 4)(*rest)
 
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.rest = bytes(header._rest)
-        return header
-
     @property
     def type_name(self) -> str:
         return self.icmpv4_types.get(
             self.type, "Unknown, Unassigned or Deprecated")
 
+    def compute_chksum(self, payload: bytes = b"") -> int:
+        """
+        Compute the checksum of the message as defined by RFC 792,
+        covering the header and the payload that follows it.
+        """
+        return header_checksum(self, payload)
+
+    def verify_chksum(self, payload: bytes = b"") -> bool:
+        """Check whether the checksum set on the message is correct."""
+        return verify_checksum(self, payload)
+
 
 class ICMPv6(Protocol):           # IETF RFC 4443
     _fields_ = [
@@ -68,6 +76,9 @@ class ICMPv6(Protocol):           # IETF RFC 4443
         ("_m_body", c_ubyte * 4)  # Message body
     ]
     header_len = 8                # Length of the header in bytes
+    protocol_number = 0x3a
+    pseudo_header = True
+    m_body = BytesField("_m_body")
     icmpv6_types = {
         1: "Destination Unreachable",
         2: "Packet Too Big",
@@ -118,13 +129,19 @@ class ICMPv6(Protocol):           # IETF RFC 4443
         self.chksum = chksum
         self.m_body = (c_ubyte * 4)(*m_body)
 
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.m_body = bytes(header._m_body)
-        return header
-
     @property
     def type_name(self) -> str:
         return self.icmpv6_types.get(
             self.type, "Unknown, Unassigned or Deprecated")
+
+    def compute_chksum(self, ip, payload: bytes = b"") -> int:
+        """
+        Compute the checksum of the message as defined by RFC 4443,
+        covering the pseudo-header built from the IPv6 header of the
+        packet carrying it.
+        """
+        return header_checksum(self, payload, ip, 0x3a)
+
+    def verify_chksum(self, ip, payload: bytes = b"") -> bool:
+        """Check whether the checksum set on the message is correct."""
+        return verify_checksum(self, payload, ip, 0x3a)
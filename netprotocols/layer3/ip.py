@@ -5,19 +5,87 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 
 from ctypes import c_ubyte, c_uint8, c_uint16, c_uint32
 from socket import AF_INET6
+from typing import Dict, Tuple
 
-from netprotocols import Protocol
+from netprotocols import Protocol, ProtocolAddress
+from netprotocols.base.packet import RawLayer
+from netprotocols.base.registry import registry
+from netprotocols.base.checksum import header_checksum, verify_checksum
+
+'''Length rules of the IPv6 extension headers that can be walked over,
+as (scale, bias): the length of a header in bytes is its second byte
+times the scale plus the bias. ESP (50) is absent since its contents are
+encrypted.'''
+extension_lengths: Dict[int, Tuple[int, int]] = {
+    0x00: (8, 8),    # Hop-by-Hop Options, RFC 8200
+    0x2b: (8, 8),    # Routing, RFC 8200
+    0x2c: (0, 8),    # Fragment, RFC 8200
+    0x33: (4, 8),    # Authentication Header, RFC 4302
+    0x3c: (8, 8),    # Destination Options, RFC 8200
+    0x87: (8, 8),    # Mobility, RFC 6275
+    0x8b: (8, 8),    # Host Identity Protocol, RFC 7401
+    0x8c: (8, 8),    # Shim6, RFC 5533
+}
+FRAGMENT = 0x2c
+
+
+def walk_extension_headers(packet, offset: int,
+                           next_header: int) -> Tuple[int, int]:
+    """
+    Follow the chain of IPv6 extension headers found at the given offset
+    of a packet, the first of them being of type next_header, and return
+    the number of the upper-layer protocol and the offset of its header.
+
+    The walk stops early at an extension header truncated by the end of
+    the packet and at the Fragment header of a fragment other than the
+    first, which carries no upper-layer header; the type and offset of
+    that extension header are returned instead.
+    """
+    end = len(packet)
+    while next_header in extension_lengths:
+        if offset + 8 > end or next_header == FRAGMENT and \
+                (packet[offset + 2] << 8 | packet[offset + 3]) & 0xfff8:
+            break
+        scale, bias = extension_lengths[next_header]
+        next_header, offset = packet[offset], \
+            offset + packet[offset + 1] * scale + bias
+    return next_header, offset
+
+
+class IPv4Options(RawLayer):
+    """The raw options of an IPv4 header, kept by dissect() as the
+    "ipv4options" layer of a Packet. Refer to IPv4.options for a view of
+    them."""
+
+
+class ExtensionHeaders(RawLayer):
+    """The raw extension headers of an IPv6 packet that were walked over
+    by dissect(), kept as the "extensionheaders" layer of a Packet."""
 
 
 class IP:
     protocol_numbers = {  # As defined by RFC 790
+        0x00: "HOPOPT",
         0x01: "ICMP",
         0x02: "IGMP",
         0x06: "TCP",
         0x11: "UDP",
-        0x3a: "IPv6-ICMP"
+        0x2b: "IPv6-Route",
+        0x2c: "IPv6-Frag",
+        0x32: "ESP",
+        0x33: "AH",
+        0x3a: "IPv6-ICMP",
+        0x3b: "IPv6-NoNxt",
+        0x3c: "IPv6-Opts"
     }
 
+    def protocol_name(self, protocol_number: int) -> str:
+        try:
+            return self.protocol_numbers[protocol_number]
+        except KeyError:
+            protocol = registry.by_protocol_number(protocol_number)
+            return protocol.__name__ if protocol else None
+
 
 class IPv4(IP, Protocol):          # IETF RFC 791
     _fields_ = [
@@ -36,6 +104,11 @@ class IPv4(IP, Protocol):          # IETF RFC 791
         ("_dst", c_ubyte * 4)      # Destination address
     ]
     header_len = 20                # Length of the header in bytes
+    ethertype = 0x0800
+    keeps_packet = True
+    __slots__ = "_packet", "_start"
+    src = ProtocolAddress("_src")
+    dst = ProtocolAddress("_dst")
     flag_names = {
         0: "Not set",
         1: "More fragments (MF)",
@@ -71,16 +144,9 @@ class IPv4(IP, Protocol):          # IETF RFC 791
         self.src = self.proto_addr_to_array(src)
         self.dst = self.proto_addr_to_array(dst)
 
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.src = cls.array_to_proto_addr(header._src)
-        header.dst = cls.array_to_proto_addr(header._dst)
-        return header
-
     @property
     def encapsulated_proto(self) -> str:
-        return self.protocol_numbers.get(self.proto, None)
+        return self.protocol_name(self.proto)
 
     @property
     def chksum_hex_str(self) -> str:
@@ -100,6 +166,35 @@ class IPv4(IP, Protocol):          # IETF RFC 791
         """
         return self.flag_names.get(self.flags, "Error")
 
+    @property
+    def options(self) -> memoryview:
+        """
+        Gets a view of the options following the fixed header of a
+        decoded packet, as given by the IHL field.
+        """
+        return self.view(self.header_len, self.ihl * 4)
+
+    @property
+    def payload(self) -> memoryview:
+        """
+        Gets a view of the data following the header and options of a
+        decoded packet, up to its total length. Packets whose total
+        length is not set, as captured before segmentation offload,
+        extend to the end of the buffer.
+        """
+        header_len = self.ihl * 4
+        return self.view(header_len,
+                         self.len if self.len >= header_len else None)
+
+    def compute_chksum(self) -> int:
+        """Compute the checksum of the header and options as defined by
+        RFC 791."""
+        return header_checksum(self, self.options)
+
+    def verify_chksum(self) -> bool:
+        """Check whether the checksum set on the header is correct."""
+        return verify_checksum(self, self.options)
+
 
 class IPv6(IP, Protocol):           # IETF RFC 2460 / 8200
     _fields_ = [
@@ -113,6 +208,11 @@ class IPv6(IP, Protocol):           # IETF RFC 2460 / 8200
         ("_dst", c_ubyte * 16)      # Destination address
     ]
     header_len = 40                 # Length of the header in bytes
+    ethertype = 0x86dd
+    keeps_packet = True
+    __slots__ = "_packet", "_start"
+    src = ProtocolAddress("_src", addr_family=AF_INET6)
+    dst = ProtocolAddress("_dst", addr_family=AF_INET6)
 
     def __init__(self, *,
                  version: int,
@@ -133,16 +233,33 @@ class IPv6(IP, Protocol):           # IETF RFC 2460 / 8200
         self.src = self.proto_addr_to_array(src, addr_family=AF_INET6)
         self.dst = self.proto_addr_to_array(dst, addr_family=AF_INET6)
 
-    @classmethod
-    def decode(cls, packet: bytes):
-        header = cls.from_buffer_copy(packet)
-        header.src = cls.array_to_proto_addr(header._src, addr_family=AF_INET6)
-        header.dst = cls.array_to_proto_addr(header._dst, addr_family=AF_INET6)
-        return header
-
     @property
     def encapsulated_proto(self) -> str:
-        return self.protocol_numbers.get(self.next_header, None)
+        return self.protocol_name(self.upper_layer[0])
+
+    @property
+    def upper_layer(self) -> Tuple[int, int]:
+        """
+        Gets the number of the upper-layer protocol of a decoded packet
+        and the offset of its header from the start of the IPv6 header,
+        past any extension headers. Packets whose next header is not an
+        extension header, such as TCP, UDP or ICMPv6, are answered
+        without reading the packet.
+        Ex: (6, 40) or, after a Hop-by-Hop Options header, (58, 48)
+        """
+        if self.next_header not in extension_lengths:
+            return self.next_header, self.header_len
+        return walk_extension_headers(self.view(0), self.header_len,
+                                      self.next_header)
+
+    @property
+    def payload(self) -> memoryview:
+        """
+        Gets a view of the data of a decoded packet following its
+        extension headers, up to the end of its payload.
+        """
+        return self.view(self.upper_layer[1],
+                         self.header_len + self.payload_len)
 
     @property
     def tclass_hex_str(self):
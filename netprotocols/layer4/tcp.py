@@ -3,10 +3,13 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
+import struct
 from ctypes import c_uint16, c_uint32
-from typing import Iterator
+from typing import Iterator, List, Optional, Tuple
 
 from netprotocols import Protocol
+from netprotocols.base.packet import RawLayer
+from netprotocols.base.checksum import header_checksum, verify_checksum
 
 
 class TCP(Protocol):                # IETF RFC 793
@@ -23,6 +26,10 @@ class TCP(Protocol):                # IETF RFC 793
         ("urg", c_uint16),          # Urgent pointer
     ]
     header_len = 32
+    protocol_number = 0x06
+    pseudo_header = True
+    keeps_packet = True
+    __slots__ = "_packet", "_start"
     flag_names = "FIN", "SYN", "RST", "PSH", "ACK", "URG", "ECE", "CWR", "NS"
 
     def __init__(self, *,
@@ -73,3 +80,113 @@ class TCP(Protocol):                # IETF RFC 793
         flags: Iterator = (flag_name for flag_name, flag_bit in
                            zip(self.flag_names, flag_bits) if flag_bit == 1)
         return " ".join(flags)
+
+    @property
+    def options(self) -> memoryview:
+        """
+        Gets a view of the options following the fixed 20-byte header
+        of a decoded segment, as given by the data offset field.
+        """
+        return self.view(20, self.offset * 4)
+
+    @property
+    def payload(self) -> memoryview:
+        """
+        Gets a view of the data following the header and options of a
+        decoded segment, up to the end of the IP packet carrying it when
+        decoded by dissect().
+        """
+        return self.view(self.offset * 4)
+
+    @property
+    def parsed_options(self) -> "TCPOptions":
+        """
+        Gets the options of a decoded segment, parsed when any of them is
+        first read.
+        Ex: segment.parsed_options.mss or segment.parsed_options.sack
+        """
+        return TCPOptions(self.options)
+
+    def compute_chksum(self, ip, payload: bytes = b"") -> int:
+        """
+        Compute the checksum of the segment as defined by RFC 793,
+        covering the pseudo-header built from the IPv4 or IPv6 header
+        of the packet carrying it. The payload holds every byte that
+        follows the fixed 20-byte header, options included.
+        """
+        return header_checksum(self, payload, ip, 0x06)
+
+    def verify_chksum(self, ip, payload: bytes = b"") -> bool:
+        """Check whether the checksum set on the segment is correct."""
+        return verify_checksum(self, payload, ip, 0x06)
+
+
+class SegmentOptions(RawLayer):
+    """The raw options of a TCP header, kept by dissect() as the
+    "segmentoptions" layer of a Packet. Refer to TCP.parsed_options for
+    their decoded values."""
+
+
+class TCPOptions:
+    """
+    Options of a TCP segment, parsed in a single pass over their bytes
+    the first time any of them is read, so that segments whose options
+    are never looked at cost nothing more. Options that are absent read
+    as None, or as False and an empty list for those of SACK, and
+    parsing stops at the End of Option List or at a malformed option.
+    """
+    __slots__ = "data", "mss", "window_scale", "sack_permitted", "sack", \
+        "timestamps"
+    EOL, NOP, MSS, WINDOW_SCALE, SACK_PERMITTED, SACK, TIMESTAMPS = \
+        0, 1, 2, 3, 4, 5, 8
+    word = struct.Struct(">H")
+    pair = struct.Struct(">II")
+
+    mss: Optional[int]                          # RFC 793
+    window_scale: Optional[int]                 # RFC 7323
+    sack_permitted: bool                        # RFC 2018
+    sack: List[Tuple[int, int]]                 # RFC 2018
+    timestamps: Optional[Tuple[int, int]]       # TSval, TSecr, RFC 7323
+
+    def __init__(self, data: memoryview):
+        self.data = data
+
+    def __iter__(self) -> Iterator[Tuple[int, memoryview]]:
+        """Yield the kind and the value of each option but NOP."""
+        data, position = self.data, 0
+        while position < len(data):
+            kind = data[position]
+            if kind == self.EOL:
+                return
+            if kind == self.NOP:
+                position += 1
+                continue
+            if position + 1 >= len(data):
+                return
+            length = data[position + 1]
+            if length < 2 or position + length > len(data):
+                return
+            yield kind, data[position + 2:position + length]
+            position += length
+
+    def __getattr__(self, name: str):
+        """Parse every option the first time any of them is read."""
+        if name not in TCPOptions.__slots__:
+            raise AttributeError(name)
+        self._parse()
+        return object.__getattribute__(self, name)
+
+    def _parse(self):
+        self.mss = self.window_scale = self.timestamps = None
+        self.sack_permitted, self.sack = False, []
+        for kind, value in self:
+            if kind == self.MSS and len(value) == 2:
+                self.mss, = self.word.unpack(value)
+            elif kind == self.WINDOW_SCALE and len(value) == 1:
+                self.window_scale = value[0]
+            elif kind == self.SACK_PERMITTED:
+                self.sack_permitted = True
+            elif kind == self.SACK and len(value) % 8 == 0:
+                self.sack = list(self.pair.iter_unpack(value))
+            elif kind == self.TIMESTAMPS and len(value) == 8:
+                self.timestamps = self.pair.unpack(value)
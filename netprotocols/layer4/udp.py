@@ -6,6 +6,7 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 from ctypes import c_uint16
 
 from netprotocols import Protocol
+from netprotocols.base.checksum import header_checksum, verify_checksum
 
 
 class UDP(Protocol):          # IETF RFC 768
@@ -16,6 +17,8 @@ class UDP(Protocol):          # IETF RFC 768
         ("chksum", c_uint16)  # Header checksum
     ]
     header_len = 8
+    protocol_number = 0x11
+    pseudo_header = True
 
     def __init__(self, *,
                  sport: int,
@@ -27,3 +30,21 @@ class UDP(Protocol):          # IETF RFC 768
         self.dport = dport
         self.len = len
         self.chksum = chksum
+
+    def compute_chksum(self, ip, payload: bytes = b"") -> int:
+        """
+        Compute the checksum of the datagram as defined by RFC 768,
+        covering the pseudo-header built from the IPv4 or IPv6 header
+        of the packet carrying it. A computed value of zero is sent as
+        0xffff.
+        """
+        return header_checksum(self, payload, ip, 0x11) or 0xffff
+
+    def verify_chksum(self, ip, payload: bytes = b"") -> bool:
+        """
+        Check whether the checksum set on the datagram is correct. A
+        checksum of zero means none was computed, as allowed over IPv4.
+        """
+        if self.chksum == 0:
+            return len(ip._src) == 4
+        return verify_checksum(self, payload, ip, 0x11)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Reassembly of fragmented IPv4 datagrams with the hole descriptors of
+IETF RFC 815, in bounded memory.
+
+Fragments are keyed by source and destination addresses, protocol and
+identification, as required by RFC 791. Each datagram being reassembled
+keeps the list of its holes, the ranges of bytes not received yet, so
+that a fragment only costs a pass over the holes it fills and the data
+it brings is copied once. Bytes that were already received are never
+overwritten by an overlapping fragment, which removes the ambiguity that
+overlapping fragments are crafted to exploit; the whole datagram can be
+discarded instead.
+
+Memory is bounded by a per-datagram length and fragment count and by a
+global budget of buffered bytes. Datagrams are kept in order of last
+activity, so those idle for longer than the timeout are expired and the
+least recently active ones are evicted when the budget is exceeded.
+'''
+
+import struct
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from netprotocols.base.checksum import internet_checksum
+
+Key = Tuple[bytes, bytes, int, int]  # Source, destination, protocol, id
+
+header = struct.Struct(">BxHHHxB2x4s4s")
+word = struct.Struct(">H")
+MORE_FRAGMENTS = 0x2000
+OFFSET_MASK = 0x1fff
+MAX_DATAGRAM_LEN = 65535
+
+
+class Datagram:
+    """A datagram being reassembled from its fragments."""
+    __slots__ = "header", "data", "holes", "length", "fragments", \
+        "last_seen"
+
+    def __init__(self, timestamp: float):
+        self.header = None    # Header of the first fragment
+        self.data = bytearray()
+        self.holes: List[Tuple[int, int]] = [(0, MAX_DATAGRAM_LEN)]
+        self.length = None    # Length of the payload, once known
+        self.fragments = 0
+        self.last_seen = timestamp
+
+    def fill(self, first: int, fragment, more_fragments: bool) -> bool:
+        """
+        Copy the bytes of a fragment found in the holes of the datagram
+        and update the holes as given by RFC 815. Return whether any byte
+        of the fragment had already been received.
+        """
+        last = first + len(fragment) - 1
+        if len(self.data) <= last:
+            self.data.extend(bytes(last + 1 - len(self.data)))
+        copied, holes = 0, []
+        for hole_first, hole_last in self.holes:
+            if first > hole_last or last < hole_first:
+                holes.append((hole_first, hole_last))
+                continue
+            if first > hole_first:
+                holes.append((hole_first, first - 1))
+            if last < hole_last and more_fragments:
+                holes.append((last + 1, hole_last))
+            start, end = max(first, hole_first), min(last, hole_last) + 1
+            self.data[start:end] = fragment[start - first:end - first]
+            copied += end - start
+        if not more_fragments:
+            self.length = last + 1
+            holes = [(hole_first, min(hole_last, last))
+                     for hole_first, hole_last in holes if hole_first <= last]
+        self.holes = holes
+        return copied < len(fragment)
+
+
+class IPv4Reassembler:
+    """
+    Reassembler of fragmented IPv4 datagrams, fed with datagrams
+    starting at their IPv4 header.
+
+    When overlap is "keep", bytes received first win over those of
+    overlapping fragments, as in the Linux and BSD stacks. When it is
+    "drop", any overlap discards the whole datagram. Datagrams longer
+    than max_datagram_len, made of more than max_fragments fragments or
+    idle for longer than timeout seconds are discarded, as are the least
+    recently active datagrams once more than max_bytes are buffered.
+    """
+
+    def __init__(self, *, timeout: float = 30.0, max_bytes: int = 4 << 20,
+                 max_datagram_len: int = MAX_DATAGRAM_LEN,
+                 max_fragments: int = 128, overlap: str = "keep"):
+        if overlap not in ("keep", "drop"):
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_datagram_len = max_datagram_len
+        self.max_fragments = max_fragments
+        self.overlap = overlap
+        self.buffered = 0   # Bytes held by incomplete datagrams
+        self.completed = 0  # Datagrams reassembled
+        self.expired = 0    # Datagrams discarded after the timeout
+        self.evicted = 0    # Datagrams discarded to stay within max_bytes
+        self.overlaps = 0   # Fragments overlapping received bytes
+        self.discarded = 0  # Datagrams discarded for exceeding a limit
+        self._datagrams: "OrderedDict[Key, Datagram]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._datagrams)
+
+    def add(self, datagram, timestamp: float = None) -> Optional[bytes]:
+        """
+        Add an IPv4 datagram, or a fragment of one, received at the
+        given time in seconds, which defaults to the current time.
+        Return the complete datagram when the fragment completes it, the
+        datagram itself when it is not fragmented, and None otherwise.
+        The reassembled datagram carries the header of its first
+        fragment, with its length, fragment offset, MF flag and checksum
+        updated.
+        """
+        version_ihl, total_len, ident, flags_offset, proto, src, dst = \
+            header.unpack_from(datagram)
+        if not flags_offset & (MORE_FRAGMENTS | OFFSET_MASK):
+            return datagram
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.expire(timestamp)
+
+        header_len = (version_ihl & 0x0f) * 4
+        first = (flags_offset & OFFSET_MASK) * 8
+        fragment = memoryview(datagram)[header_len:total_len]
+        if not fragment:
+            return None
+        more_fragments = bool(flags_offset & MORE_FRAGMENTS)
+        key = src, dst, proto, ident
+        try:
+            entry = self._datagrams[key]
+            self._datagrams.move_to_end(key)
+        except KeyError:
+            entry = self._datagrams[key] = Datagram(timestamp)
+        entry.last_seen = timestamp
+        entry.fragments += 1
+
+        if header_len + first + len(fragment) > self.max_datagram_len or \
+                entry.fragments > self.max_fragments:
+            self.discarded += 1
+            self._discard(key)
+            return None
+        if first == 0:
+            entry.header = bytes(datagram[:header_len])
+        allocated = len(entry.data)
+        overlapped = entry.fill(first, fragment, more_fragments)
+        self.buffered += len(entry.data) - allocated
+        if overlapped:
+            self.overlaps += 1
+            if self.overlap == "drop":
+                self._discard(key)
+                return None
+        if not entry.holes and entry.header is not None:
+            self.completed += 1
+            self._discard(key)
+            return self._build(entry)
+        while self.buffered > self.max_bytes and self._datagrams:
+            self.evicted += 1
+            self._discard(next(iter(self._datagrams)))
+        return None
+
+    def expire(self, now: float = None):
+        """Discard the datagrams idle for longer than the timeout."""
+        if now is None:
+            now = time.monotonic()
+        datagrams, deadline = self._datagrams, now - self.timeout
+        while datagrams:
+            key = next(iter(datagrams))
+            if datagrams[key].last_seen > deadline:
+                return
+            self.expired += 1
+            self._discard(key)
+
+    def _discard(self, key: Key):
+        self.buffered -= len(self._datagrams.pop(key).data)
+
+    @staticmethod
+    def _build(entry: Datagram) -> bytes:
+        first_header = bytearray(entry.header)
+        flags_offset, = word.unpack_from(first_header, 6)
+        word.pack_into(first_header, 2, len(first_header) + entry.length)
+        word.pack_into(first_header, 6,
+                       flags_offset & ~(MORE_FRAGMENTS | OFFSET_MASK))
+        word.pack_into(first_header, 10, 0)
+        word.pack_into(first_header, 10, internet_checksum(first_header))
+        return bytes(first_header) + entry.data[:entry.length]
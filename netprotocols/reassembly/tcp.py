@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+'''
+Tracking of TCP connections and reassembly of their byte streams.
+
+A flow table keeps one slotted record per connection, found by the
+addresses and ports of the IPv4 or IPv6 and TCP headers of its segments
+whichever their direction, and follows its state from the flags of each
+segment. Segments received out of order are held, up to a bounded number
+of bytes per direction, until the bytes preceding them arrive, so that
+each direction of a connection is delivered as a contiguous stream of
+bytes. Sequence numbers are compared modulo 2 ** 32.
+
+Idle connections are expired by a timer wheel: each connection sits in
+the slot of the wheel matching the tick at which it may expire and is
+only looked at again when the wheel reaches that slot, so receiving a
+segment costs no timer operation and expiring connections costs time
+proportional to the number of connections actually due. Closed
+connections are left in their slot and skipped when it is reached.
+'''
+
+from typing import Callable, Dict, Optional, Tuple
+
+from netprotocols import TCP, dissect
+from netprotocols.base.timerwheel import TimerWheel
+
+FIN, SYN, RST, ACK = (1 << TCP.flag_names.index(name)
+                      for name in ("FIN", "SYN", "RST", "ACK"))
+
+'''Connection states, a subset of those of RFC 793 as seen by an
+observer of both directions.'''
+SYN_SENT = "SYN_SENT"
+SYN_RECEIVED = "SYN_RECEIVED"
+ESTABLISHED = "ESTABLISHED"
+CLOSING = "CLOSING"
+CLOSED = "CLOSED"
+
+Key = Tuple[bytes, int, bytes, int]
+
+
+def seq_diff(seq: int, other: int) -> int:
+    """Signed distance from one sequence number to another."""
+    return (seq - other + 0x80000000) % 0x100000000 - 0x80000000
+
+
+class Endpoint:
+    """One direction of a connection, named after its sender."""
+    __slots__ = "address", "port", "next_seq", "fin_seq", "segments", \
+        "buffered", "delivered"
+
+    def __init__(self, address: bytes, port: int):
+        self.address = address
+        self.port = port
+        self.next_seq: Optional[int] = None  # Next byte expected
+        self.fin_seq: Optional[int] = None   # Sequence number of the FIN
+        self.segments: Optional[Dict[int, bytes]] = None  # Out of order
+        self.buffered = 0                    # Bytes held in segments
+        self.delivered = 0                   # Bytes delivered in order
+
+    @property
+    def finished(self) -> bool:
+        return self.fin_seq is not None and self.next_seq is not None and \
+            seq_diff(self.next_seq, self.fin_seq) >= 0
+
+
+class Flow:
+    """A TCP connection tracked by a FlowTable."""
+    __slots__ = "key", "client", "server", "state", "last_seen"
+
+    def __init__(self, key: Key, client: Endpoint, server: Endpoint,
+                 state: str, timestamp: float):
+        self.key = key
+        self.client = client  # Sender of the first segment seen
+        self.server = server
+        self.state = state
+        self.last_seen = timestamp
+
+    def __repr__(self):
+        return f"Flow({self.client.port} -> {self.server.port}, " \
+               f"{self.state})"
+
+
+class FlowTable:
+    """
+    Table of the TCP connections found in a sequence of segments.
+
+    Bytes delivered in order are passed to on_data(flow, sender, data),
+    sender being the Endpoint that sent them, and closed or expired
+    flows to on_close(flow) before being removed. At most max_buffer
+    bytes of out-of-order segments are held per direction; segments
+    beyond it are dropped. When midstream is set, connections whose
+    handshake was not seen are tracked from their first segment carrying
+    data.
+    """
+
+    def __init__(self, *, timeout: float = 120.0, max_buffer: int = 65536,
+                 tick: float = 1.0, wheel_slots: int = 256,
+                 on_data: Callable = None, on_close: Callable = None,
+                 midstream: bool = True):
+        self.timeout = timeout
+        self.max_buffer = max_buffer
+        self.on_data = on_data
+        self.on_close = on_close
+        self.midstream = midstream
+        self.wheel: TimerWheel[Flow] = TimerWheel(wheel_slots, tick)
+        self.expired = 0          # Flows removed after the timeout
+        self.dropped_segments = 0  # Segments beyond max_buffer
+        self._flows: Dict[Key, Flow] = {}
+
+    def __len__(self):
+        return len(self._flows)
+
+    def __iter__(self):
+        return iter(self._flows.values())
+
+    def get(self, key: Key) -> Optional[Flow]:
+        return self._flows.get(key)
+
+    def add_frame(self, frame, timestamp: float) -> Optional[Flow]:
+        """Dissect an Ethernet frame and add the TCP segment it carries,
+        if any."""
+        packet = dissect(frame)
+        if not hasattr(packet, "tcp"):
+            return None
+        ip = packet.ipv4 if hasattr(packet, "ipv4") else packet.ipv6
+        return self.add(ip, packet.tcp, packet.tcp.payload, timestamp)
+
+    def add(self, ip, tcp, payload, timestamp: float) -> Optional[Flow]:
+        """
+        Add a TCP segment, given its IPv4 or IPv6 header, its TCP header
+        and the bytes it carries, received at the given time in seconds.
+        Return the flow it belongs to, or None if it was not tracked.
+        """
+        for flow in self.wheel.advance(timestamp):
+            self._check_expiry(flow, timestamp)
+
+        src, dst = bytes(ip._src), bytes(ip._dst)
+        sport, dport, flags = tcp.sport, tcp.dport, tcp.flags
+        key = (src, sport, dst, dport) if (src, sport) <= (dst, dport) \
+            else (dst, dport, src, sport)
+        flow = self._flows.get(key)
+        if flow is None:
+            flow = self._open(key, src, sport, dst, dport, tcp,
+                              len(payload), timestamp)
+            if flow is None:
+                return None
+        flow.last_seen = timestamp
+
+        if flow.client.port == sport and flow.client.address == src:
+            sender, receiver = flow.client, flow.server
+        else:
+            sender, receiver = flow.server, flow.client
+
+        if flags & RST:
+            self._close(flow)
+            return flow
+        if flags & SYN:
+            if sender is flow.server and flow.state == SYN_SENT:
+                flow.state = SYN_RECEIVED
+            sender.next_seq = (tcp.seq + 1) & 0xffffffff
+        elif flow.state == SYN_RECEIVED and flags & ACK and \
+                sender is flow.client:
+            flow.state = ESTABLISHED
+        seq = (tcp.seq + 1) & 0xffffffff if flags & SYN else tcp.seq
+        if flags & FIN:
+            sender.fin_seq = (seq + len(payload)) & 0xffffffff
+            flow.state = CLOSING
+        if payload:
+            self._receive(flow, sender, seq, payload)
+        if sender.finished and receiver.finished:
+            self._close(flow)
+        return flow
+
+    def _open(self, key: Key, src: bytes, sport: int, dst: bytes,
+              dport: int, tcp, length: int,
+              timestamp: float) -> Optional[Flow]:
+        flags = tcp.flags
+        client, server = Endpoint(src, sport), Endpoint(dst, dport)
+        if flags & SYN and not flags & ACK:
+            state = SYN_SENT
+        elif flags & RST or not self.midstream or \
+                not length and not flags & SYN:
+            return None
+        else:
+            state = ESTABLISHED
+            if flags & SYN:  # SYN-ACK of a handshake whose SYN was missed
+                client, server = server, client
+                state = SYN_RECEIVED
+            else:
+                client.next_seq = tcp.seq
+        flow = self._flows[key] = Flow(key, client, server, state,
+                                       timestamp)
+        self.wheel.schedule(flow, timestamp + self.timeout)
+        return flow
+
+    def _receive(self, flow: Flow, sender: Endpoint, seq: int, payload):
+        if sender.next_seq is None:
+            sender.next_seq = seq
+        ahead = seq_diff(seq, sender.next_seq)
+        if ahead > 0:
+            if sender.buffered + len(payload) > self.max_buffer:
+                self.dropped_segments += 1
+                return
+            if sender.segments is None:
+                sender.segments = {}
+            if seq not in sender.segments:
+                sender.segments[seq] = bytes(payload)
+                sender.buffered += len(payload)
+            return
+        if ahead + len(payload) <= 0:
+            return  # Retransmission of bytes already delivered
+        self._deliver(flow, sender, payload[-ahead:])
+        while sender.segments:
+            for seq in list(sender.segments):
+                ahead = seq_diff(seq, sender.next_seq)
+                if ahead <= 0:
+                    break
+            else:
+                return
+            data = sender.segments.pop(seq)
+            sender.buffered -= len(data)
+            if ahead + len(data) > 0:
+                self._deliver(flow, sender, data[-ahead:])
+        sender.segments = None
+
+    def _deliver(self, flow: Flow, sender: Endpoint, data):
+        sender.next_seq = (sender.next_seq + len(data)) & 0xffffffff
+        sender.delivered += len(data)
+        if self.on_data is not None:
+            self.on_data(flow, sender, bytes(data))
+
+    def _check_expiry(self, flow: Flow, now: float):
+        if self._flows.get(flow.key) is not flow:
+            return  # Closed since it was scheduled
+        deadline = flow.last_seen + self.timeout
+        if deadline > now:
+            self.wheel.schedule(flow, deadline)
+            return
+        self.expired += 1
+        self._close(flow)
+
+    def expire(self, now: float):
+        """Expire the flows idle for longer than the timeout."""
+        for flow in self.wheel.advance(now):
+            self._check_expiry(flow, now)
+
+    def _close(self, flow: Flow):
+        flow.state = CLOSED
+        del self._flows[flow.key]
+        if self.on_close is not None:
+            self.on_close(flow)
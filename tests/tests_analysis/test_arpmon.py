@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import socket
+
+from netprotocols import ARP, Ethernet
+from netprotocols.analysis.arpmon import ARPMonitor
+
+import pytest
+
+GATEWAY = "192.168.1.254", "00:1e:68:51:4f:a9"
+ATTACKER = "192.168.1.66", "00:07:0d:af:f4:54"
+
+
+def arp(sender=GATEWAY, target: str = "192.168.1.96", oper: int = 2):
+    """Build an ARP header announcing the binding of its sender."""
+    return ARP(htype=1, ptype=0x0800, hlen=6, plen=4, oper=oper,
+               sha=sender[1], spa=sender[0], tha="00:00:00:00:00:00",
+               tpa=target)
+
+
+def frame(header: ARP, vlan: bool = False) -> bytes:
+    ethernet = Ethernet(dst="ff:ff:ff:ff:ff:ff", src="00:1e:68:51:4f:a9",
+                        eth=0x8100 if vlan else 0x0806)
+    tag = b"\x00\x0a\x08\x06" if vlan else b""
+    return bytes(ethernet) + tag + bytes(header)
+
+
+@pytest.fixture
+def monitor():
+    monitor = ARPMonitor(timeout=60, flood_threshold=3, flood_window=1.0)
+    monitor.events = []
+    monitor.on_conflict = lambda neighbor, previous: monitor.events.append(
+        ("conflict", neighbor.mac, previous))
+    monitor.on_flood = lambda neighbor: monitor.events.append(
+        ("flood", neighbor.ip))
+    monitor.on_expire = lambda neighbor: monitor.events.append(
+        ("expire", neighbor.ip))
+    return monitor
+
+
+class TestARPMonitor:
+    @pytest.mark.parametrize("vlan", [False, True])
+    def test_learn_binding(self, monitor, vlan):
+        """
+        GIVEN an ARP reply, untagged or carried in a VLAN-tagged frame
+        WHEN it is added to the monitor
+        THEN the binding of its sender must be kept packed
+        """
+        neighbor = monitor.add_frame(frame(arp(), vlan), 0.0)
+
+        assert neighbor.ip == socket.inet_aton(GATEWAY[0])
+        assert neighbor.mac == bytes.fromhex("001e68514fa9")
+        assert monitor.lookup(GATEWAY[0]) == GATEWAY[1]
+        assert monitor.lookup(ATTACKER[0]) is None
+        assert len(monitor) == 1
+
+    def test_conflicting_reply(self, monitor):
+        """
+        GIVEN a neighbor bound to the MAC address of the gateway
+        WHEN another host replies for the address of the gateway
+        THEN a conflict must be reported with both MAC addresses
+        """
+        monitor.add(arp(), 0.0)
+        monitor.add(arp(GATEWAY), 1.0)
+        monitor.add(arp((GATEWAY[0], ATTACKER[1])), 2.0)
+
+        assert monitor.conflicts == 1
+        assert monitor.events == [("conflict",
+                                   bytes.fromhex("00070daff454"),
+                                   bytes.fromhex("001e68514fa9"))]
+        assert monitor.lookup(GATEWAY[0]) == ATTACKER[1]
+
+    def test_gratuitous_flood(self, monitor):
+        """
+        GIVEN a monitor reporting 3 gratuitous ARP packets in a second
+        WHEN a host announces its own address repeatedly
+        THEN a flood must be reported once per window in which the
+            threshold is reached
+        """
+        gratuitous = frame(arp(ATTACKER, target=ATTACKER[0], oper=1))
+        for timestamp in (0.0, 0.2, 0.4, 0.6, 1.5, 1.6, 3.0, 3.1, 3.2):
+            monitor.add_frame(gratuitous, timestamp)
+
+        assert monitor.floods == 2
+        assert monitor.events == \
+            [("flood", socket.inet_aton(ATTACKER[0]))] * 2
+
+    def test_aging(self, monitor):
+        """
+        GIVEN neighbors heard from at different times
+        WHEN the monitor is advanced past the timeout of one of them
+        THEN only that neighbor must be expired
+        """
+        monitor.add(arp(), 0.0)
+        monitor.add(arp(ATTACKER), 0.0)
+        monitor.add(arp(GATEWAY), 50.0)
+        monitor.expire(90.0)
+
+        assert monitor.events == [("expire", socket.inet_aton(ATTACKER[0]))]
+        assert [neighbor.ip for neighbor in monitor] == \
+            [socket.inet_aton(GATEWAY[0])]
+        monitor.expire(200.0)
+        assert len(monitor) == 0 and monitor.expired == 2
+
+    @pytest.mark.parametrize("data", [
+        frame(arp(("0.0.0.0", ATTACKER[1]), target=GATEWAY[0], oper=1)),
+        frame(arp())[:30],
+        frame(arp())[:12] + b"\x08\x00" + frame(arp())[14:],
+        frame(arp())[:18] + b"\x04" + frame(arp())[19:],
+    ], ids=["probe", "truncated", "not arp", "not ethernet"])
+    def test_ignored_frames(self, monitor, data):
+        """
+        GIVEN an ARP probe, a truncated frame, an IPv4 frame or an ARP
+            packet whose hardware addresses are not of 6 bytes
+        WHEN it is added to the monitor
+        THEN no binding must be kept
+        """
+        assert monitor.add_frame(data, 0.0) is None
+        assert len(monitor) == 0
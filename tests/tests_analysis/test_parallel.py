@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import PcapReader, PcapWriter
+from netprotocols.analysis.parallel import (
+    TrafficSummary,
+    summarize,
+    summarize_chunk
+)
+
+import pytest
+
+
+@pytest.fixture
+def tcp_frame(raw_ipv4_header):
+    return b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54\x08\x00" + \
+           raw_ipv4_header + \
+           b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x50\x18\x21" \
+           b"\x5c\x20\x08\x00\x00"
+
+
+@pytest.fixture
+def mixed_pcap(tmp_path, tcp_frame, raw_eth_header, raw_arp_header):
+    path = str(tmp_path / "mixed.pcap")
+    with PcapWriter(path) as writer:
+        for timestamp in range(30):
+            writer.write(tcp_frame, timestamp)
+            if timestamp % 3 == 0:
+                writer.write(raw_eth_header + raw_arp_header, timestamp)
+    return path
+
+
+class TestParallel:
+    def test_chunks_are_record_aligned(self, mixed_pcap):
+        """
+        GIVEN a pcap file
+        WHEN it is split into chunks
+        THEN the chunks must be contiguous and read every record once
+        """
+        with PcapReader(mixed_pcap) as reader:
+            chunks = reader.chunks(4)
+            counts = [sum(1 for _ in reader.records(start, end))
+                      for start, end in chunks]
+
+        assert len(chunks) == 4
+        assert all(end == start for (_, end), (start, _)
+                   in zip(chunks, chunks[1:]))
+        assert sum(counts) == 40
+
+    def test_summarize_chunk(self, mixed_pcap):
+        """
+        GIVEN a pcap file of IPv4/TCP and ARP frames
+        WHEN the whole file is summarized as a single chunk
+        THEN protocols, TCP flags and talkers must be counted
+        """
+        with PcapReader(mixed_pcap) as reader:
+            (start, end), = reader.chunks(1)
+        summary = summarize_chunk(mixed_pcap, start, end)
+
+        assert summary.frames == 40
+        assert summary.protocols == {"IPv4": 30, "TCP": 30, "ARP": 10}
+        assert summary.tcp_flags == {"PSH ACK": 30}
+        assert summary.top_talkers(1) == [("192.168.1.96", 30 * 54)]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_summarize(self, mixed_pcap, workers):
+        """
+        GIVEN a pcap file
+        WHEN it is summarized by a pool of worker processes
+        THEN the merged summary must equal that of a single chunk
+        """
+        with PcapReader(mixed_pcap) as reader:
+            (start, end), = reader.chunks(1)
+
+        assert summarize(mixed_pcap, workers=workers) == \
+               summarize_chunk(mixed_pcap, start, end)
+
+    def test_merge(self):
+        """
+        GIVEN two summaries
+        WHEN one is merged into the other
+        THEN their counters must be added
+        """
+        first, second = TrafficSummary(), TrafficSummary()
+        first.frames, second.frames = 1, 2
+        first.talkers["10.0.0.1"], second.talkers["10.0.0.1"] = 60, 40
+
+        first.merge(second)
+        assert first.frames == 3
+        assert first.talkers == {"10.0.0.1": 100}
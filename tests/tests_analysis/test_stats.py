@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import functools
+import struct
+
+from netprotocols import PcapReader, PcapWriter, dissect
+from netprotocols.analysis.parallel import summarize
+from netprotocols.analysis.stats import (
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSaving,
+    TrafficStats,
+    per_interval
+)
+
+import pytest
+
+
+def address(number: int) -> bytes:
+    return struct.pack(">I", 0x0a000000 + number)
+
+
+@pytest.fixture
+def tcp_frame(raw_ipv4_header):
+    """IPv4 from 192.168.1.96 to 192.168.1.254, TCP from port 1022 to
+    port 22."""
+    return b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54\x08\x00" + \
+        raw_ipv4_header + \
+        b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x50\x18\x21" \
+        b"\x5c\x20\x08\x00\x00"
+
+
+@pytest.fixture
+def stats_pcap(tmp_path, tcp_frame, raw_eth_header, raw_arp_header):
+    path = str(tmp_path / "stats.pcap")
+    with PcapWriter(path) as writer:
+        for timestamp in range(30):
+            writer.write(tcp_frame, timestamp / 10)
+            if timestamp % 3 == 0:
+                writer.write(raw_eth_header + raw_arp_header, timestamp / 10)
+    return path
+
+
+class TestSketches:
+    def test_count_min_sketch(self):
+        """
+        GIVEN a Count-Min sketch much narrower than the number of keys
+        WHEN a heavy key and many light ones are counted
+        THEN estimates must never fall below the true counts nor exceed
+            them by more than the error bound of the sketch
+        """
+        sketch = CountMinSketch(width=1024, depth=4)
+        sketch.add(b"heavy", 10_000)
+        for number in range(20_000):
+            sketch.add(address(number))
+        bound = 2.72 / sketch.width * sketch.total
+
+        assert 10_000 <= sketch.estimate(b"heavy") <= 10_000 + bound
+        assert all(1 <= sketch.estimate(address(number)) <= 1 + bound
+                   for number in range(0, 20_000, 100))
+        assert sketch.nbytes == 1024 * 4 * 8
+
+    @pytest.mark.parametrize("distinct", [10, 1000, 50_000])
+    def test_hyperloglog(self, distinct):
+        """
+        GIVEN consecutive addresses counted several times each
+        WHEN their distinct number is estimated
+        THEN the estimate must be within a few standard errors
+        """
+        estimator = HyperLogLog(precision=12)
+        for _ in range(2):
+            for number in range(distinct):
+                estimator.add(address(number))
+
+        assert estimator.estimate() == pytest.approx(distinct, rel=0.05)
+
+    def test_space_saving(self):
+        """
+        GIVEN a stream of keys with a few heavy hitters
+        WHEN it is counted by a space-saving summary of fewer counters
+            than keys
+        THEN the heavy hitters must be kept with totals exceeding their
+            true ones by at most their error
+        """
+        top = SpaceSaving(capacity=5)
+        for number in range(1000):
+            top.add(b"a", 3)
+            top.add(b"b", 2)
+            top.add(address(number))
+
+        (first, a), (second, b) = top.most_common(2)
+        assert (first, second) == (b"a", b"b")
+        assert a - top.errors[b"a"] <= 3000 <= a
+        assert b - top.errors[b"b"] <= 2000 <= b
+        assert len(top.counts) == 5
+
+    @pytest.mark.parametrize("sketch, other", [
+        (CountMinSketch(1024), CountMinSketch(2048)),
+        (HyperLogLog(10), HyperLogLog(12)),
+    ])
+    def test_merge_mismatch(self, sketch, other):
+        """
+        GIVEN sketches of different dimensions
+        WHEN they are merged
+        THEN ValueError must be raised
+        """
+        with pytest.raises(ValueError):
+            sketch.merge(other)
+
+    @pytest.mark.parametrize("sketch", [
+        functools.partial(CountMinSketch, 1000),
+        functools.partial(HyperLogLog, 3),
+        functools.partial(SpaceSaving, 0),
+        functools.partial(TrafficStats, memory=512),
+    ])
+    def test_invalid_dimensions(self, sketch):
+        """
+        GIVEN invalid dimensions or memory budget
+        WHEN a sketch is created
+        THEN ValueError must be raised
+        """
+        with pytest.raises(ValueError):
+            sketch()
+
+    def test_merge(self):
+        """
+        GIVEN two halves of a stream, each counted by its own sketches
+        WHEN the sketches of one half are merged into those of the other
+        THEN they must equal the sketches of the whole stream, and top
+            keys found in both halves must be kept
+        """
+        halves = [(CountMinSketch(), HyperLogLog(), SpaceSaving(3))
+                  for _ in range(3)]
+        for number in range(2000):
+            for sketches in (halves[number % 2], halves[2]):
+                count_min, distinct, top = sketches
+                count_min.add(address(number % 700))
+                distinct.add(address(number % 700))
+                top.add(address(number % 700))
+                top.add(b"heavy", 5)
+
+        for first, second in zip(halves[0], halves[1]):
+            first.merge(second)
+        assert halves[0][:2] == halves[2][:2]
+        assert halves[0][2].most_common(1) == [(b"heavy", 10_000)]
+
+
+class TestTrafficStats:
+    def test_add(self, tcp_frame, raw_eth_header, raw_arp_header):
+        """
+        GIVEN IPv4/TCP and ARP frames
+        WHEN they are aggregated by TrafficStats
+        THEN protocols, distinct addresses, bytes sent and services must
+            be counted, addresses being reported as strings
+        """
+        stats = TrafficStats()
+        for _ in range(3):
+            stats.add(dissect(tcp_frame), 60)
+            stats.add(dissect(raw_eth_header + raw_arp_header), 42)
+
+        assert stats.summary() == {
+            "frames": 6,
+            "bytes": 306,
+            "protocols": {"IPv4": 3, "ARP": 3, "TCP": 3},
+            "distinct_sources": 1,
+            "distinct_destinations": 1,
+            "top_talkers": [("192.168.1.96", 180)],
+            "top_services": [("tcp/22", 3)]
+        }
+        assert stats.bytes_sent("192.168.1.96") == 180
+        assert stats.bytes_sent("192.168.1.254") == 0
+
+    def test_add_runt_frame(self, tcp_frame):
+        """
+        GIVEN a frame shorter than an Ethernet header
+        WHEN it is aggregated by TrafficStats
+        THEN it must be counted as a frame of no protocol
+        """
+        stats = TrafficStats()
+        stats.add(dissect(tcp_frame[:10]), 10)
+
+        assert stats.frames == 1 and stats.bytes == 10
+        assert stats.summary()["protocols"] == {}
+
+    @pytest.mark.parametrize("memory", [64 * 1024, 1024 * 1024])
+    def test_memory_budget(self, memory):
+        """
+        GIVEN a memory budget
+        WHEN TrafficStats are created for it
+        THEN their sketches must fit in it
+        """
+        assert memory // 2 <= TrafficStats(memory).nbytes <= memory
+
+    def test_summarize_in_parallel(self, stats_pcap):
+        """
+        GIVEN a pcap file
+        WHEN it is summarized into TrafficStats by worker processes
+        THEN the merged statistics must equal those of a single process
+        """
+        stats = functools.partial(TrafficStats, memory=64 * 1024)
+        merged = summarize(stats_pcap, workers=2, summary=stats)
+
+        assert merged == summarize(stats_pcap, workers=1, summary=stats)
+        assert merged.frames == 40
+        assert merged.top_talkers() == [("192.168.1.96", 30 * 54)]
+
+    def test_per_interval(self, stats_pcap):
+        """
+        GIVEN a pcap file spanning three seconds
+        WHEN its records are aggregated per second
+        THEN one TrafficStats must be yielded per second
+        """
+        with PcapReader(stats_pcap) as reader:
+            intervals = [(start, stats.frames) for start, stats in
+                         per_interval(reader.records(), interval=1.0)]
+
+        assert intervals == [(0.0, 14), (1.0, 13), (2.0, 13)]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from ctypes import c_ubyte
+
+from netprotocols import Protocol
+from netprotocols.base import cache
+from netprotocols.base.cache import LRUCache, packed_key
+
+import pytest
+
+
+@pytest.fixture
+def address_caches():
+    enabled = [address_cache.enabled for address_cache in cache.caches]
+    cache.cache_clear()
+    yield cache
+    cache.configure(maxsize=cache.default_maxsize)
+    cache.cache_clear()
+    for address_cache, was_enabled in zip(cache.caches, enabled):
+        address_cache.enabled = was_enabled
+
+
+class TestLRUCache:
+    def test_hits_and_misses(self):
+        """
+        GIVEN a function wrapped by an LRUCache
+        WHEN it is called twice with the same arguments
+        THEN it must be computed once and the statistics must count one
+            miss followed by one hit
+        """
+        calls = []
+        cached = LRUCache(lambda value: calls.append(value) or value * 2)
+
+        assert cached(2) == cached(2) == 4
+        assert calls == [2]
+        assert cached.cache_info() == (1, 1, cache.default_maxsize, 1)
+
+    def test_evicts_least_recently_used(self):
+        """
+        GIVEN an LRUCache holding at most two entries
+        WHEN a third entry is added after the first one is used again
+        THEN the second entry must be evicted
+        """
+        cached = LRUCache(str, maxsize=2)
+        cached(1), cached(2), cached(1), cached(3)
+        cached.cache_clear()
+        cached(1), cached(2), cached(1), cached(3), cached(2)
+
+        assert cached.cache_info().misses == 4
+        cached.resize(1)
+        assert cached.cache_info().currsize == 1
+
+    def test_disabled(self):
+        """
+        GIVEN a disabled LRUCache
+        WHEN the wrapped function is called
+        THEN it must be computed on every call and nothing cached
+        """
+        cached = LRUCache(str, enabled=False)
+        cached(1), cached(1)
+
+        assert cached.cache_info() == (0, 0, cache.default_maxsize, 0)
+
+    def test_packed_key(self):
+        """
+        GIVEN a packed address array
+        WHEN its key is computed
+        THEN the key must hold its bytes and any other argument
+        """
+        addr_array = (c_ubyte * 4)(192, 168, 1, 1)
+
+        assert packed_key(addr_array, addr_family=2) == \
+               (b"\xc0\xa8\x01\x01", ("addr_family", 2))
+
+
+class TestAddressCaches:
+    def test_hardware_address_conversions(self, address_caches):
+        """
+        GIVEN the cached address conversions of Protocol
+        WHEN a MAC address is converted repeatedly
+        THEN repeated conversions must be hits returning equal but
+            distinct arrays, so that callers may modify them safely
+        """
+        first = Protocol.hdwr_to_addr_array("00:07:0d:af:f4:54")
+        first[0] = 0xff
+        second = Protocol.hdwr_to_addr_array("00:07:0d:af:f4:54")
+
+        assert bytes(second) == b"\x00\x07\x0d\xaf\xf4\x54"
+        assert Protocol.addr_array_to_hdwr(second) == \
+               Protocol.addr_array_to_hdwr(bytes(second)) == \
+               "00:07:0d:af:f4:54"
+        info = address_caches.cache_info()
+        assert info["hdwr_to_addr_array"].hits == 1
+        assert info["addr_array_to_hdwr"].hits == 1
+
+    def test_configure(self, address_caches):
+        """
+        GIVEN the address caches
+        WHEN they are disabled and then enabled with a smaller size
+        THEN conversions must not be cached while disabled and the size
+            of every cache must be updated
+        """
+        address_caches.configure(enabled=False)
+        Protocol.proto_addr_to_array("192.168.1.1")
+        address_caches.configure(maxsize=8, enabled=True)
+        Protocol.proto_addr_to_array("192.168.1.1")
+
+        info = address_caches.cache_info()["proto_addr_to_array"]
+        assert (info.misses, info.maxsize) == (1, 8)
+
+    def test_invalid_address_not_cached(self, address_caches):
+        """
+        GIVEN the cached address conversions of Protocol
+        WHEN an invalid address is converted
+        THEN a TypeError exception must be raised every time
+        """
+        for _ in range(2):
+            with pytest.raises(TypeError):
+                Protocol.proto_addr_to_array("not an address")
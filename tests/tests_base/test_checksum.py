@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import random
+
+from netprotocols import IPv4, IPv6
+from netprotocols.base.checksum import (
+    incremental_update,
+    internet_checksum,
+    ones_complement_sum,
+    pseudo_header_sum
+)
+
+import pytest
+
+
+def reference_checksum(data: bytes) -> int:
+    """Add one 16-bit word at a time, as in RFC 1071 section 4.1."""
+    data += b"\x00" * (len(data) % 2)
+    total = 0
+    for i in range(0, len(data), 2):
+        total += (data[i] << 8) | data[i + 1]
+        total = (total & 0xffff) + (total >> 16)
+    return ~total & 0xffff
+
+
+@pytest.fixture
+def random_buffers():
+    generator = random.Random(1071)
+    return [bytes(generator.getrandbits(8)
+                  for _ in range(generator.randint(0, 64)))
+            for _ in range(500)] + \
+        [b"", b"\x00\x00", b"\xff\xff", b"\xff\xff\xff\xff", b"\x01"]
+
+
+class TestChecksum:
+    def test_compute_internet_checksum(self, random_buffers):
+        """
+        GIVEN buffers of even and odd lengths
+        WHEN the Internet checksum of each buffer is computed
+        THEN the result must match the word-by-word algorithm of
+            RFC 1071
+        """
+        for data in random_buffers:
+            assert internet_checksum(data) == reference_checksum(data)
+
+    def test_verify_internet_checksum(self):
+        """
+        GIVEN a buffer followed by its own checksum
+        WHEN the checksum of the whole buffer is computed
+        THEN the result must be zero
+        """
+        data = b"\x45\x00\x00\x73\x00\x00\x40\x00\x40\x11"
+        chksum = internet_checksum(data)
+
+        assert internet_checksum(data + chksum.to_bytes(2, "big")) == 0
+
+    def test_compute_pseudo_header_sum(self):
+        """
+        GIVEN IPv4 and IPv6 headers
+        WHEN the sum of the pseudo-header for an upper-layer protocol
+            is computed
+        THEN it must match the sum of the explicitly built pseudo-header
+        """
+        ipv4 = IPv4(version=4, ihl=5, dscp=0, ecp=0, len=28, id=0, flags=0,
+                    offset=0, ttl=64, proto=0x11, chksum=0,
+                    src="10.0.0.1", dst="10.0.0.2")
+        ipv6 = IPv6(version=6, tclass=0, flabel=0, payload_len=8,
+                    next_header=0x11, hop_limit=64,
+                    src="fe80::1", dst="ff02::1")
+
+        assert pseudo_header_sum(ipv4, 0x11, 8) == ones_complement_sum(
+            b"\x0a\x00\x00\x01\x0a\x00\x00\x02\x00\x11\x00\x08")
+        assert pseudo_header_sum(ipv6, 0x11, 8) == ones_complement_sum(
+            bytes(ipv6._src) + bytes(ipv6._dst) +
+            b"\x00\x00\x00\x08\x00\x00\x00\x11")
+
+    def test_incremental_update(self, random_buffers):
+        """
+        GIVEN buffers covered by a checksum
+        WHEN a 16-bit aligned part of each buffer changes
+        THEN updating the checksum as in RFC 1624 must give the same
+            result as recomputing it
+        """
+        generator = random.Random(1624)
+        for data in random_buffers:
+            if len(data) < 4:
+                continue
+            data = bytearray(data[:len(data) // 2 * 2])
+            chksum = internet_checksum(data)
+            offset = generator.randrange(0, len(data) - 2, 2)
+            old = bytes(data[offset:offset + 4])
+            new = bytes(generator.getrandbits(8) for _ in range(len(old)))
+            data[offset:offset + len(old)] = new
+
+            assert incremental_update(chksum, old, new) == \
+                internet_checksum(data)
+
+    def test_incremental_update_ttl(self, raw_ipv4_header):
+        """
+        GIVEN an IPv4 header with a correct checksum
+        WHEN the TTL of this header is decremented
+        THEN updating the checksum from the word holding the TTL must
+            keep the header valid
+        """
+        ipv4_header = IPv4.decode(raw_ipv4_header)
+        ipv4_header.chksum = ipv4_header.compute_chksum()
+        old_word = ipv4_header.ttl << 8 | ipv4_header.proto
+        ipv4_header.ttl -= 1
+        ipv4_header.chksum = incremental_update(
+            ipv4_header.chksum, old_word,
+            ipv4_header.ttl << 8 | ipv4_header.proto)
+
+        assert ipv4_header.verify_chksum()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import ARP, Ethernet, IPv4, IPv6, Packet, TCP, dissect
+
+import pytest
+
+
+@pytest.fixture
+def raw_tcp_frame(raw_ipv4_header):
+    return b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54\x08\x00" + \
+           raw_ipv4_header + \
+           b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x50\x18\x21" \
+           b"\x5c\x20\x08\x00\x00"
+
+
+class TestDissector:
+    def test_dissect_arp_frame(self, raw_eth_header, raw_arp_header):
+        """
+        GIVEN a byte-string representation of an Ethernet frame
+            carrying an ARP packet
+        WHEN this frame is dissected
+        THEN an instance of Packet containing 'ethernet' and 'arp' as
+            attributes must be returned
+        """
+        packet = dissect(raw_eth_header + raw_arp_header)
+
+        assert isinstance(packet, Packet)
+        assert isinstance(packet.ethernet, Ethernet)
+        assert packet.arp.spa == "24.166.172.1"
+        assert not hasattr(packet, "ipv4")
+
+    def test_dissect_tcp_frame(self, raw_tcp_frame):
+        """
+        GIVEN a byte-string representation of an Ethernet frame
+            carrying an IPv4 packet and a TCP segment
+        WHEN this frame is dissected
+        THEN an instance of Packet containing 'ethernet', 'ipv4' and
+            'tcp' as attributes must be returned
+        """
+        packet = dissect(raw_tcp_frame)
+
+        assert packet.ethernet.src == "00:07:0d:af:f4:54"
+        assert isinstance(packet.ipv4, IPv4)
+        assert packet.ipv4.dst == "192.168.1.254"
+        assert isinstance(packet.tcp, TCP)
+        assert packet.tcp.sport == 1022
+        assert packet.tcp.dport == 22
+
+    def test_dissect_tcp_frame_zero_copy(self, raw_tcp_frame):
+        """
+        GIVEN a writable buffer holding an Ethernet frame
+        WHEN this frame is dissected in zero-copy mode
+        THEN every header must be mapped onto the buffer
+        """
+        frame = bytearray(raw_tcp_frame)
+        packet = dissect(memoryview(frame), zero_copy=True)
+        frame[34:36] = b"\x00\x50"
+
+        assert packet.tcp.sport == 80
+
+    def test_dissect_copies_frame_once(self, raw_tcp_frame):
+        """
+        GIVEN a writable buffer holding an Ethernet frame
+        WHEN this frame is dissected without zero-copy mode
+        THEN the frame must be copied once into bytes shared by every
+            header keeping it, unaffected by later changes to the buffer
+        """
+        frame = bytearray(raw_tcp_frame)
+        packet = dissect(frame)
+        frame[:] = bytes(len(frame))
+
+        kept = {id(layer._packet) for layer in
+                (packet.ethernet, packet.ipv4, packet.tcp)}
+        assert len(kept) == 1
+        assert type(packet.tcp._packet) is bytes
+        assert bytes(packet.ethernet.view(0)) == raw_tcp_frame
+        assert packet.tcp.sport == 1022
+
+    def test_dissect_truncated_frame(self, raw_tcp_frame):
+        """
+        GIVEN a byte-string representation of an Ethernet frame
+        WHEN this frame is truncated in the middle of the TCP header
+        THEN dissection must stop at the last complete header
+        """
+        packet = dissect(raw_tcp_frame[:40])
+
+        assert isinstance(packet.ipv4, IPv4)
+        assert not hasattr(packet, "tcp")
+
+    @pytest.mark.parametrize("flags_offset, ihl", [
+        (b"\x20\xb9", 0x45),   # Fragment at offset 1480
+        (b"\x00\xb9", 0x45),   # Last fragment
+        (b"\x40\x00", 0x42),   # Header length of 8 bytes
+    ], ids=["fragment", "last fragment", "invalid ihl"])
+    def test_dissect_without_transport_header(self, raw_tcp_frame,
+                                              flags_offset, ihl):
+        """
+        GIVEN an IPv4 packet that is not the first fragment of its
+            datagram or whose header length is below 20 bytes
+        WHEN the frame carrying it is dissected
+        THEN dissection must stop at the IPv4 header
+        """
+        frame = bytearray(raw_tcp_frame)
+        frame[14], frame[20:22] = ihl, flags_offset
+        packet = dissect(frame)
+
+        assert isinstance(packet.ipv4, IPv4)
+        assert not hasattr(packet, "tcp")
+
+    @pytest.mark.parametrize("length", [0, 1, 13])
+    def test_dissect_runt_frame(self, raw_tcp_frame, length):
+        """
+        GIVEN a frame shorter than an Ethernet header
+        WHEN this frame is dissected
+        THEN an instance of Packet without layers must be returned
+        """
+        packet = dissect(raw_tcp_frame[:length], zero_copy=True)
+
+        assert isinstance(packet, Packet)
+        assert not hasattr(packet, "ethernet")
+        assert packet.offsets == {}
+        assert bytes(packet) == b""
+
+    def test_dissect_padded_frame(self, raw_tcp_frame):
+        """
+        GIVEN an Ethernet frame padded after the IPv4 packet it carries
+        WHEN this frame is dissected
+        THEN the payload of the TCP segment must end with the IPv4
+            packet, excluding the padding
+        """
+        frame = bytearray(raw_tcp_frame + b"hi" + bytes(4))
+        frame[16:18] = (42).to_bytes(2, "big")
+        packet = dissect(frame)
+
+        assert packet.ipv4.payload == bytes(raw_tcp_frame[34:]) + b"hi"
+        assert packet.tcp.payload == b"hi"
+        assert packet.tcp.options == b""
+
+    def test_dissect_ipv6_extension_headers(self, raw_tcp_frame):
+        """
+        GIVEN an Ethernet frame carrying an IPv6 packet with a Hop-by-Hop
+            Options header before a TCP segment
+        WHEN this frame is dissected
+        THEN the TCP segment must be decoded past the extension header
+        """
+        segment = raw_tcp_frame[34:] + b"hi"
+        ipv6 = IPv6(version=6, tclass=0, flabel=0,
+                    payload_len=8 + len(segment), next_header=0x00,
+                    hop_limit=64, src="fe80::1", dst="fe80::2")
+        frame = raw_tcp_frame[:12] + b"\x86\xdd" + bytes(ipv6) + \
+            b"\x06\x00\x01\x04\x00\x00\x00\x00" + segment
+        packet = dissect(frame)
+
+        assert packet.ipv6.encapsulated_proto == "TCP"
+        assert packet.tcp.dport == 22
+        assert packet.tcp.payload == b"hi"
+
+    @pytest.mark.parametrize("frame, layers", [
+        (b"\x46\x00\x00\x38" + b"\xec\x6c\x40\x00\x40\x06\x2b\x51"
+         b"\xc0\xa8\x01\x60\xc0\xa8\x01\xfe\x01\x01\x01\x00" +
+         b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x70\x18"
+         b"\x21\x5c\x20\x08\x00\x00\x01\x01\x08\x0a\x00\x08\xca\x61"
+         b"\x00\x01\x69\x2e" + b"hi" + bytes(2),
+         ["Ethernet", "IPv4", "IPv4Options", "TCP", "SegmentOptions",
+          "Payload", "Padding"]),
+        (b"\x45\x00\x00\x1e\xec\x6c\x00\x10\x40\x06\x2b\x51"
+         b"\xc0\xa8\x01\x60\xc0\xa8\x01\xfe" + b"datagram" + bytes(20),
+         ["Ethernet", "IPv4", "Payload", "Padding"]),
+        (b"\x45\x00\x00\x28\xec\x6c\x40\x00\x40\x06\x2b\x51"
+         b"\xc0\xa8\x01\x60\xc0\xa8\x01\xfe\x03\xfe\x00\x16",
+         ["Ethernet", "IPv4", "Payload"]),
+    ], ids=["options-payload-padding", "fragment", "truncated"])
+    def test_dissect_round_trip(self, raw_tcp_frame, frame, layers):
+        """
+        GIVEN an Ethernet frame carrying IP options, TCP options, a
+            payload, padding or a header truncated by the end of the
+            frame
+        WHEN this frame is dissected
+        THEN every byte that no header decodes must be kept as a raw
+            layer, so that the packet serializes back to the frame
+        """
+        frame = raw_tcp_frame[:14] + frame
+        packet = dissect(frame)
+
+        assert [type(layer).__name__ for layer in packet.layers] == layers
+        assert bytes(packet) == frame
+        assert len(packet) == len(frame)
+
+    def test_dissect_zero_copy_without_payload(self, raw_tcp_frame):
+        """
+        GIVEN a writable Ethernet frame carrying a TCP segment with a
+            payload, followed by padding
+        WHEN this frame is dissected in zero-copy mode
+        THEN neither the payload nor the padding must be copied into
+            raw layers, the payload remaining readable through the
+            TCP header
+        """
+        frame = bytearray(raw_tcp_frame + b"hi" + bytes(4))
+        frame[16:18] = (42).to_bytes(2, "big")
+        packet = dissect(frame, zero_copy=True)
+
+        assert not hasattr(packet, "payload")
+        assert not hasattr(packet, "padding")
+        assert packet.tcp.payload == b"hi"
+        assert bytes(packet) == frame[:54]
+
+    def test_dissect_ipv6_round_trip(self, raw_tcp_frame):
+        """
+        GIVEN an Ethernet frame carrying an IPv6 packet with an extension
+            header and a TCP segment, followed by padding
+        WHEN this frame is dissected
+        THEN the extension header, payload and padding must be kept as
+            raw layers
+        """
+        segment = raw_tcp_frame[34:] + b"hi"
+        ipv6 = IPv6(version=6, tclass=0, flabel=0,
+                    payload_len=8 + len(segment), next_header=0x00,
+                    hop_limit=64, src="fe80::1", dst="fe80::2")
+        frame = raw_tcp_frame[:12] + b"\x86\xdd" + bytes(ipv6) + \
+            b"\x06\x00\x01\x04\x00\x00\x00\x00" + segment + bytes(4)
+        packet = dissect(frame)
+
+        assert bytes(packet) == frame
+        assert packet.extensionheaders == frame[54:62]
+        assert packet.payload == b"hi"
+        assert packet.padding == bytes(4)
+
+    def test_dissect_vlan_tagged_frame(self, raw_tcp_frame):
+        """
+        GIVEN an Ethernet frame carrying an IPv4 packet and a TCP segment
+            behind two stacked VLAN tags
+        WHEN this frame is dissected
+        THEN the IPv4 and TCP headers must be decoded past the tags
+        """
+        frame = raw_tcp_frame[:12] + b"\x88\xa8\x00\x64\x81\x00\x00\x0a" + \
+            raw_tcp_frame[12:]
+        packet = dissect(frame)
+
+        assert packet.ethernet.tags.vlan[1].vid == 10
+        assert packet.ipv4.dst == "192.168.1.254"
+        assert packet.tcp.dport == 22
+
+    @pytest.mark.parametrize("tags", [
+        b"\x81\x00\x00\x0a\x08\x00",
+        b"\x88\xa8\x00\x64\x81\x00\x00\x0a\x08\x00",
+        b"\x88\x47\x00\x3e\x80\x40\x00\x3e\x91\x3f",
+    ], ids=["802.1Q", "QinQ", "MPLS"])
+    def test_tagged_frame_round_trip(self, raw_tcp_frame, tags):
+        """
+        GIVEN an Ethernet frame carrying an IPv4 packet and a TCP segment
+            behind VLAN tags or an MPLS label stack
+        WHEN it is dissected, serialized and dissected again
+        THEN the tags must be kept as a layer of the packet, so that the
+            frame and the offsets of its headers are preserved
+        """
+        frame = raw_tcp_frame[:12] + tags + raw_tcp_frame[14:]
+        packet = dissect(frame)
+        offset = 12 + len(tags)
+
+        assert bytes(packet) == frame
+        assert packet.tags == frame[14:offset]
+        assert packet.offsets == {"ethernet": 0, "tags": 14,
+                                  "ipv4": offset, "tcp": offset + 20}
+        assert [type(layer).__name__ for layer in
+                dissect(bytes(packet)).layers] == \
+            ["Ethernet", "Tags", "IPv4", "TCP"]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from array import array
+
+from netprotocols import IPv4, TCP
+from netprotocols.base.layout import Layout
+
+import pytest
+
+
+@pytest.fixture
+def raw_tcp_header():
+    return b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x80\x18\x21\x5c" \
+           b"\x20\x08\x00\x00"
+
+
+class TestLayout:
+    def test_read_bitfield_positions(self):
+        """
+        GIVEN a protocol declaring bitfields in its _fields_
+        WHEN the layout of this protocol is read
+        THEN the storage unit and bit position of each bitfield must
+            match the big-endian wire format
+        """
+        fields = {field.name: field for field in Layout.of(IPv4).fields}
+
+        assert fields["version"][1:5] == (0, 1, 4, 4)
+        assert fields["ihl"][1:5] == (0, 1, 0, 4)
+        assert fields["flags"][1:5] == (6, 2, 13, 3)
+        assert fields["offset"][1:5] == (6, 2, 0, 13)
+        assert fields["src"].length == 4
+        assert Layout.of(IPv4).struct.size == 20
+
+    def test_decode_many_ipv4_headers(self, raw_eth_header, raw_ipv4_header):
+        """
+        GIVEN a sequence of frames carrying IPv4 packets
+        WHEN the IPv4 headers of these frames are decoded in a batch
+        THEN each field must be returned as an array.array holding its
+            value for every frame
+        """
+        frames = [raw_eth_header + raw_ipv4_header] * 3
+        columns = IPv4.decode_many(frames, offset=len(raw_eth_header))
+
+        assert isinstance(columns["ttl"], array)
+        assert columns["version"].tolist() == [4, 4, 4]
+        assert columns["ihl"].tolist() == [5, 5, 5]
+        assert columns["flags"].tolist() == [2, 2, 2]
+        assert columns["id"].tolist() == [0xec6c] * 3
+        assert columns["src"].tobytes() == b"\xc0\xa8\x01\x60" * 3
+
+    def test_decode_many_in_chunks(self, raw_tcp_header, monkeypatch):
+        """
+        GIVEN a sequence of TCP headers longer than the chunk size
+        WHEN these headers are decoded in a batch
+        THEN every header must be decoded
+        """
+        monkeypatch.setattr(Layout, "chunk_size", 2)
+        columns = TCP.decode_many(iter([raw_tcp_header] * 5))
+
+        assert columns["offset"].tolist() == [8] * 5
+        assert columns["flags"].tolist() == [0x018] * 5
+        assert columns["seq"].tolist() == [3598120561] * 5
+
+    def test_decode_many_selected_fields(self, raw_tcp_header):
+        """
+        GIVEN a sequence of TCP headers
+        WHEN these headers are decoded in a batch restricted to some
+            fields
+        THEN only the selected fields must be returned
+        """
+        columns = TCP.decode_many([raw_tcp_header] * 2,
+                                  fields=["dport", "flags"])
+
+        assert list(columns) == ["dport", "flags"]
+        assert columns["dport"].tolist() == [22, 22]
+        with pytest.raises(AttributeError):
+            TCP.decode_many([raw_tcp_header], fields=["src"])
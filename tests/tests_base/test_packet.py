@@ -3,7 +3,16 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
-from netprotocols import ARP, Ethernet, Packet
+import copy
+import pickle
+
+from netprotocols import ARP, Ethernet, Packet, dissect
+
+import pytest
+
+TCP_SEGMENT = b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x80\x18" \
+              b"\x21\x5c\x20\x08\x00\x00\x01\x01\x08\x0a\x00\x08\xca\x61" \
+              b"\x00\x01\x69\x2e"
 
 
 class TestPacket:
@@ -25,3 +34,79 @@ class TestPacket:
         assert isinstance(packet.arp, ARP)
         assert len(bytes(packet)) == len(bytes(packet.ethernet)) + \
                len(bytes(packet.arp))  # Total length == 42
+
+    def test_packet_is_slotted(self, mock_eth_header, mock_arp_header):
+        """
+        GIVEN an instance of Packet
+        WHEN an attribute that is not a protocol is set
+        THEN an AttributeError exception must be raised and the packet
+            must have no instance dictionary
+        """
+        packet = Packet(mock_eth_header, mock_arp_header)
+
+        with pytest.raises(AttributeError):
+            packet.payload = b""
+        assert not hasattr(packet, "__dict__")
+
+    def test_replace_layer_keeps_position(self, mock_eth_header,
+                                          mock_arp_header):
+        """
+        GIVEN an instance of Packet containing Ethernet and ARP headers
+        WHEN the Ethernet header is replaced
+        THEN it must be serialized at its original position
+        """
+        packet = Packet(mock_eth_header, mock_arp_header)
+        eth = Ethernet.decode(bytes(mock_eth_header))
+        eth.src = "00:00:5e:00:53:01"
+        packet.Ethernet = eth
+
+        assert packet.layers == [eth, mock_arp_header]
+        assert packet.offsets == {"ethernet": 0, "arp": 14}
+        assert bytes(packet) == bytes(eth) + bytes(mock_arp_header)
+
+    def test_pack_into(self, mock_eth_header, mock_arp_header):
+        """
+        GIVEN an instance of Packet containing Ethernet and ARP headers
+        WHEN it is packed into a larger buffer at an offset
+        THEN the headers must be written contiguously at that offset and
+            the offset after the last header must be returned
+        """
+        packet = Packet(mock_eth_header, mock_arp_header)
+        buffer = bytearray(len(packet) + 8)
+
+        assert len(packet) == 42
+        assert packet.pack_into(buffer, 4) == 46
+        assert buffer[4:46] == bytes(mock_eth_header) + bytes(mock_arp_header)
+        assert buffer[:4] == buffer[46:] == bytes(4)
+
+    def test_pack_into_short_buffer(self, mock_eth_header):
+        """
+        GIVEN an instance of Packet
+        WHEN it is packed into a buffer too short to hold it
+        THEN a ValueError exception must be raised
+        """
+        with pytest.raises(ValueError):
+            Packet(mock_eth_header).pack_into(bytearray(10))
+
+    @pytest.mark.parametrize("duplicate", [
+        copy.copy, copy.deepcopy, lambda packet: pickle.loads(
+            pickle.dumps(packet))
+    ], ids=["copy", "deepcopy", "pickle"])
+    def test_copy_and_pickle(self, raw_eth_header, raw_ipv4_header,
+                             duplicate):
+        """
+        GIVEN a packet dissected from a frame carrying a VLAN tag and a
+            TCP segment with options
+        WHEN it is copied or pickled and loaded again
+        THEN the duplicate must hold the same layers, serialize to the
+            same bytes and keep the options of the segment
+        """
+        frame = raw_eth_header[:12] + b"\x81\x00\x00\x0a\x08\x00" + \
+            raw_ipv4_header[:2] + b"\x00\x34" + raw_ipv4_header[4:] + \
+            TCP_SEGMENT
+        packet = dissect(frame)
+        duplicate = duplicate(packet)
+
+        assert bytes(duplicate) == bytes(packet)
+        assert duplicate.offsets == packet.offsets
+        assert duplicate.tcp.options == TCP_SEGMENT[20:]
@@ -6,7 +6,7 @@ __author__ = "EONRaider @ keybase.io/eonraider"
 from ctypes import Array, c_ubyte
 from socket import AF_INET6
 
-from netprotocols import Protocol
+from netprotocols import IPv4, Protocol
 
 import pytest
 
@@ -143,3 +143,40 @@ class TestProtocol:
 
         assert Protocol.array_to_proto_addr(
             addr_array, AF_INET6) == ipv6_addr_string
+
+    def test_decode_raw_packet_at_offset(self, raw_eth_header,
+                                         raw_ipv4_header):
+        """
+        GIVEN a frame containing more than one protocol header
+        WHEN a header is decoded at its byte offset within the frame
+        THEN an instance of Protocol must hold the bytes found at that
+            offset without requiring the frame to be sliced
+        """
+        frame = raw_eth_header + raw_ipv4_header
+        ipv4_header = IPv4.decode(frame, len(raw_eth_header))
+
+        assert bytes(ipv4_header) == raw_ipv4_header
+
+    def test_decode_raw_packet_zero_copy(self, raw_ipv4_header):
+        """
+        GIVEN a writable buffer holding a network protocol header
+        WHEN this header is decoded in zero-copy mode
+        THEN the instance of Protocol must be mapped onto the buffer so
+            that changes to either one are seen by the other
+        """
+        buffer = bytearray(raw_ipv4_header)
+        ipv4_header = IPv4.decode(memoryview(buffer), zero_copy=True)
+
+        buffer[0] = 0x00
+        assert bytes(ipv4_header)[0] == 0x00
+        with pytest.raises(BufferError):
+            buffer.extend(b"\x00")
+
+    def test_decode_read_only_packet_zero_copy(self, raw_ipv4_header):
+        """
+        GIVEN a read-only buffer holding a network protocol header
+        WHEN this header is decoded in zero-copy mode
+        THEN a TypeError must be raised
+        """
+        with pytest.raises(TypeError):
+            Protocol.decode(raw_ipv4_header, zero_copy=True)
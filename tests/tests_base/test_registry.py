@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from ctypes import c_uint16
+
+from netprotocols import Ethernet, IPv4, Packet, Protocol, TCP, dissect
+from netprotocols.base.registry import ProtocolRegistry, registry
+
+import pytest
+
+
+class TestRegistry:
+    def test_builtin_protocols(self):
+        """
+        GIVEN the protocols implemented by the package
+        WHEN they are looked up in the registry
+        THEN each must be found by name, Ethertype or IP protocol number
+            including those that subclass Protocol indirectly
+        """
+        assert "IPv4" in registry
+        assert registry.by_name("IPv4") is IPv4
+        assert registry.by_ethertype(0x0800) is IPv4
+        assert registry.by_protocol_number(0x06) is TCP
+        assert registry.by_ethertype(0x88b5) is None
+
+    def test_register(self):
+        """
+        GIVEN an empty registry
+        WHEN a protocol declaring an Ethertype is registered
+        THEN it must be found by name and Ethertype only
+        """
+        local_registry = ProtocolRegistry()
+        local_registry.register(IPv4)
+
+        assert list(local_registry) == [IPv4]
+        assert local_registry.by_ethertype(0x0800) is IPv4
+        assert local_registry.by_protocol_number(0x04) is None
+
+    def test_user_defined_protocol(self, raw_eth_header):
+        """
+        GIVEN a protocol defined by the user with its own Ethertype
+        WHEN it is defined as an indirect subclass of Protocol
+        THEN it must be registered, named by Ethernet as the protocol it
+            encapsulates, accepted by Packet and decoded by dissect
+        """
+        class Tagged(Protocol):
+            _fields_ = [("value", c_uint16)]
+
+        class Experimental(Tagged):
+            header_len = 2
+            ethertype = 0x88b5
+
+        frame = raw_eth_header[:12] + b"\x88\xb5" + b"\x12\x34"
+        packet = dissect(frame)
+
+        assert registry.by_ethertype(0x88b5) is Experimental
+        assert Ethernet.decode(frame).encapsulated_proto == "Experimental"
+        assert packet.experimental.value == 0x1234
+
+    def test_packet_rejects_unregistered_protocol(self):
+        """
+        GIVEN an object that is not a registered protocol
+        WHEN it is used to build a Packet
+        THEN an AttributeError exception must be raised
+        """
+        with pytest.raises(AttributeError):
+            Packet(object())
+
+    def test_protocol_base_class_not_registered(self):
+        """
+        GIVEN the Protocol base class
+        WHEN it is looked up in the registry
+        THEN it must not be found
+        """
+        assert "Protocol" not in registry
+        assert issubclass(IPv4, Protocol)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import (
+    Ethernet,
+    IPv4,
+    Packet,
+    PacketTemplate,
+    TCP,
+    UDP,
+    dissect
+)
+
+import pytest
+
+
+@pytest.fixture
+def udp_packet(mock_eth_header, raw_ipv4_header):
+    ip = IPv4.decode(raw_ipv4_header)
+    ip.proto, ip.len = 0x11, 28
+    ip.chksum = ip.compute_chksum()
+    udp = UDP(sport=2398, dport=53, len=8, chksum=0)
+    udp.chksum = udp.compute_chksum(ip)
+    eth = Ethernet.decode(bytes(mock_eth_header))
+    eth.eth = 0x0800
+    return Packet(eth, ip, udp)
+
+
+class TestPacketTemplate:
+    def test_template_bytes(self, udp_packet):
+        """
+        GIVEN an instance of Packet
+        WHEN a template is built from it
+        THEN the template must hold the serialized packet
+        """
+        template = PacketTemplate(udp_packet)
+
+        assert bytes(template) == bytes(udp_packet)
+        assert len(template) == 42
+
+    def test_set_fields_fixes_checksums(self, udp_packet):
+        """
+        GIVEN a template built from an Ethernet/IPv4/UDP packet
+        WHEN ports, bitfields and addresses are set on the template
+        THEN the fields must be written in the frame and the checksums
+            of the IPv4 header and of the UDP datagram, which covers the
+            IPv4 addresses through the pseudo-header, must be correct
+        """
+        template = PacketTemplate(udp_packet)
+        template.update({"udp.sport": 40000,
+                         "ipv4.ttl": 17,
+                         "ipv4.dscp": 46,
+                         "ipv4.flags": 0,
+                         "ipv4.src": "10.0.0.1",
+                         "ipv4.dst": b"\x0a\x00\x00\x02",
+                         "ethernet.src": "00:00:5e:00:53:01"})
+        packet = dissect(bytes(template))
+
+        assert packet.ethernet.src == "00:00:5e:00:53:01"
+        assert packet.ipv4.ttl == 17
+        assert packet.ipv4.dscp == 46
+        assert packet.ipv4.flags == 0
+        assert packet.ipv4.src == "10.0.0.1"
+        assert packet.ipv4.dst == "10.0.0.2"
+        assert packet.ipv4.verify_chksum()
+        assert packet.udp.sport == 40000
+        assert packet.udp.verify_chksum(packet.ipv4)
+
+    def test_udp_checksum_zero(self, udp_packet):
+        """
+        GIVEN a template of a UDP datagram carrying no checksum
+        WHEN the source port is set
+        THEN the checksum of the datagram must remain zero
+        """
+        udp_packet.udp.chksum = 0
+        template = PacketTemplate(udp_packet)
+        template["udp.sport"] = 1
+
+        assert dissect(bytes(template)).udp.chksum == 0
+
+    def test_frames(self, udp_packet):
+        """
+        GIVEN a template of a packet
+        WHEN frames are generated for a range of values of a field
+        THEN one frame with a correct checksum must be yielded per value
+        """
+        template = PacketTemplate(udp_packet)
+        ports = []
+        for frame in template.frames({"udp.dport": range(1000, 1010),
+                                      "ipv4.id": range(10)}):
+            packet = dissect(bytes(frame))
+            assert packet.ipv4.verify_chksum()
+            assert packet.udp.verify_chksum(packet.ipv4)
+            ports.append(packet.udp.dport)
+
+        assert ports == list(range(1000, 1010))
+
+    def test_set_tcp_flags(self, mock_eth_header, raw_ipv4_header):
+        """
+        GIVEN a template of a TCP segment
+        WHEN a bitfield sharing a word with others is set
+        THEN the other fields must be preserved and the checksum fixed
+        """
+        ip = IPv4.decode(raw_ipv4_header)
+        tcp = TCP(sport=1022, dport=22, seq=1, ack=2, offset=5,
+                  reserved=0, flags=0x018, window=8540, chksum=0, urg=0)
+        tcp.chksum = tcp.compute_chksum(ip)
+        template = PacketTemplate(Packet(mock_eth_header, ip, tcp))
+        template["tcp.flags"] = 0x002
+        tcp = TCP.decode(bytes(template), 34)
+
+        assert (tcp.offset, tcp.flags) == (5, 0x002)
+        assert tcp.verify_chksum(ip)
+
+    def test_set_address_past_raw_layers(self, raw_eth_header,
+                                         raw_ipv4_header):
+        """
+        GIVEN a template of a packet dissected from a frame carrying an
+            IPv4 header with options and a TCP segment with options and
+            a payload
+        WHEN the source address of the IPv4 header is set
+        THEN the checksum of the segment must be fixed past the options
+        """
+        ip = IPv4.decode(raw_ipv4_header)
+        ip.ihl, ip.len = 6, 58
+        tcp = TCP(sport=1022, dport=22, seq=1, ack=2, offset=8,
+                  reserved=0, flags=0x018, window=8540, chksum=0, urg=0)
+        options = b"\x01\x01\x08\x0a\x00\x08\xca\x61\x00\x01\x69\x2e"
+        tcp.chksum = tcp.compute_chksum(ip, options + b"hi")
+        frame = raw_eth_header[:12] + b"\x08\x00" + bytes(ip) + \
+            b"\x01\x01\x01\x00" + bytes(tcp) + options + b"hi"
+        template = PacketTemplate(dissect(frame))
+        template["ipv4.src"] = "10.0.0.1"
+        ip = IPv4.decode(bytes(template), 14)
+        tcp = TCP.decode(bytes(template), 38)
+
+        assert bytes(template)[58:] == options + b"hi"
+        assert tcp.verify_chksum(ip, options + b"hi")
+
+    def test_unknown_layer(self, udp_packet):
+        """
+        GIVEN a template of a packet
+        WHEN a field of a layer absent from the packet is set
+        THEN an AttributeError exception must be raised
+        """
+        with pytest.raises(AttributeError):
+            PacketTemplate(udp_packet)["tcp.sport"] = 1
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols.base.timerwheel import TimerWheel
+
+
+class TestTimerWheel:
+    def test_entries_due_by_tick(self):
+        """
+        GIVEN a timer wheel holding entries scheduled at several
+            deadlines
+        WHEN the wheel is advanced past some of these deadlines
+        THEN only the entries whose tick was passed must be returned,
+            each of them once
+        """
+        wheel = TimerWheel(slots=8, tick=1.0)
+        wheel.advance(0.0)
+        wheel.schedule("a", 1.5)
+        wheel.schedule("b", 2.2)
+        wheel.schedule("c", 5.0)
+
+        assert wheel.advance(0.9) == []
+        assert sorted(wheel.advance(2.5)) == ["a", "b"]
+        assert wheel.advance(2.9) == []
+        assert wheel.advance(6.0) == ["c"]
+
+    def test_deadline_in_the_past(self):
+        """
+        GIVEN a timer wheel advanced to a given time
+        WHEN an entry is scheduled at a deadline already passed
+        THEN the entry must be returned at the next tick
+        """
+        wheel = TimerWheel(slots=4, tick=1.0)
+        wheel.advance(10.0)
+        wheel.schedule(("10.0.0.1", 80), 3.0)
+
+        assert wheel.advance(10.5) == []
+        assert wheel.advance(11.0) == [("10.0.0.1", 80)]
+
+    def test_advance_beyond_a_revolution(self):
+        """
+        GIVEN a timer wheel holding entries in every slot
+        WHEN it is advanced by more ticks than it has slots
+        THEN every slot must be visited once and emptied
+        """
+        wheel = TimerWheel(slots=4, tick=1.0)
+        wheel.advance(0.0)
+        for entry in range(1, 5):
+            wheel.schedule(entry, entry)
+
+        assert sorted(wheel.advance(100.0)) == [1, 2, 3, 4]
+        assert wheel.slots == [set()] * 4
+        assert wheel.current == 100
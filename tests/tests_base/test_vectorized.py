@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from netprotocols import IPv4, TCP
+from netprotocols.base import vectorized
+
+
+@pytest.fixture
+def raw_tcp_header():
+    return b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x80\x18\x21\x5c" \
+           b"\x20\x08\x00\x00"
+
+
+class TestVectorized:
+    def test_build_ipv4_dtype(self):
+        """
+        GIVEN the IPv4 protocol
+        WHEN a structured dtype is derived from its _fields_
+        THEN bitfields must share big-endian storage units and the
+            itemsize must match the length of the header
+        """
+        dtype = vectorized.dtype(IPv4)
+
+        assert dtype.itemsize == 20
+        assert dtype.names[:3] == ("version_ihl", "dscp_ecp", "len")
+        assert dtype["flags_offset"] == np.dtype(">u2")
+        assert dtype["src"].shape == (4,)
+
+    def test_parse_strided_ipv4_headers(self, raw_eth_header,
+                                        raw_ipv4_header):
+        """
+        GIVEN a contiguous buffer of frames of equal length
+        WHEN the IPv4 headers in this buffer are parsed at a fixed
+            stride
+        THEN the values of every field, including bitfields, must be
+            extracted for each header
+        """
+        frame = raw_eth_header + raw_ipv4_header
+        records = vectorized.frombuffer(IPv4, frame * 3,
+                                        offset=len(raw_eth_header),
+                                        stride=len(frame))
+
+        assert len(records) == 3
+        assert vectorized.field(records, IPv4, "version").tolist() == [4] * 3
+        assert vectorized.field(records, IPv4, "ihl").tolist() == [5] * 3
+        assert vectorized.field(records, IPv4, "flags").tolist() == [2] * 3
+        assert vectorized.field(records, IPv4, "offset").tolist() == [0] * 3
+        assert vectorized.field(records, IPv4, "len").tolist() == [40] * 3
+        assert bytes(vectorized.field(records, IPv4, "dst")[0]) == \
+            b"\xc0\xa8\x01\xfe"
+
+    def test_parse_tcp_header_columns(self, raw_tcp_header):
+        """
+        GIVEN a contiguous buffer of TCP headers
+        WHEN every field of these headers is extracted
+        THEN the values must match those decoded by TCP.decode
+        """
+        records = vectorized.frombuffer(TCP, raw_tcp_header * 2)
+        columns = vectorized.columns(records, TCP)
+        tcp_header = TCP.decode(raw_tcp_header)
+
+        for name, values in columns.items():
+            assert values.tolist() == [getattr(tcp_header, name)] * 2
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import Ethernet, IPv6, PacketFilter, UDP
+
+import pytest
+
+TCP_SEGMENT = b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x50\x18" \
+              b"\x21\x5c\x20\x08\x00\x00"
+
+
+@pytest.fixture
+def tcp_frame(raw_ipv4_header):
+    """IPv4 from 192.168.1.96 to 192.168.1.254, TCP from port 1022 to
+    port 22 with the PSH and ACK flags set."""
+    return b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54\x08\x00" + \
+        raw_ipv4_header + TCP_SEGMENT
+
+
+@pytest.fixture
+def arp_frame(raw_eth_header, raw_arp_header):
+    return raw_eth_header + raw_arp_header
+
+
+@pytest.fixture
+def udp6_frame():
+    """IPv6 from fe80::1 to fe80::2, UDP from port 5353 to port 53."""
+    eth = Ethernet(dst="00:1e:68:51:4f:a9", src="00:07:0d:af:f4:54",
+                   eth=0x86dd)
+    ip = IPv6(version=6, tclass=0, flabel=0, payload_len=8,
+              next_header=0x11, hop_limit=255, src="fe80::1", dst="fe80::2")
+    return bytes(eth) + bytes(ip) + bytes(UDP(sport=5353, dport=53, len=8,
+                                              chksum=0))
+
+
+class TestPacketFilter:
+    @pytest.mark.parametrize("expression, tcp, arp, udp6", [
+        ("", True, True, True),
+        ("ip", True, False, False),
+        ("ip6 or arp", False, True, True),
+        ("not arp", True, False, True),
+        ("tcp", True, False, False),
+        ("udp", False, False, True),
+        ("ip and tcp dst port 22", True, False, False),
+        ("tcp dst port 1022", False, False, False),
+        ("port 53", False, False, True),
+        ("src or dst port 1022", True, False, False),
+        ("src and dst port 22", False, False, False),
+        ("host 192.168.1.254", True, False, False),
+        ("src host 192.168.1.254", False, False, False),
+        ("dst host fe80::2", False, False, True),
+        ("net 192.168.0.0/16 and not net 10.0.0.0/8", True, False, False),
+        ("ip6 net fe80::/10", False, False, True),
+        ("ether dst host 00:1e:68:51:4f:a9", True, False, True),
+        ("tcp.flags & 0x18 == 0x18", True, False, False),
+        ("ipv4.ttl >= 64 && !(udp || arp)", True, False, False),
+        ("arp.oper = 1", False, True, False),
+    ])
+    def test_expressions(self, tcp_frame, arp_frame, udp6_frame,
+                         expression, tcp, arp, udp6):
+        """
+        GIVEN a filter expression
+        WHEN it is compiled and evaluated on the raw bytes of IPv4/TCP,
+            ARP and IPv6/UDP frames
+        THEN only the matching frames must be accepted
+        """
+        packet_filter = PacketFilter(expression)
+
+        assert packet_filter(tcp_frame) is tcp
+        assert packet_filter(arp_frame) is arp
+        assert packet_filter(udp6_frame) is udp6
+        assert packet_filter(memoryview(tcp_frame)) is tcp
+
+    def test_ipv4_options(self, tcp_frame):
+        """
+        GIVEN a frame whose IPv4 header carries 4 bytes of options
+        WHEN a filter tests the ports of its TCP segment
+        THEN the segment must be located after the options
+        """
+        frame = bytearray(tcp_frame[:34]) + b"\x01\x01\x01\x00" + \
+            TCP_SEGMENT
+        frame[14] = 0x46
+
+        assert PacketFilter("tcp src port 1022")(frame)
+        assert not PacketFilter("tcp src port 257")(frame)
+
+    def test_ipv6_extension_headers(self, udp6_frame):
+        """
+        GIVEN a frame whose IPv6 header is followed by a Hop-by-Hop
+            Options header before its UDP datagram
+        WHEN a filter tests the ports of the datagram
+        THEN the datagram must be located after the extension header
+        """
+        frame = bytearray(udp6_frame[:54]) + \
+            b"\x11\x00\x01\x04\x00\x00\x00\x00" + udp6_frame[54:]
+        frame[20] = 0x00
+
+        assert PacketFilter("udp dst port 53")(frame)
+        assert not PacketFilter("tcp or udp port 2")(frame)
+
+    @pytest.mark.parametrize("flags_offset, matches", [
+        (b"\x40\x00", True),   # Don't fragment
+        (b"\x20\x00", True),   # First fragment
+        (b"\x20\xb9", False),  # Fragment at offset 1480
+        (b"\x00\xb9", False),  # Last fragment
+    ])
+    def test_ipv4_fragments(self, tcp_frame, flags_offset, matches):
+        """
+        GIVEN a frame carrying a whole IPv4 datagram, its first fragment
+            or one of the following ones
+        WHEN a filter tests the ports of its TCP segment
+        THEN only frames carrying the start of the datagram must be
+            tested, the others carrying no TCP header
+        """
+        frame = tcp_frame[:20] + flags_offset + tcp_frame[22:]
+
+        assert PacketFilter("tcp")(frame) is matches
+        assert PacketFilter("tcp src port 1022")(frame) is matches
+        assert PacketFilter("ip")(frame)
+
+    @pytest.mark.parametrize("tags", [
+        b"\x81\x00\x00\x0a",                        # 802.1Q
+        b"\x88\xa8\x00\x64\x81\x00\x00\x0a",        # 802.1ad QinQ
+        b"\x91\x00\x00\x64\x81\x00\x00\x0a",        # Pre-standard QinQ
+    ], ids=["802.1Q", "802.1ad", "QinQ"])
+    def test_tagged_frames(self, tcp_frame, udp6_frame, tags):
+        """
+        GIVEN IPv4 and IPv6 frames carrying VLAN tags
+        WHEN they are filtered on their network and transport headers
+        THEN those headers must be located past the tags
+        """
+        tcp_tagged = tcp_frame[:12] + tags + tcp_frame[12:]
+        udp6_tagged = udp6_frame[:12] + tags + udp6_frame[12:]
+
+        assert PacketFilter("ip and host 192.168.1.254")(tcp_tagged)
+        assert PacketFilter("tcp src port 1022 and ipv4.ttl >= 64")(
+            tcp_tagged)
+        assert not PacketFilter("ip6 or udp or arp")(tcp_tagged)
+        assert PacketFilter("ip6 net fe80::/10 and udp dst port 53")(
+            udp6_tagged)
+        assert PacketFilter("ether dst host 00:1e:68:51:4f:a9")(tcp_tagged)
+
+    def test_truncated_frame(self, tcp_frame):
+        """
+        GIVEN a frame truncated inside its IPv4 header
+        WHEN a filter tests fields beyond its end
+        THEN the frame must not match the filter
+        """
+        packet_filter = PacketFilter("tcp port 22")
+
+        assert not packet_filter(tcp_frame[:20])
+        assert list(packet_filter.filter([tcp_frame[:20], tcp_frame])) == \
+            [tcp_frame]
+
+    @pytest.mark.parametrize("expression, matches", [
+        ("not udp", True),
+        ("not tcp port 22", True),
+        ("not ipv4.ttl < 16", True),
+        ("tcp port 22 or ip", True),
+        ("ipv4.ttl < 16 or ether host 00:1e:68:51:4f:a9", True),
+        ("not net 0.0.0.0/8", True),
+        ("ip and not udp", True),
+        ("tcp and not udp", False),
+    ])
+    def test_truncated_frame_per_primitive(self, tcp_frame, expression,
+                                           matches):
+        """
+        GIVEN a frame truncated inside its IPv4 header
+        WHEN a filter combines primitives testing fields beyond its end
+            with "not", "or" or primitives it satisfies
+        THEN each such primitive must be false on its own, so that the
+            filter matches as its combination of primitives does
+        """
+        assert PacketFilter(expression)(tcp_frame[:20]) is matches
+
+    @pytest.mark.parametrize("expression", [
+        "foo", "tcp port", "tcp port http", "port 22 or", "(tcp",
+        "tcp.nope == 1", "ipv4.src == 1", "ip host fe80::1", "net 10.0.0.0",
+        "host 10.0.0.256", "tcp ==",
+    ])
+    def test_invalid_expressions(self, expression):
+        """
+        GIVEN an invalid filter expression
+        WHEN it is compiled
+        THEN ValueError must be raised
+        """
+        with pytest.raises(ValueError):
+            PacketFilter(expression)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import asyncio
+import struct
+
+from netprotocols import ARP, Capture, FileSource, MemorySource
+from netprotocols.capture.live import FrameSource
+
+import pytest
+
+TCP_SEGMENT = b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x50\x18" \
+              b"\x21\x5c\x20\x08\x00\x00"
+
+
+@pytest.fixture
+def raw_arp_frame(raw_eth_header, raw_arp_header):
+    return raw_eth_header + raw_arp_header
+
+
+def collect(capture: Capture) -> list:
+    async def read_all():
+        async with capture:
+            return [packet async for packet in capture]
+    return asyncio.run(read_all())
+
+
+class TestCapture:
+    def test_capture_memory_source(self, raw_arp_frame):
+        """
+        GIVEN a source of frames held in memory
+        WHEN they are captured with a pool smaller than their number
+        THEN every frame must be yielded dissected into a Packet, the
+            buffers of the pool being reused without dropping frames
+        """
+        capture = Capture(MemorySource([raw_arp_frame] * 10), pool_size=2)
+        packets = collect(capture)
+
+        assert len(packets) == capture.received == 10
+        assert capture.dropped == 0
+        assert all(isinstance(packet.arp, ARP) for packet in packets)
+        assert packets[-1].arp.spa == "24.166.172.1"
+
+    def test_payloads_outlive_buffers(self, raw_ipv4_header):
+        """
+        GIVEN TCP segments carrying distinct payloads
+        WHEN they are captured with a single buffer in the pool
+        THEN the payload of every packet must remain intact after the
+            buffer is reused for the following frames
+        """
+        ip = raw_ipv4_header[:2] + b"\x00\x2c" + raw_ipv4_header[4:]
+        frames = [b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54"
+                  b"\x08\x00" + ip + TCP_SEGMENT + struct.pack(">I", number)
+                  for number in range(5)]
+        packets = collect(Capture(MemorySource(frames), pool_size=1))
+
+        assert [bytes(packet.tcp.payload) for packet in packets] == \
+            [struct.pack(">I", number) for number in range(5)]
+
+    def test_live_source_drops_when_pool_exhausted(self, raw_arp_frame):
+        """
+        GIVEN a live source delivering frames faster than they are
+            consumed
+        WHEN every buffer of the pool is waiting to be decoded
+        THEN the frames read meanwhile must be dropped and counted
+        """
+        capture = Capture(MemorySource([raw_arp_frame] * 5, live=True),
+                          pool_size=1)
+        packets = collect(capture)
+
+        assert len(packets) == capture.received == 1
+        assert capture.dropped == 4
+
+    def test_capture_filter(self, raw_arp_frame, raw_ipv4_header):
+        """
+        GIVEN a source of ARP and IPv4 frames
+        WHEN they are captured with a filter expression
+        THEN only the matching frames must be dissected and yielded, the
+            others being counted as filtered
+        """
+        ipv4_frame = raw_arp_frame[:12] + b"\x08\x00" + raw_ipv4_header
+        capture = Capture(MemorySource([raw_arp_frame, ipv4_frame] * 3),
+                          pool_size=2, filter="not arp")
+        packets = collect(capture)
+
+        assert len(packets) == capture.received == 3
+        assert capture.filtered == 3
+        assert all(packet.ipv4.proto == 6 for packet in packets)
+
+    def test_capture_file_source(self, tmp_path, raw_arp_frame):
+        """
+        GIVEN a pcap file holding Ethernet frames
+        WHEN it is captured through a FileSource
+        THEN every frame must be yielded, truncated to the snaplen
+        """
+        path = tmp_path / "arp.pcap"
+        record = struct.pack("<IIII", 1000, 0, len(raw_arp_frame),
+                             len(raw_arp_frame)) + raw_arp_frame
+        path.write_bytes(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0,
+                                     65535, 1) + record * 3)
+        packets = collect(Capture(FileSource(str(path)), snaplen=20))
+
+        assert len(packets) == 3
+        assert packets[0].ethernet.eth == 0x0806
+        assert not hasattr(packets[0], "arp")
+
+    def test_source_error(self):
+        """
+        GIVEN a source failing while frames are being read
+        WHEN the capture is iterated
+        THEN the exception must be raised to the caller
+        """
+        class FailingSource(FrameSource):
+            async def recv_into(self, buffer):
+                raise OSError("Network is down")
+
+        with pytest.raises(OSError):
+            collect(Capture(FailingSource()))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import struct
+
+from netprotocols import (
+    ARP,
+    Packet,
+    PcapReader,
+    PcapngReader,
+    PcapWriter,
+    dissect,
+    open_capture
+)
+
+import pytest
+
+
+@pytest.fixture
+def raw_arp_frame(raw_eth_header, raw_arp_header):
+    return raw_eth_header + raw_arp_header
+
+
+@pytest.fixture
+def pcap_file(tmp_path, raw_arp_frame):
+    path = tmp_path / "arp.pcap"
+    records = b"".join(
+        struct.pack("<IIII", 1000 + i, 500, len(raw_arp_frame),
+                    len(raw_arp_frame)) + raw_arp_frame for i in range(3))
+    path.write_bytes(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535,
+                                 1) + records)
+    return str(path)
+
+
+def pcapng_block(block_type: int, body: bytes) -> bytes:
+    body += b"\x00" * (-len(body) % 4)
+    return struct.pack("<II", block_type, len(body) + 12) + body + \
+        struct.pack("<I", len(body) + 12)
+
+
+@pytest.fixture
+def pcapng_file(tmp_path, raw_arp_frame):
+    path = tmp_path / "arp.pcapng"
+    tsresol = struct.pack("<HH", 9, 1) + b"\x09\x00\x00\x00" + \
+        struct.pack("<HH", 0, 0)
+    timestamp = 1000 * 10 ** 9 + 500
+    path.write_bytes(
+        pcapng_block(0x0a0d0d0a, struct.pack("<IHHq", 0x1a2b3c4d, 1, 0, -1))
+        + pcapng_block(0x00000001, struct.pack("<HHI", 1, 0, 0) + tsresol)
+        + pcapng_block(0x00000005, b"statistics")
+        + pcapng_block(0x00000006, struct.pack(
+            "<IIIII", 0, timestamp >> 32, timestamp & 0xffffffff,
+            len(raw_arp_frame), len(raw_arp_frame)) + raw_arp_frame)
+        + pcapng_block(0x00000003, struct.pack(
+            "<I", len(raw_arp_frame)) + raw_arp_frame))
+    return str(path)
+
+
+class TestPcap:
+    def test_read_pcap_records(self, pcap_file, raw_arp_frame):
+        """
+        GIVEN a capture file in the libpcap format
+        WHEN this file is read
+        THEN each record must be yielded with its timestamp, link type
+            and frame as a memoryview
+        """
+        with PcapReader(pcap_file) as reader:
+            records = list(reader)
+            assert len(records) == 3
+            assert records[1].timestamp == pytest.approx(1001.0005)
+            assert records[1].linktype == 1
+            assert isinstance(records[1].frame, memoryview)
+            assert records[1].frame == raw_arp_frame
+
+    def test_read_pcap_packets(self, pcap_file):
+        """
+        GIVEN a capture file in the libpcap format
+        WHEN the packets in this file are read in zero-copy mode
+        THEN each frame must be dissected into an instance of Packet
+        """
+        with open_capture(pcap_file) as reader:
+            assert isinstance(reader, PcapReader)
+            for packet in reader.packets(zero_copy=True):
+                assert isinstance(packet.arp, ARP)
+                assert packet.arp.tpa == "24.166.173.159"
+
+    def test_read_pcapng_records(self, pcapng_file, raw_arp_frame):
+        """
+        GIVEN a capture file in the pcapng format
+        WHEN this file is read
+        THEN Enhanced and Simple Packet Blocks must be yielded as
+            records and every other block must be skipped
+        """
+        with open_capture(pcapng_file) as reader:
+            assert isinstance(reader, PcapngReader)
+            records = list(reader)
+            assert len(records) == 2
+            assert records[0].timestamp == pytest.approx(1000.0000005)
+            assert records[0].frame == raw_arp_frame
+            assert records[1].frame == raw_arp_frame
+            assert [p.arp.oper for p in reader.packets()] == [1, 1]
+
+    def test_close_with_frames_alive(self, pcap_file, raw_arp_frame):
+        """
+        GIVEN records and zero-copy packets read from a capture file
+        WHEN the reader is closed while they are still referenced
+        THEN no error must be raised and they must remain readable
+        """
+        with PcapReader(pcap_file) as reader:
+            records = list(reader)
+            packets = list(reader.packets(zero_copy=True))
+
+        assert records[2].frame == raw_arp_frame
+        assert packets[2].arp.tpa == "24.166.173.159"
+
+    def test_open_unknown_capture_format(self, tmp_path):
+        """
+        GIVEN a file that is not a capture file
+        WHEN this file is opened as a capture
+        THEN a ValueError must be raised
+        """
+        path = tmp_path / "not_a.pcap"
+        path.write_bytes(b"\x00" * 32)
+
+        with pytest.raises(ValueError):
+            open_capture(str(path))
+
+
+class TestPcapWriter:
+    def test_write_packets_and_frames(self, tmp_path, mock_eth_header,
+                                      mock_arp_header, raw_arp_frame):
+        """
+        GIVEN an instance of Packet and a raw frame
+        WHEN both are written to a capture file in the libpcap format
+        THEN reading this file must yield both frames with their
+            timestamps
+        """
+        path = str(tmp_path / "written.pcap")
+        with PcapWriter(path, buffer_size=64) as writer:
+            writer.write(Packet(mock_eth_header, mock_arp_header), 1000.25)
+            writer.write(bytearray(raw_arp_frame), 1001.5)
+            writer.write(memoryview(raw_arp_frame), 1002)
+
+        with PcapReader(path) as reader:
+            packets = list(reader.packets())
+            timestamps = [record.timestamp for record in reader]
+        assert timestamps == [1000.25, 1001.5, 1002]
+        assert packets[0].arp.spa == "24.166.172.1"
+        assert packets[0].arp.oper == 2
+        assert packets[1].arp.oper == 1
+
+    def test_write_dissected_packet(self, tmp_path, raw_eth_header,
+                                    raw_ipv4_header):
+        """
+        GIVEN a packet dissected from a frame carrying a TCP segment with
+            options and a payload
+        WHEN this packet is written to a capture file
+        THEN the whole frame must be written
+        """
+        frame = raw_eth_header[:12] + b"\x08\x00" + raw_ipv4_header[:2] + \
+            b"\x00\x36" + raw_ipv4_header[4:] + \
+            b"\x03\xfe\x00\x16\xd6\x76\xf6\x71\x0c\x7a\x14\x57\x80\x18" \
+            b"\x21\x5c\x20\x08\x00\x00\x01\x01\x08\x0a\x00\x08\xca\x61" \
+            b"\x00\x01\x69\x2e" + b"hi"
+        path = str(tmp_path / "written.pcap")
+        with PcapWriter(path) as writer:
+            writer.write(dissect(frame), 1000)
+
+        with PcapReader(path) as reader:
+            assert [bytes(record.frame) for record in reader] == [frame]
+
+    @pytest.mark.parametrize("nanosecond", [False, True])
+    def test_timestamp_round_trip(self, tmp_path, raw_arp_frame,
+                                  nanosecond):
+        """
+        GIVEN timestamps whose fractions are not exactly representable
+            as floats, including one rounding up to the next second
+        WHEN frames are written with them and read back
+        THEN each timestamp must be stored to the nearest unit of the
+            resolution of the file
+        """
+        path = str(tmp_path / "timestamps.pcap")
+        resolution = 1e-9 if nanosecond else 1e-6
+        timestamps = [1000.000001, 1000.3, 1000.000000001, 1000.9999999999,
+                      1699999999.123456]
+        with PcapWriter(path, nanosecond=nanosecond) as writer:
+            for timestamp in timestamps:
+                writer.write(raw_arp_frame, timestamp)
+
+        with PcapReader(path) as reader:
+            read = [record.timestamp for record in reader]
+        assert read == [pytest.approx(timestamp, abs=resolution / 2)
+                        for timestamp in timestamps]
+        assert read[3] == 1001.0
+
+    def test_write_truncated_frames(self, tmp_path, raw_arp_frame):
+        """
+        GIVEN a raw frame longer than the snapshot length
+        WHEN this frame is written to a capture file
+        THEN only the first bytes of the frame must be written and the
+            length on the wire must be kept
+        """
+        path = str(tmp_path / "snaplen.pcap")
+        with PcapWriter(path, snaplen=14, nanosecond=True) as writer:
+            writer.write(raw_arp_frame, 1.000000001)
+
+        with PcapReader(path) as reader:
+            record, = list(reader)
+            assert record.frame == raw_arp_frame[:14]
+            assert record.wire_len == len(raw_arp_frame)
+            assert record.timestamp == pytest.approx(1.000000001)
+
+    def test_rotate_by_size_and_time(self, tmp_path, raw_arp_frame):
+        """
+        GIVEN a writer rotating files by size and by time
+        WHEN more frames are written than fit in a single file
+        THEN the capture must be split into several readable files
+        """
+        path = str(tmp_path / "rotated.pcap")
+        with PcapWriter(path, max_bytes=24 + 2 * (16 + 42)) as writer:
+            for second in range(5):
+                writer.write(raw_arp_frame, second)
+        assert [len(list(PcapReader(p).packets())) for p in writer.paths] \
+            == [2, 2, 1]
+        assert writer.paths[1] == str(tmp_path / "rotated.1.pcap")
+
+        path = str(tmp_path / "hourly.pcap")
+        with PcapWriter(path, max_seconds=3600) as writer:
+            for timestamp in 0, 1800, 3600, 3601, 7300:
+                writer.write(raw_arp_frame, timestamp)
+        assert [len(list(PcapReader(p))) for p in writer.paths] == [2, 2, 1]
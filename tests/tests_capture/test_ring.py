@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+import multiprocessing
+import pickle
+import platform
+
+from netprotocols import ARP, Ethernet
+
+import pytest
+
+pytest.importorskip("multiprocessing.shared_memory")
+from netprotocols.capture.ring import FrameRing, x86_machines  # noqa: E402
+
+x86_only = pytest.mark.skipif(
+    platform.machine().lower() not in x86_machines,
+    reason="FrameRing only runs on x86 machines")
+
+
+@pytest.fixture
+def raw_arp_frame(raw_eth_header, raw_arp_header):
+    return raw_eth_header + raw_arp_header
+
+
+@pytest.fixture
+def ring():
+    with FrameRing.create(slots=4, slot_size=64, consumers=2) as ring:
+        yield ring
+
+
+def count_arp_frames(ring: FrameRing, index: int, results):
+    count = 0
+    for view in ring.consumer(index).frames(timeout=10):
+        count += ARP.decode(view, Ethernet.header_len).oper == 1
+        del view
+    results.put((index, count))
+    ring.close()
+
+
+@x86_only
+class TestFrameRing:
+    def test_frames_dealt_in_turn(self, ring):
+        """
+        GIVEN a ring with two consumers
+        WHEN four frames are put into it
+        THEN each consumer must read every other frame, on which headers
+            can be decoded directly
+        """
+        for number in range(4):
+            assert ring.put(bytes([number]) * 14)
+        first, second = ring.consumer(0), ring.consumer(1)
+
+        assert Ethernet.decode(first.get()).eth == 0x0000
+        assert Ethernet.decode(second.get()).eth == 0x0101
+        assert bytes(first.get()) == bytes([2]) * 14
+        assert bytes(second.get()) == bytes([3]) * 14
+        assert first.get() is None
+
+    def test_full_ring_drops(self, ring):
+        """
+        GIVEN a ring whose slots all hold unread frames
+        WHEN another frame is put
+        THEN it must be dropped until its slot is released
+        """
+        for _ in range(4):
+            ring.put(b"frame")
+        consumer = ring.consumer(0)
+
+        assert not ring.put(b"frame")
+        assert ring.dropped == 1
+        consumer.get()
+        assert not ring.put(b"frame")  # The slot is still being read
+        consumer.get()
+        assert ring.put(b"frame")
+
+    def test_truncated_frame(self, ring):
+        """
+        GIVEN a ring of 64-byte slots
+        WHEN a longer frame is put
+        THEN it must be truncated to the slot size and counted
+        """
+        ring.put(bytes(100))
+
+        assert len(ring.consumer(0).get()) == 64
+        assert ring.truncated == 1
+
+    def test_reserve_and_commit(self, ring, raw_arp_frame):
+        """
+        GIVEN a ring
+        WHEN a frame is written directly into a reserved slot
+        THEN it must be read once committed
+        """
+        view = ring.reserve()
+        view[:len(raw_arp_frame)] = raw_arp_frame
+        del view
+        consumer = ring.consumer(0)
+
+        assert consumer.get() is None
+        ring.commit(len(raw_arp_frame))
+        assert bytes(consumer.get()) == raw_arp_frame
+
+    def test_consumer_processes(self, raw_arp_frame):
+        """
+        GIVEN a ring pickled to two consumer processes
+        WHEN more frames than slots are put into it
+        THEN every frame must be decoded by exactly one consumer
+        """
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        with FrameRing.create(slots=8, slot_size=64, consumers=2) as ring:
+            pickle.dumps(ring)
+            workers = [context.Process(target=count_arp_frames,
+                                       args=(ring, index, results))
+                       for index in range(2)]
+            for worker in workers:
+                worker.start()
+            sent = 0
+            while sent < 100:
+                sent += ring.put(raw_arp_frame)
+            ring.finish()
+            counts = dict(results.get(timeout=10) for _ in workers)
+            for worker in workers:
+                worker.join()
+
+        assert counts == {0: 50, 1: 50}
+
+
+class TestMachineCheck:
+    def test_refuse_weakly_ordered_machine(self, monkeypatch):
+        """
+        GIVEN a machine whose memory model is weaker than that of x86
+        WHEN a ring is created or attached to on it
+        THEN a RuntimeError exception must be raised
+        """
+        monkeypatch.setattr(platform, "machine", lambda: "aarch64")
+
+        with pytest.raises(RuntimeError):
+            FrameRing.create(slots=4, slot_size=64)
+        with pytest.raises(RuntimeError):
+            FrameRing.attach("netprotocols-ring")
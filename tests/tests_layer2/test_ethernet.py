@@ -21,8 +21,10 @@ class TestEthernet:
         WHEN those values are valid and correctly formatted
         THEN an instance of Ethernet must be initialized without errors
         """
-        assert bytes(mock_eth_header.dst) == b"\xff\xff\xff\xff\xff\xff"
-        assert bytes(mock_eth_header.src) == b"\x00\x07\x0d\xaf\xf4\x54"
+        assert mock_eth_header.dst == "ff:ff:ff:ff:ff:ff"
+        assert mock_eth_header.src == "00:07:0d:af:f4:54"
+        assert bytes(mock_eth_header._dst) == b"\xff\xff\xff\xff\xff\xff"
+        assert bytes(mock_eth_header._src) == b"\x00\x07\x0d\xaf\xf4\x54"
         assert mock_eth_header.eth == 0x0806
 
     def test_decode_ethernet_header(self, raw_eth_header):
@@ -38,3 +40,38 @@ class TestEthernet:
         assert eth_header.dst == "ff:ff:ff:ff:ff:ff"
         assert eth_header.eth == 0x0806
         assert eth_header.encapsulated_proto == "ARP"
+
+    def test_decode_ethernet_addresses_lazily(self, raw_eth_header):
+        """
+        GIVEN a byte-string representation of an Ethernet frame header
+        WHEN this header is decoded
+        THEN the string representation of each MAC address must only be
+            computed and cached when that address is first read
+        """
+        eth_header = Ethernet.decode(raw_eth_header)
+
+        assert "src" not in eth_header.__dict__
+        assert eth_header.src == "00:07:0d:af:f4:54"
+        assert eth_header.__dict__["src"] == "00:07:0d:af:f4:54"
+        assert "dst" not in eth_header.__dict__
+
+    def test_assign_address_array(self, mock_eth_header):
+        """
+        GIVEN an instance of Ethernet whose source address was read
+        WHEN a c_ubyte array is assigned to that address
+        THEN reading the address must return the string representation
+            of the new array
+        """
+        assert mock_eth_header.src == "00:07:0d:af:f4:54"
+        mock_eth_header.src = Ethernet.hdwr_to_addr_array("00:00:5e:00:53:01")
+
+        assert mock_eth_header.src == "00:00:5e:00:53:01"
+
+    def test_build_ethernet_header_packs_addresses(self, mock_eth_header,
+                                                   raw_eth_header):
+        """
+        GIVEN an instance of Ethernet built from a set of attributes
+        WHEN this instance is converted to bytes
+        THEN the MAC addresses must be packed into the header
+        """
+        assert bytes(mock_eth_header) == raw_eth_header
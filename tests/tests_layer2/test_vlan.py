@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import Ethernet
+from netprotocols.layer2.vlan import MPLSLabel, VLANTag, skip_tags, walk_tags
+
+import pytest
+
+ADDRESSES = b"\x00\x1e\x68\x51\x4f\xa9\x00\x07\x0d\xaf\xf4\x54"
+S_TAG = b"\x88\xa8\x00\x64"                 # Service tag, VLAN 100
+C_TAG = b"\x81\x00\xa0\x0a"                 # Customer tag, PCP 5, VLAN 10
+LABEL = b"\x00\x3e\x80\x40"                 # Label 1000, TTL 64
+BOTTOM_LABEL = b"\x00\x3e\x91\x3f"          # Label 1001, bottom, TTL 63
+
+
+class TestVLAN:
+    def test_qinq_tags(self, raw_ipv4_header):
+        """
+        GIVEN a frame carrying an IPv4 packet behind a service and a
+            customer VLAN tag
+        WHEN its Ethernet header is decoded
+        THEN both tags must be exposed outermost first, with the
+            Ethertype and offset of the IPv4 header
+        """
+        frame = ADDRESSES + S_TAG + C_TAG + b"\x08\x00" + raw_ipv4_header
+        eth_header = Ethernet.decode(frame)
+        tags = eth_header.tags
+
+        assert tags.vlan == [VLANTag(0x88a8, 0, 0, 100),
+                             VLANTag(0x8100, 5, 0, 10)]
+        assert tags.mpls == []
+        assert (tags.ethertype, tags.offset) == (0x0800, 22)
+        assert skip_tags(frame, 14, 0x88a8) == (0x0800, 22)
+        assert eth_header.encapsulated_proto == "IPv4"
+
+    @pytest.mark.parametrize("payload, ethertype", [
+        (b"\x45\x00", 0x0800), (b"\x60\x00", 0x86dd), (b"\x00\x00", 0)])
+    def test_mpls_label_stack(self, payload, ethertype):
+        """
+        GIVEN a frame carrying a stack of two MPLS labels
+        WHEN its tags are walked
+        THEN both labels must be read and the protocol following the
+            bottom of the stack must be guessed from its version nibble
+        """
+        frame = ADDRESSES + b"\x88\x47" + LABEL + BOTTOM_LABEL + payload
+        tags = walk_tags(frame, 14, 0x8847)
+
+        assert tags.mpls == [MPLSLabel(1000, 0, 0, 64),
+                             MPLSLabel(1001, 0, 1, 63)]
+        assert (tags.ethertype, tags.offset) == (ethertype, 22)
+        assert skip_tags(frame, 14, 0x8847) == (ethertype, 22)
+
+    def test_truncated_tags(self):
+        """
+        GIVEN a frame truncated inside its second VLAN tag
+        WHEN its tags are walked
+        THEN the walk must stop at the truncated tag
+        """
+        frame = ADDRESSES + S_TAG + C_TAG[:2]
+
+        assert walk_tags(frame, 14, 0x88a8)[2:] == (0x8100, 18)
+        assert skip_tags(frame, 14, 0x88a8) == (0x8100, 18)
+
+    def test_untagged_frame(self, raw_eth_header):
+        """
+        GIVEN an untagged frame
+        WHEN its tags are requested
+        THEN no tag must be found and the Ethertype must be its own
+        """
+        assert tuple(Ethernet.decode(raw_eth_header).tags) == \
+            ([], [], 0x0806, 14)
@@ -3,7 +3,7 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
-from netprotocols import ICMPv4, ICMPv6
+from netprotocols import ICMPv4, ICMPv6, IPv6
 
 import pytest
 
@@ -71,6 +71,20 @@ class TestICMP:
         assert icmpv4_header.encapsulated_proto == "undefined"
         assert icmpv4_header.type_name == "Echo Request"
 
+    def test_verify_icmpv4_checksum(self, raw_icmpv4_header):
+        """
+        GIVEN a byte-string representation of an ICMPv4 message
+        WHEN the checksum of the message is computed over its header
+            and payload
+        THEN it must match the checksum set on the message
+        """
+        icmpv4_header = ICMPv4.decode(raw_icmpv4_header)
+        payload = raw_icmpv4_header[ICMPv4.header_len:]
+
+        assert icmpv4_header.compute_chksum(payload) == 0x83f7
+        assert icmpv4_header.verify_chksum(payload)
+        assert not icmpv4_header.verify_chksum(payload[:-2])
+
     def test_build_icmpv6_header(self, mock_icmpv6_header):
         """
         GIVEN a set of attributes defining an ICMPv6 packet
@@ -97,3 +111,18 @@ class TestICMP:
         assert icmpv6_header.chksum == 0x3f69
         assert icmpv6_header.m_body == b"\x76\x20\x01\x00"
         assert icmpv6_header.type_name == "Echo Request"
+
+    def test_compute_icmpv6_checksum(self, mock_icmpv6_header):
+        """
+        GIVEN an ICMPv6 message carried by an IPv6 packet
+        WHEN the checksum of the message is computed over the
+            pseudo-header and the message
+        THEN the message must verify as correct
+        """
+        ipv6_header = IPv6(version=6, tclass=0, flabel=0, payload_len=8,
+                           next_header=0x3a, hop_limit=64,
+                           src="fe80::1", dst="fe80::2")
+        mock_icmpv6_header.chksum = mock_icmpv6_header.compute_chksum(
+            ipv6_header)
+
+        assert mock_icmpv6_header.verify_chksum(ipv6_header)
@@ -4,6 +4,7 @@
 __author__ = "EONRaider @ keybase.io/eonraider"
 
 from netprotocols import IPv4, IPv6
+from netprotocols.layer3.ip import walk_extension_headers
 
 import pytest
 
@@ -41,6 +42,16 @@ def mock_ipv6_header():
     )
 
 
+HOP_BY_HOP = b"\x3c\x00\x01\x04\x00\x00\x00\x00"    # Next: Dest. Options
+DESTINATION = b"\x3a\x01" + b"\x01\x0c" + bytes(12)  # Next: ICMPv6
+
+
+def fragment(offset: int) -> bytes:
+    """A Fragment header followed by UDP, with the M flag set."""
+    return b"\x11\x00" + (offset << 3 | 1).to_bytes(2, "big") + \
+        b"\x00\x00\x12\x34"
+
+
 @pytest.fixture
 def raw_ipv6_header():
     return b"\x60\x00\x00\x00\x00\x78\x06\xff\xfe\x80\x00\x00\x00\x00\x00\x00" \
@@ -67,8 +78,10 @@ class TestIPv4:
         assert mock_ipv4_header.proto == 0x06
         assert mock_ipv4_header.chksum == 0x2b51
         assert mock_ipv4_header.chksum_hex_str == "0x2b51"
-        assert bytes(mock_ipv4_header.src) == b"\xc0\xa8\x01\x60"
-        assert bytes(mock_ipv4_header.dst) == b"\xc0\xa8\x01\xfe"
+        assert mock_ipv4_header.src == "192.168.1.96"
+        assert mock_ipv4_header.dst == "192.168.1.254"
+        assert bytes(mock_ipv4_header._src) == b"\xc0\xa8\x01\x60"
+        assert bytes(mock_ipv4_header._dst) == b"\xc0\xa8\x01\xfe"
         assert mock_ipv4_header.encapsulated_proto == "TCP"
         assert mock_ipv4_header.flags_str == "Don't fragment (DF)"
 
@@ -98,6 +111,64 @@ class TestIPv4:
         assert ipv4_header.encapsulated_proto == "TCP"
         assert ipv4_header.flags_str == "Don't fragment (DF)"
 
+    def test_decode_ipv4_header_zero_copy(self, raw_ipv4_header):
+        """
+        GIVEN a writable buffer holding an IPv4 packet header
+        WHEN this header is decoded in zero-copy mode
+        THEN assigning to a field of the instance of IPv4 must write
+            through to the buffer
+        """
+        buffer = bytearray(raw_ipv4_header)
+        ipv4_header = IPv4.decode(buffer, zero_copy=True)
+        ipv4_header.ttl = 63
+
+        assert ipv4_header.src == "192.168.1.96"
+        assert buffer[8] == 63
+
+    def test_compute_ipv4_checksum(self, mock_ipv4_header):
+        """
+        GIVEN an instance of IPv4 built from a set of attributes
+        WHEN the checksum of its header is computed and set
+        THEN the header must verify as correct until a field changes
+        """
+        mock_ipv4_header.chksum = mock_ipv4_header.compute_chksum()
+
+        assert mock_ipv4_header.chksum == 0xc9b4
+        assert mock_ipv4_header.verify_chksum()
+        mock_ipv4_header.ttl = 1
+        assert not mock_ipv4_header.verify_chksum()
+
+    def test_ipv4_options_and_payload(self, raw_ipv4_header):
+        """
+        GIVEN an IPv4 packet whose header carries 4 bytes of options,
+            followed by its payload and by trailing padding
+        WHEN its header is decoded
+        THEN options and payload must be views of the packet bounded by
+            the IHL and total length fields, and the checksum must cover
+            the options
+        """
+        header = bytearray(raw_ipv4_header)
+        header[0], header[2:4] = 0x46, (28).to_bytes(2, "big")
+        packet = bytes(header) + b"\x94\x04\x00\x00" + b"data" + bytes(6)
+        ipv4_header = IPv4.decode(packet)
+
+        assert isinstance(ipv4_header.options, memoryview)
+        assert ipv4_header.options == b"\x94\x04\x00\x00"
+        assert ipv4_header.payload == b"data"
+        ipv4_header.chksum = ipv4_header.compute_chksum()
+        assert ipv4_header.verify_chksum()
+        assert ipv4_header.chksum != IPv4.decode(
+            bytes(ipv4_header)).compute_chksum()
+
+    def test_built_ipv4_header_has_no_payload(self, mock_ipv4_header):
+        """
+        GIVEN an instance of IPv4 built from a set of attributes
+        WHEN its options and payload are read
+        THEN both must be empty
+        """
+        assert mock_ipv4_header.options == b""
+        assert mock_ipv4_header.payload == b""
+
 
 class TestIPv6:
     def test_build_ipv6_header(self, mock_ipv6_header):
@@ -114,12 +185,14 @@ class TestIPv6:
         assert mock_ipv6_header.payload_len == 120
         assert mock_ipv6_header.next_header == 0x06
         assert mock_ipv6_header.hop_limit == 255
-        assert bytes(mock_ipv6_header.src) == b"\xfe\x80\x00\x00\x00\x00\x00" \
-                                              b"\x00\x00\x00\x00\x00\x00\x00" \
-                                              b"\x00\x01"
-        assert bytes(mock_ipv6_header.dst) == b"\xff\x02\x00\x00\x00\x00\x00" \
-                                              b"\x00\x00\x00\x00\x00\x00\x00" \
-                                              b"\x00\x01"
+        assert mock_ipv6_header.src == "fe80::1"
+        assert mock_ipv6_header.dst == "ff02::1"
+        assert bytes(mock_ipv6_header._src) == b"\xfe\x80\x00\x00\x00\x00" \
+                                               b"\x00\x00\x00\x00\x00\x00" \
+                                               b"\x00\x00\x00\x01"
+        assert bytes(mock_ipv6_header._dst) == b"\xff\x02\x00\x00\x00\x00" \
+                                               b"\x00\x00\x00\x00\x00\x00" \
+                                               b"\x00\x00\x00\x01"
         assert mock_ipv6_header.encapsulated_proto == "TCP"
 
     def test_decode_ipv6_header(self, raw_ipv6_header):
@@ -142,3 +215,49 @@ class TestIPv6:
         assert ipv6_header.src == "fe80::1"
         assert ipv6_header.dst == "ff02::1"
         assert ipv6_header.encapsulated_proto == "TCP"
+
+    def test_walk_extension_headers(self, raw_ipv6_header):
+        """
+        GIVEN an IPv6 packet carrying Hop-by-Hop and Destination Options
+            headers before an ICMPv6 message
+        WHEN its header is decoded
+        THEN the upper-layer protocol and its offset must be found past
+            the extension headers
+        """
+        header = bytearray(raw_ipv6_header)
+        header[6] = 0x00  # Hop-by-Hop Options
+        packet = bytes(header) + HOP_BY_HOP + DESTINATION + b"icmp"
+        ipv6_header = IPv6.decode(packet)
+
+        assert ipv6_header.upper_layer == (0x3a, 64)
+        assert ipv6_header.encapsulated_proto == "IPv6-ICMP"
+        assert ipv6_header.payload == b"icmp"
+
+    @pytest.mark.parametrize("offset, expected", [(0, (0x11, 8)),
+                                                  (185, (0x2c, 0))])
+    def test_walk_fragment_header(self, offset, expected):
+        """
+        GIVEN the Fragment header of a first or a later fragment
+        WHEN the chain of extension headers is walked
+        THEN the upper-layer protocol must only be found in the first
+            fragment
+        """
+        assert walk_extension_headers(fragment(offset), 0, 0x2c) == expected
+
+    def test_walk_truncated_chain(self):
+        """
+        GIVEN a chain of extension headers truncated by the end of the
+            packet
+        WHEN it is walked
+        THEN the walk must stop at the truncated header
+        """
+        assert walk_extension_headers(HOP_BY_HOP + DESTINATION[:6], 0,
+                                      0x00) == (0x3c, 8)
+
+    def test_built_ipv6_header_fast_path(self, mock_ipv6_header):
+        """
+        GIVEN an instance of IPv6 whose next header is TCP
+        WHEN its upper layer is requested
+        THEN TCP must be found right after the fixed header
+        """
+        assert mock_ipv6_header.upper_layer == (0x06, 40)
@@ -3,7 +3,8 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
-from netprotocols import TCP
+from netprotocols import IPv4, TCP
+from netprotocols.layer4.tcp import TCPOptions
 
 import pytest
 
@@ -73,3 +74,86 @@ class TestTCP:
         assert tcp_header.flags_hex_str == "0x018"
         assert tcp_header.flags_str == "PSH ACK"
         assert tcp_header.encapsulated_proto == "undefined"
+
+    def test_compute_tcp_checksum(self, raw_tcp_header):
+        """
+        GIVEN a TCP segment carried by an IPv4 packet
+        WHEN the checksum of the segment is computed over the
+            pseudo-header, the header and the options that follow it
+        THEN the segment must verify as correct
+        """
+        ipv4_header = IPv4(version=4, ihl=5, dscp=0, ecp=0, len=52,
+                           id=0xec6c, flags=2, offset=0, ttl=64, proto=0x06,
+                           chksum=0, src="192.168.1.96", dst="192.168.1.254")
+        tcp_header = TCP.decode(raw_tcp_header)
+        options = raw_tcp_header[20:]
+        tcp_header.chksum = tcp_header.compute_chksum(ipv4_header, options)
+
+        assert tcp_header.chksum == 0xab43
+        assert tcp_header.verify_chksum(ipv4_header, options)
+        assert not tcp_header.verify_chksum(ipv4_header, b"")
+
+    def test_tcp_options_and_payload(self, raw_tcp_header):
+        """
+        GIVEN a TCP segment carrying 12 bytes of options and some data
+        WHEN its header is decoded
+        THEN options and payload must be views of the segment split at
+            the data offset, the options being parsed when read
+        """
+        segment = raw_tcp_header + b"payload"
+        tcp_header = TCP.decode(segment)
+        options = tcp_header.parsed_options
+
+        assert tcp_header.options == raw_tcp_header[20:]
+        assert tcp_header.payload == b"payload"
+        assert options.timestamps == (0x0008ca61, 0x0001692e)
+        assert options.mss is None and options.window_scale is None
+        assert options.sack == [] and not options.sack_permitted
+
+    def test_copied_segment_owns_options(self, raw_tcp_header):
+        """
+        GIVEN a TCP segment decoded from a reusable buffer without
+            zero_copy
+        WHEN the buffer is overwritten and resized
+        THEN options and payload must still read the decoded bytes, the
+            header holding no reference to the buffer
+        """
+        buffer = bytearray(bytes(34) + raw_tcp_header + b"payload")
+        tcp_header = TCP.decode(buffer, 34)
+        buffer[:] = bytes(len(buffer))
+        buffer.extend(b"resized")
+
+        assert tcp_header.options == raw_tcp_header[20:]
+        assert tcp_header.payload == b"payload"
+
+    def test_zero_copy_segment_views_buffer(self, raw_tcp_header):
+        """
+        GIVEN a TCP segment decoded from a buffer with zero_copy set
+        WHEN the buffer is overwritten
+        THEN its options must reflect the new bytes of the buffer
+        """
+        buffer = bytearray(raw_tcp_header)
+        tcp_header = TCP.decode(buffer, zero_copy=True)
+        buffer[20:] = bytes(12)
+
+        assert tcp_header.options == bytes(12)
+
+    def test_parse_tcp_options(self):
+        """
+        GIVEN the options of a segment holding MSS, SACK permitted,
+            window scale and SACK blocks, followed by a malformed option
+        WHEN they are parsed
+        THEN each option must be decoded and parsing must stop at the
+            malformed one
+        """
+        options = TCPOptions(memoryview(
+            b"\x02\x04\x05\xb4\x04\x02\x01\x03\x03\x07"
+            b"\x05\x12" + bytes(range(16)) + b"\x08\x01\x00\x00"))
+
+        assert [kind for kind, _ in options] == [2, 4, 3, 5]
+        assert options.mss == 1460
+        assert options.sack_permitted
+        assert options.window_scale == 7
+        assert options.sack == [(0x00010203, 0x04050607),
+                                (0x08090a0b, 0x0c0d0e0f)]
+        assert options.timestamps is None
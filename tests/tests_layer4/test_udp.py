@@ -3,7 +3,7 @@
 
 __author__ = "EONRaider @ keybase.io/eonraider"
 
-from netprotocols import UDP
+from netprotocols import IPv6, UDP
 
 import pytest
 
@@ -50,3 +50,22 @@ class TestUDP:
         assert udp_header.len == 41
         assert udp_header.chksum == 0x3649
         assert udp_header.encapsulated_proto == "undefined"
+
+    def test_compute_udp_checksum(self):
+        """
+        GIVEN a UDP datagram carried by an IPv6 packet
+        WHEN the checksum of the datagram is computed over the
+            pseudo-header, the header and the payload
+        THEN the datagram must verify as correct and a checksum of zero
+            must be rejected over IPv6
+        """
+        payload = b"\x12\x34\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00"
+        ipv6_header = IPv6(version=6, tclass=0, flabel=0, payload_len=20,
+                           next_header=0x11, hop_limit=64,
+                           src="fe80::1", dst="ff02::fb")
+        udp_header = UDP(sport=5353, dport=5353, len=20, chksum=0)
+
+        assert not udp_header.verify_chksum(ipv6_header, payload)
+        udp_header.chksum = udp_header.compute_chksum(ipv6_header, payload)
+        assert udp_header.chksum != 0
+        assert udp_header.verify_chksum(ipv6_header, payload)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import IPv4
+from netprotocols.reassembly.ipv4 import IPv4Reassembler
+
+import pytest
+
+PAYLOAD = bytes(range(256)) * 4
+
+
+def fragment(payload: bytes = PAYLOAD, first: int = 0, last: int = None,
+             more_fragments: bool = None, ident: int = 0x1c46) -> bytes:
+    """Build the IPv4 fragment carrying payload[first:last]."""
+    last = len(payload) if last is None else last
+    if more_fragments is None:
+        more_fragments = last < len(payload)
+    ip = IPv4(version=4, ihl=5, dscp=0, ecp=0, len=20 + last - first,
+              id=ident, flags=int(more_fragments), offset=first // 8,
+              ttl=64, proto=0x11, chksum=0, src="192.168.1.96",
+              dst="192.168.1.254")
+    ip.chksum = ip.compute_chksum()
+    return bytes(ip) + payload[first:last]
+
+
+class TestIPv4Reassembler:
+    def test_unfragmented_datagram(self):
+        """
+        GIVEN a datagram that is not fragmented
+        WHEN it is added to the reassembler
+        THEN it must be returned as is
+        """
+        datagram = fragment(last=len(PAYLOAD))
+
+        assert IPv4Reassembler().add(datagram) is datagram
+
+    @pytest.mark.parametrize("order", [(0, 1, 2, 3), (3, 1, 0, 2),
+                                       (2, 3, 1, 0)])
+    def test_reassemble_in_any_order(self, order):
+        """
+        GIVEN a datagram split into four fragments
+        WHEN the fragments are added in any order
+        THEN the datagram must be returned when the last hole is filled,
+            with a header updated for the whole datagram
+        """
+        bounds = [(0, 256), (256, 512), (512, 768), (768, 1024)]
+        reassembler = IPv4Reassembler()
+        results = [reassembler.add(fragment(first=bounds[index][0],
+                                            last=bounds[index][1]), 1.0)
+                   for index in order]
+        datagram = results[-1]
+        ip = IPv4.decode(datagram)
+
+        assert results[:-1] == [None] * 3
+        assert datagram[20:] == PAYLOAD
+        assert (ip.len, ip.flags, ip.offset) == (1044, 0, 0)
+        assert ip.verify_chksum()
+        assert len(reassembler) == reassembler.buffered == 0
+
+    def test_overlap_keeps_first_bytes(self):
+        """
+        GIVEN a fragment overlapping bytes already received with
+            different data
+        WHEN the overlap policy is "keep"
+        THEN the bytes received first must be kept
+        """
+        forged = bytes(len(PAYLOAD))
+        reassembler = IPv4Reassembler()
+        reassembler.add(fragment(first=0, last=512), 1.0)
+        reassembler.add(fragment(forged, first=256, last=768,
+                                 more_fragments=True), 1.0)
+        datagram = reassembler.add(fragment(first=768), 1.0)
+
+        assert datagram[20:20 + 512] == PAYLOAD[:512]
+        assert datagram[20 + 512:20 + 768] == forged[512:768]
+        assert reassembler.overlaps == 1
+
+    def test_overlap_drop(self):
+        """
+        GIVEN a fragment overlapping bytes already received
+        WHEN the overlap policy is "drop"
+        THEN the whole datagram must be discarded
+        """
+        reassembler = IPv4Reassembler(overlap="drop")
+        reassembler.add(fragment(first=0, last=512), 1.0)
+        reassembler.add(fragment(first=256, last=768), 1.0)
+
+        assert len(reassembler) == 0
+        assert reassembler.add(fragment(first=768), 1.0) is None
+
+    def test_timeout(self):
+        """
+        GIVEN an incomplete datagram
+        WHEN no fragment of it is received for longer than the timeout
+        THEN it must be expired
+        """
+        reassembler = IPv4Reassembler(timeout=15)
+        reassembler.add(fragment(first=0, last=512), 1.0)
+        reassembler.add(fragment(first=0, last=512, ident=2), 10.0)
+        reassembler.expire(20.0)
+
+        assert reassembler.expired == 1
+        assert reassembler.add(fragment(first=512), 20.0) is None
+        assert reassembler.add(fragment(first=512, ident=2), 20.0)
+
+    def test_memory_budget_evicts_least_recent(self):
+        """
+        GIVEN a reassembler with a small memory budget
+        WHEN incomplete datagrams exceed it
+        THEN the least recently active datagrams must be evicted
+        """
+        reassembler = IPv4Reassembler(max_bytes=1024)
+        for ident in range(3):
+            reassembler.add(fragment(first=0, last=512, ident=ident), 1.0)
+
+        assert reassembler.evicted == 1
+        assert reassembler.buffered == 1024
+        assert reassembler.add(fragment(first=512, ident=2), 1.0)
+        assert reassembler.add(fragment(first=512, ident=1), 1.0)
+        assert reassembler.add(fragment(first=512, ident=0), 1.0) is None
+
+    def test_datagram_limits(self):
+        """
+        GIVEN limits on the length and fragment count of datagrams
+        WHEN fragments exceed them
+        THEN their datagram must be discarded
+        """
+        reassembler = IPv4Reassembler(max_datagram_len=800,
+                                      max_fragments=2)
+        reassembler.add(fragment(first=768), 1.0)
+        reassembler.add(fragment(first=0, last=8, ident=2), 1.0)
+        reassembler.add(fragment(first=8, last=16, ident=2), 1.0)
+        reassembler.add(fragment(first=16, last=24, ident=2), 1.0)
+
+        assert reassembler.discarded == 2
+        assert len(reassembler) == 0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# https://github.com/EONRaider/NETProtocols
+
+__author__ = "EONRaider @ keybase.io/eonraider"
+
+from netprotocols import Ethernet, IPv4, IPv6, TCP
+from netprotocols.reassembly.tcp import (
+    ACK, CLOSED, ESTABLISHED, FIN, RST, SYN, SYN_RECEIVED, SYN_SENT,
+    FlowTable
+)
+
+import pytest
+
+CLIENT = "192.168.1.96", 49152
+SERVER = "192.168.1.254", 80
+
+
+def segment(sender=CLIENT, receiver=SERVER, seq: int = 0, ack: int = 0,
+            flags: int = ACK, payload: bytes = b"", ipv6: bool = False):
+    """Build an Ethernet frame carrying a TCP segment."""
+    tcp = TCP(sport=sender[1], dport=receiver[1], seq=seq, ack=ack,
+              offset=5, reserved=0, flags=flags, window=65535, chksum=0,
+              urg=0)
+    if ipv6:
+        ip = IPv6(version=6, tclass=0, flabel=0, payload_len=20 + len(
+            payload), next_header=0x06, hop_limit=64,
+            src="fe80::" + sender[0].split(".")[-1],
+            dst="fe80::" + receiver[0].split(".")[-1])
+        eth = 0x86dd
+    else:
+        ip = IPv4(version=4, ihl=5, dscp=0, ecp=0,
+                  len=40 + len(payload), id=0, flags=0, offset=0, ttl=64,
+                  proto=0x06, chksum=0, src=sender[0], dst=receiver[0])
+        eth = 0x0800
+    ethernet = Ethernet(dst="00:1e:68:51:4f:a9", src="00:07:0d:af:f4:54",
+                        eth=eth)
+    return bytes(ethernet) + bytes(ip) + bytes(tcp) + payload
+
+
+def handshake(client_isn: int = 1000, server_isn: int = 5000):
+    return [segment(seq=client_isn, flags=SYN),
+            segment(SERVER, CLIENT, seq=server_isn, ack=client_isn + 1,
+                    flags=SYN | ACK),
+            segment(seq=client_isn + 1, ack=server_isn + 1)]
+
+
+@pytest.fixture
+def table():
+    table = FlowTable()
+    table.streams = {}
+    table.closed = []
+    table.on_data = lambda flow, sender, data: table.streams.setdefault(
+        sender.port, bytearray()).extend(data)
+    table.on_close = table.closed.append
+    return table
+
+
+class TestFlowTable:
+    @pytest.mark.parametrize("ipv6", [False, True])
+    def test_handshake_states(self, table, ipv6):
+        """
+        GIVEN the three segments of a TCP handshake over IPv4 or IPv6
+        WHEN they are added to a flow table
+        THEN a single flow must go through SYN_SENT and SYN_RECEIVED to
+            ESTABLISHED, with the sender of the SYN as its client
+        """
+        frames = [segment(seq=1000, flags=SYN, ipv6=ipv6),
+                  segment(SERVER, CLIENT, seq=5000, ack=1001,
+                          flags=SYN | ACK, ipv6=ipv6),
+                  segment(seq=1001, ack=5001, ipv6=ipv6)]
+        states = [table.add_frame(frame, 1.0).state for frame in frames]
+
+        assert states == [SYN_SENT, SYN_RECEIVED, ESTABLISHED]
+        assert len(table) == 1
+        flow, = table
+        assert (flow.client.port, flow.server.port) == (CLIENT[1], SERVER[1])
+
+    def test_reorders_segments(self, table):
+        """
+        GIVEN segments of both directions of a connection, some of them
+            out of order, duplicated or overlapping
+        WHEN they are added to a flow table
+        THEN each direction must be delivered as a contiguous stream
+        """
+        for frame in handshake():
+            table.add_frame(frame, 1.0)
+        frames = [segment(seq=1007, payload=b"world"),
+                  segment(seq=1012, payload=b"!"),
+                  segment(seq=1001, payload=b"hello "),
+                  segment(seq=1001, payload=b"hello "),
+                  segment(seq=1010, payload=b"ld!?"),
+                  segment(SERVER, CLIENT, seq=5001, payload=b"OK")]
+        for frame in frames:
+            table.add_frame(frame, 2.0)
+
+        assert table.streams == {CLIENT[1]: b"hello world!?",
+                                 SERVER[1]: b"OK"}
+        flow, = table
+        assert flow.client.segments is None and flow.client.buffered == 0
+
+    def test_sequence_wraparound(self, table):
+        """
+        GIVEN a stream whose sequence numbers wrap around 2 ** 32
+        WHEN its segments are added out of order
+        THEN the stream must be delivered in order
+        """
+        for frame in handshake(client_isn=0xfffffffa):
+            table.add_frame(frame, 1.0)
+        table.add_frame(segment(seq=0, payload=b"678"), 2.0)
+        table.add_frame(segment(seq=0xfffffffb, payload=b"12345"), 2.0)
+
+        assert table.streams[CLIENT[1]] == b"12345678"
+
+    def test_bounded_buffering(self, table):
+        """
+        GIVEN a flow table holding at most 8 bytes out of order per
+            direction
+        WHEN segments beyond that limit are received ahead of a gap
+        THEN they must be dropped and counted
+        """
+        table.max_buffer = 8
+        for frame in handshake():
+            table.add_frame(frame, 1.0)
+        for seq in (1011, 1016, 1021):
+            table.add_frame(segment(seq=seq, payload=b"12345"), 2.0)
+        flow, = table
+
+        assert table.dropped_segments == 2
+        assert flow.client.buffered == 5
+
+    def test_close_with_fin(self, table):
+        """
+        GIVEN a connection closed by a FIN from each side
+        WHEN both FINs and the data before them were received
+        THEN the flow must be closed and removed from the table
+        """
+        for frame in handshake():
+            table.add_frame(frame, 1.0)
+        table.add_frame(segment(seq=1001, flags=FIN | ACK, payload=b"bye"),
+                        2.0)
+        flow = table.add_frame(segment(SERVER, CLIENT, seq=5001,
+                                       flags=FIN | ACK), 2.0)
+
+        assert flow.state == CLOSED
+        assert table.closed == [flow] and len(table) == 0
+        assert table.add_frame(segment(seq=1005, ack=5002), 2.0) is None
+
+    def test_close_with_rst(self, table):
+        """
+        GIVEN an established connection
+        WHEN a segment with the RST flag set is received
+        THEN the flow must be closed and removed from the table
+        """
+        for frame in handshake():
+            table.add_frame(frame, 1.0)
+        flow = table.add_frame(segment(SERVER, CLIENT, seq=5001, flags=RST),
+                               2.0)
+
+        assert flow.state == CLOSED and len(table) == 0
+
+    def test_midstream(self, table):
+        """
+        GIVEN a connection whose handshake was not seen
+        WHEN segments carrying data are received
+        THEN the flow must be tracked from the first of them, unless
+            midstream tracking is disabled
+        """
+        flow = table.add_frame(segment(seq=7, payload=b"abc"), 1.0)
+
+        assert flow.state == ESTABLISHED
+        assert table.streams == {CLIENT[1]: b"abc"}
+        assert FlowTable(midstream=False).add_frame(
+            segment(seq=7, payload=b"abc"), 1.0) is None
+
+    def test_expiry_by_timer_wheel(self, table):
+        """
+        GIVEN flows of a table with a timeout of 10 seconds
+        WHEN time passes with one of them idle and the other active
+        THEN only the idle flow must be expired
+        """
+        table.timeout = 10.0
+        table.add_frame(segment(seq=0, flags=SYN), 0.0)
+        table.add_frame(segment(("192.168.1.97", 49153), seq=0, flags=SYN),
+                        0.0)
+        for now in range(1, 15):
+            table.add_frame(segment(("192.168.1.97", 49153), seq=1), now)
+
+        assert len(table) == 1 and table.expired == 1
+        assert table.closed[0].client.address == bytes([192, 168, 1, 96])
+        table.expire(100.0)
+        assert len(table) == 0 and table.expired == 2